@@ -1,10 +1,12 @@
 import os
-import pandas as pd
-import ta
 from binance.client import Client
 from dotenv import load_dotenv
 from datetime import datetime
 
+from exchange.kline_cache import KlineCache
+from backtest.engine import REASON_STOP, run_backtest
+from strategy.rsi_macd_atr import RsiMacdAtrStrategy
+
 START_DATE = "1 Jan 2025"
 END_DATE   = "8 Jan 2026"
 
@@ -26,6 +28,8 @@ class MultiCoinBacktester:
             os.getenv("BINANCE_API_SECRET"),
         )
 
+        self.cache = KlineCache()
+
         self.symbols = symbols
         self.interval = interval
         self.start_str = start_str
@@ -35,6 +39,7 @@ class MultiCoinBacktester:
         self.fee_pct = fee_pct
         self.atr_period = atr_period
         self.atr_mult = atr_mult
+        self.strategy = RsiMacdAtrStrategy(atr_period, atr_mult)
 
         self.state = {
             s: {
@@ -47,127 +52,60 @@ class MultiCoinBacktester:
             for s in symbols
         }
 
-    # ================= INDICATORS =================
-    def add_indicators(self, df):
-        df["rsi6"] = ta.momentum.RSIIndicator(df["close"], 6).rsi()
-
-        macd = ta.trend.MACD(df["close"])
-        df["dif"] = macd.macd()
-        df["dea"] = macd.macd_signal()
-        df["dif_prev"] = df["dif"].shift(1)
-        df["dea_prev"] = df["dea"].shift(1)
-
-        df["atr"] = ta.volatility.AverageTrueRange(
-            df["high"],
-            df["low"],
-            df["close"],
-            self.atr_period,
-        ).average_true_range()
-
-        return df
-
     # ================= DATA =================
     def fetch_klines(self, symbol):
-        klines = self.client.get_historical_klines(
-            symbol, self.interval, START_DATE, END_DATE
-        )
-
-        df = pd.DataFrame(
-            klines,
-            columns=[
-                "time",
-                "open",
-                "high",
-                "low",
-                "close",
-                "volume",
-                "_",
-                "_",
-                "_",
-                "_",
-                "_",
-                "_",
-            ],
-        )
-
-        df = df[["time", "open", "high", "low", "close", "volume"]]
-        df["time"] = pd.to_datetime(df["time"], unit="ms")
-        df = df.astype(float, errors="ignore")
-
-        return self.add_indicators(df)
-
-    # ================= TRADING =================
-    def buy(self, symbol, price, atr, time):
-        s = self.state[symbol]
-        sl = price - atr * self.atr_mult
-
-        risk_amt = s["balance"] * self.risk_per_trade
-        qty = min(risk_amt / (price - sl), s["balance"] / price)
-        qty = round(qty, 0)
-
-        if qty <= 0:
-            return
-
-        s["qty"] = qty
-        s["entry"] = price
-        s["sl"] = sl
-        s["balance"] -= qty * price * self.fee_pct
-
-        s["trades"].append(
-            {
-                "type": "BUY",
-                "time": time,
-                "price": price,
-                "qty": qty,
-            }
-        )
-
-    def sell(self, symbol, price, time, reason):
-        s = self.state[symbol]
-        pnl = s["qty"] * (price - s["entry"])
-
-        s["balance"] += pnl
-        s["balance"] -= s["qty"] * price * self.fee_pct
-
-        s["trades"].append(
-            {
-                "type": "SELL",
-                "time": time,
-                "price": price,
-                "pnl": pnl,
-                "reason": reason,
-            }
-        )
-
-        s["qty"] = 0.0
+        df = self.cache.frame(symbol, self.interval, START_DATE, END_DATE)
+        return self.strategy.add_indicators(df)
 
     # ================= BACKTEST =================
     def run(self):
+        self.cache.prefetch(self.symbols, self.interval, START_DATE, END_DATE)
         for symbol in self.symbols:
             print(f"\n📊 Backtesting {symbol}")
             df = self.fetch_klines(symbol)
             s = self.state[symbol]
 
-            for i in range(50, len(df)):
-                row = df.iloc[i]
-
-                if s["qty"] == 0:
-                    if (
-                        row["rsi6"] > 30
-                        and row["dif_prev"] < row["dea_prev"]
-                        and row["dif"] > row["dea"]
-                    ):
-                        self.buy(symbol, row["close"], row["atr"], row["time"])
-
-                else:
-                    if row["low"] <= s["sl"]:
-                        self.sell(symbol, s["sl"], row["time"], "SL")
-                    elif (
-                        row["rsi6"] < 60
-                        and row["dif_prev"] > row["dea_prev"]
-                        and row["dif"] < row["dea"]
-                    ):
-                        self.sell(symbol, row["close"], row["time"], "SIGNAL")
+            # fills, fees and whole-unit sizing all come from the array engine
+            res = run_backtest(
+                df,
+                s["balance"],
+                self.risk_per_trade,
+                self.fee_pct,
+                self.atr_mult,
+                lot_decimals=0,
+                falsy_exit_holds=False,
+            )
+            times = df["time"].to_numpy()
+
+            for t in res.trades:
+                s["trades"].append(
+                    {
+                        "type": "BUY",
+                        "time": times[t["entry_idx"]],
+                        "price": t["entry"],
+                        "qty": t["qty"],
+                    }
+                )
+                s["trades"].append(
+                    {
+                        "type": "SELL",
+                        "time": times[t["exit_idx"]],
+                        "price": t["exit"],
+                        "pnl": t["pnl"],
+                        "reason": "SL" if t["reason"] == REASON_STOP else "SIGNAL",
+                    }
+                )
+
+            if len(res.trades):
+                last = res.trades[-1]
+                s.update({"entry": last["entry"], "sl": last["sl"]})
+            if res.position is not None:
+                idx, entry, qty, sl = res.position
+                s.update({"qty": qty, "entry": entry, "sl": sl})
+                s["trades"].append(
+                    {"type": "BUY", "time": times[idx], "price": entry, "qty": qty}
+                )
+            s["balance"] = res.balance
 
         self.summary()
 
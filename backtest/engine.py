@@ -0,0 +1,151 @@
+"""
+Array backtest engine for the single-coin RSI/MACD/ATR loop.
+
+Works on plain NumPy arrays instead of df.iloc[i] rows and jumps from
+event to event (next entry signal, next stop / exit candidate) rather than
+visiting every bar. Arithmetic is done in the same order and with the same
+float semantics as the per-bar loops, so balances, trades and equity
+curves are bit-for-bit identical.
+"""
+import numpy as np
+
+REASON_SIGNAL = 0
+REASON_STOP = 1
+
+TRADE_DTYPE = np.dtype([
+    ("entry_idx", np.int64),
+    ("exit_idx", np.int64),
+    ("entry", np.float64),
+    ("exit", np.float64),
+    ("sl", np.float64),
+    ("qty", np.float64),
+    ("pnl", np.float64),
+    ("reason", np.int8),
+])
+
+# first window scanned for an exit; doubles while nothing is found
+_SCAN = 64
+
+
+class BacktestResult:
+    def __init__(self, balance, equity, trades, start, position=None):
+        self.balance = balance
+        self.equity = equity        # balance after every bar in [start, n)
+        self.trades = trades        # closed trades, TRADE_DTYPE
+        self.start = start
+        self.position = position    # still open at the end: (entry_idx, entry, qty, sl)
+
+    @property
+    def pnl(self):
+        return self.trades["pnl"]
+
+
+def _div(a, b):
+    # the loops divide np.float64 values: x / 0.0 is inf / nan, not an exception
+    if b:
+        return a / b
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return float(np.float64(a) / b)
+
+
+def run_backtest(
+    arrays,
+    initial_balance,
+    risk_per_trade,
+    fee_pct,
+    atr_mult,
+    start=50,
+    lot_decimals=None,
+    falsy_exit_holds=True,
+):
+    """
+    arrays: close / low / atr / entry / exit (DataFrame or dict of arrays,
+    e.g. RsiMacdAtrStrategy.add_indicators output).
+
+    lot_decimals: round qty to this many decimals (MultiCoinBacktester
+    uses 0) and skip entries with qty <= 0. None keeps the raw risk-sized qty.
+    falsy_exit_holds: reproduce `if exit_price:` — an exit priced at 0.0
+    keeps the position open.
+    """
+    close = np.asarray(arrays["close"], dtype=np.float64)
+    low = np.asarray(arrays["low"], dtype=np.float64)
+    atr = np.asarray(arrays["atr"], dtype=np.float64)
+    exit_sig = np.asarray(arrays["exit"], dtype=bool)
+    entry_sig = np.asarray(arrays["entry"], dtype=bool)
+
+    n = len(close)
+    start = min(start, n)
+    equity = np.empty(n - start, dtype=np.float64)
+    trades = np.empty((n - start) // 2 + 1, dtype=TRADE_DTYPE)
+    n_trades = 0
+
+    entries = np.flatnonzero(entry_sig)
+    balance = initial_balance
+    qty = entry = sl = 0.0
+    entry_idx = 0
+    i = start
+
+    while i < n:
+        # ===== FLAT: jump to the next entry signal =====
+        if qty == 0:
+            k = np.searchsorted(entries, i)
+            if k == len(entries):
+                equity[i - start:] = balance
+                break
+            j = int(entries[k])
+            equity[i - start:j - start] = balance
+
+            price = float(close[j])
+            stop = price - float(atr[j]) * atr_mult
+            risk_amt = balance * risk_per_trade
+            a = _div(risk_amt, price - stop)
+            b = _div(balance, price)
+            q = b if b < a else a
+
+            if lot_decimals is not None:
+                q = round(q, lot_decimals)
+                if q <= 0:
+                    equity[j - start] = balance
+                    i = j + 1
+                    continue
+
+            entry, sl, qty, entry_idx = price, stop, q, j
+            balance -= qty * entry * fee_pct
+            equity[j - start] = balance
+            i = j + 1
+            continue
+
+        # ===== IN POSITION: jump to the next stop / exit candidate =====
+        step = _SCAN
+        j = -1
+        while i < n:
+            hi = min(n, i + step)
+            hits = np.flatnonzero((low[i:hi] <= sl) | exit_sig[i:hi])
+            if hits.size:
+                j = i + int(hits[0])
+                break
+            equity[i - start:hi - start] = balance
+            i = hi
+            step *= 2
+        if j < 0:
+            break
+
+        equity[i - start:j - start] = balance
+        if low[j] <= sl:
+            price, reason = sl, REASON_STOP
+        else:
+            price, reason = float(close[j]), REASON_SIGNAL
+
+        if price or not falsy_exit_holds:
+            pnl = qty * (price - entry)
+            balance += pnl
+            balance -= qty * price * fee_pct
+            trades[n_trades] = (entry_idx, j, entry, price, sl, qty, pnl, reason)
+            n_trades += 1
+            qty = 0
+
+        equity[j - start] = balance
+        i = j + 1
+
+    position = (entry_idx, entry, qty, sl) if qty != 0 else None
+    return BacktestResult(balance, equity, trades[:n_trades].copy(), start, position)
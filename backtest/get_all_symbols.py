@@ -3,11 +3,10 @@ import csv
 import os
 from datetime import datetime, UTC
 import sys
-import numpy as np
-import pandas as pd
 from datetime import datetime, timedelta, timezone
 from binance.client import Client
-import ta
+from exchange.kline_cache import KlineCache
+from backtest.scan import ScanParams, scan
 
 
 INTERVAL = Client.KLINE_INTERVAL_4HOUR
@@ -21,9 +20,12 @@ FEE_PCT = 0.001
 
 ATR_PERIOD = 14
 ATR_MULT = 1.0
+
+# worker processes for the eligibility scan (1 = run in this process)
+SCAN_PROCESSES = int(os.getenv("SCAN_PROCESSES", str(os.cpu_count() or 1)))
 # =========================================
 
-client = Client()
+CACHE = KlineCache()
 
 END_DATE = datetime.now(timezone.utc)
 START_DATE = END_DATE - timedelta(days=LOOKBACK_MONTHS * 30)
@@ -156,95 +158,13 @@ for s in usdt_symbols[:20]:
 
 # ================= DATA =================
 def fetch_data(symbol):
-    klines = client.get_historical_klines(
+    return CACHE.frame(
         symbol,
         INTERVAL,
         START_DATE.strftime("%d %b %Y"),
-        END_DATE.strftime("%d %b %Y")
+        END_DATE.strftime("%d %b %Y"),
     )
 
-    df = pd.DataFrame(klines, columns=[
-        "time","open","high","low","close","volume",
-        "_","_","_","_","_","_"
-    ])
-
-    df = df[["time","open","high","low","close","volume"]]
-    df["time"] = pd.to_datetime(df["time"], unit="ms")
-    df[["open","high","low","close","volume"]] = df[
-        ["open","high","low","close","volume"]
-    ].astype(float)
-
-    return df
-
-
-def add_indicators(df):
-    if df is None or len(df) < ATR_PERIOD:
-        return None  # not enough data, skip symbol
-    df["rsi6"] = ta.momentum.RSIIndicator(df["close"], 6).rsi()
-
-    macd = ta.trend.MACD(df["close"])
-    df["dif"] = macd.macd()
-    df["dea"] = macd.macd_signal()
-    df["dif_prev"] = df["dif"].shift(1)
-    df["dea_prev"] = df["dea"].shift(1)
-
-    df["atr"] = ta.volatility.AverageTrueRange(
-        df["high"], df["low"], df["close"], ATR_PERIOD
-    ).average_true_range()
-
-    return df
-
-
-# ================= STRATEGY =================
-def backtest_single_coin(df):
-    balance = INITIAL_BALANCE
-    qty = entry = sl = 0.0
-    trades = []
-    equity = []
-
-    for i in range(50, len(df)):
-        row = df.iloc[i]
-
-        if qty == 0:
-            if (
-                row["rsi6"] > 30
-                and row["dif_prev"] < row["dea_prev"]
-                and row["dif"] > row["dea"]
-            ):
-                entry = row["close"]
-                sl = entry - row["atr"] * ATR_MULT
-
-                risk_amt = balance * RISK_PER_TRADE
-                qty = min(
-                    risk_amt / (entry - sl),
-                    balance / entry
-                )
-
-                balance -= qty * entry * FEE_PCT
-
-        else:
-            exit_price = None
-
-            if row["low"] <= sl:
-                exit_price = sl
-            elif (
-                row["rsi6"] < 60
-                and row["dif_prev"] > row["dea_prev"]
-                and row["dif"] < row["dea"]
-            ):
-                exit_price = row["close"]
-
-            if exit_price:
-                pnl = qty * (exit_price - entry)
-                balance += pnl
-                balance -= qty * exit_price * FEE_PCT
-                trades.append(pnl)
-                qty = 0
-
-        equity.append(balance)
-
-    return balance, trades, equity
-
 
 # ================= ELIGIBILITY =================
 eligible = {}
@@ -253,29 +173,39 @@ eligible_coins_list = []
 
 print(f"\n===== ROLLING {LOOKBACK_MONTHS}-MONTH ELIGIBILITY =====")
 
-for sym in symbol_list:
-    df = add_indicators(fetch_data(sym))
-    if df is None or len(df) < ATR_PERIOD:
-        continue
-
-    final_balance, trades, equity = backtest_single_coin(df)
-    equity = np.array(equity)
 
-    peak = np.maximum.accumulate(equity)
-    if len(equity) < 2 or len(peak) < 2:
-        print("⚠️ No valid trades / equity curve — skipping symbol")
-        continue
+def report_progress(done, total, result):
+    status = "❌ " + result["error"] if "error" in result else "ok"
+    print(f"🔎 [{done}/{total}] {result['symbol']}: {status}", flush=True)
 
-    max_dd = ((equity - peak) / peak).min() * 100
 
-    wins = [t for t in trades if t > 0]
-    losses = [t for t in trades if t < 0]
+params = ScanParams(
+    INTERVAL,
+    START_DATE.strftime("%d %b %Y"),
+    END_DATE.strftime("%d %b %Y"),
+    INITIAL_BALANCE,
+    RISK_PER_TRADE,
+    FEE_PCT,
+    ATR_PERIOD,
+    ATR_MULT,
+)
+results = scan(symbol_list, params, SCAN_PROCESSES, report_progress)
 
-    avg_win = np.mean(wins) if wins else 0
-    avg_loss = abs(np.mean(losses)) if losses else 1
-    wl = avg_win / avg_loss
+# reported in symbol_list order, however the workers finished
+for r in results:
+    sym = r["symbol"]
+    if "error" in r:
+        print(f"⚠️ {sym} failed: {r['error']}")
+        continue
+    if "skipped" in r:
+        if r["skipped"] != "not enough data":
+            print("⚠️ No valid trades / equity curve — skipping symbol")
+        continue
 
-    ret_pct = (final_balance - INITIAL_BALANCE) / INITIAL_BALANCE * 100
+    final_balance = r["final_balance"]
+    max_dd = r["max_dd"]
+    wl = r["wl"]
+    ret_pct = r["ret_pct"]
 
     # ================= PROFIT REPORT =================
     profit = final_balance - INITIAL_BALANCE
@@ -291,7 +221,7 @@ for sym in symbol_list:
     else:
         print(f"Net Loss        : {profit:.2f} USDT ({profit_pct:.2f}%)")
     print(f"Return : {ret_pct:.2f}%")
-    print(f"Trades : {len(trades)}")
+    print(f"Trades : {r['trades']}")
     print(f"Max DD : {max_dd:.2f}%")
     print(f"W/L    : {wl:.2f}")
     print("==========================\n")
@@ -305,7 +235,7 @@ for sym in symbol_list:
         "Net Profit"      : f"{profit:.2f} USDT ({profit_pct:.2f}%)",
         "Net Amount" : f"{final_balance:.2f}",
         "Return" : f"{ret_pct:.2f}%",
-        "Trades" : f"{len(trades)}",
+        "Trades" : f"{r['trades']}",
         "Max DD" : f"{max_dd:.2f}%",
         "W/L"    : f"{wl:.2f}",
         "Type": "✅ ELIGIBLE" if ret_pct >= 0 else "❌ DISABLED",
@@ -318,7 +248,8 @@ for sym in symbol_list:
         wl >= 1.8
         and ret_pct >= 0
     ):
-        eligible[sym] = df
+        # already on disk from the scan; ranking only needs the closes
+        eligible[sym] = fetch_data(sym)
         stats[sym] = {
             "long_ret": ret_pct / 100,
             "wl_score": min(wl / 3.0, 1.0)
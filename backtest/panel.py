@@ -0,0 +1,116 @@
+import json
+import os
+
+import numpy as np
+
+from utils.candle_store import OHLCV
+from utils.timeframe import to_ms
+
+
+class PricePanel:
+    """
+    Several symbols on one shared open-time axis.
+
+    All fields live in one contiguous float64 array laid out
+    (field, time, symbol), so panel["close"] is a time x symbol matrix and
+    panel["close"][i] is the whole cross-section at bar i in one read.
+    Bars a symbol does not have (not listed yet, delisted, gaps) are NaN;
+    `valid` marks the ones it does. The array can be a memmap on disk.
+    """
+
+    def __init__(self, symbols, time, values, fields=OHLCV):
+        self.symbols = list(symbols)
+        self.fields = tuple(fields)
+        self.time = time                    # int64 ms open times, ascending
+        self.values = values                # (field, time, symbol)
+        self._index = {f: i for i, f in enumerate(self.fields)}
+        self._col = {s: i for i, s in enumerate(self.symbols)}
+        self.valid = ~np.isnan(self["close"] if "close" in self._index else values[0])
+
+    def __len__(self):
+        return len(self.time)
+
+    def __getitem__(self, field):
+        return self.values[self._index[field]]
+
+    # ================= BUILD =================
+    @classmethod
+    def build(cls, frames, fields=OHLCV, path=None):
+        """
+        frames: {symbol: DataFrame / dict with an open time column "time"
+        (ms ints or datetimes) plus `fields`}. With `path`, the panel is
+        written there and memory-mapped instead of held in RAM.
+        """
+        symbols = list(frames)
+        times = {s: to_ms(frames[s]["time"]) for s in symbols}
+        axis = np.unique(np.concatenate([np.empty(0, np.int64), *times.values()]))
+
+        shape = (len(fields), len(axis), len(symbols))
+        if path is None:
+            values = np.full(shape, np.nan)
+        else:
+            os.makedirs(path, exist_ok=True)
+            np.save(os.path.join(path, "time.npy"), axis)
+            with open(os.path.join(path, "meta.json"), "w") as f:
+                json.dump({"symbols": symbols, "fields": list(fields)}, f)
+            values = np.lib.format.open_memmap(
+                os.path.join(path, "values.npy"), mode="w+", dtype=np.float64, shape=shape
+            )
+            values[:] = np.nan
+
+        for j, s in enumerate(symbols):
+            rows = np.searchsorted(axis, times[s])
+            for k, field in enumerate(fields):
+                values[k, rows, j] = np.asarray(frames[s][field], dtype=np.float64)
+
+        if path is not None:
+            values.flush()
+        return cls(symbols, axis, values, fields)
+
+    @classmethod
+    def from_cache(cls, cache, symbols, interval, start_str, end_str=None, path=None):
+        """Panel straight from a KlineCache (one concurrent prefetch first)"""
+        cache.prefetch(symbols, interval, start_str, end_str)
+        frames = {
+            s: cache.arrays(s, interval, start_str, end_str, fetch=False) for s in symbols
+        }
+        return cls.build(frames, path=path)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+        values = np.load(os.path.join(path, "values.npy"), mmap_mode="r" if mmap else None)
+        return cls(meta["symbols"], np.load(os.path.join(path, "time.npy")), values, meta["fields"])
+
+    # ================= READ =================
+    def column(self, symbol):
+        return self._col[symbol]
+
+    def series(self, symbol, fields=None):
+        """One symbol's own bars (missing ones dropped) as {field: array}"""
+        j = self._col[symbol]
+        rows = self.valid[:, j]
+        out = {"time": self.time[rows]}
+        for f in fields or self.fields:
+            out[f] = self[f][rows, j]
+        return out
+
+    def compute(self, fn):
+        """
+        Per-symbol derived fields (indicators, signals) on the shared axis.
+        fn gets series(symbol) and returns {name: array over those bars};
+        the result is {name: time x symbol matrix}, NaN / False where the
+        symbol has no bar.
+        """
+        out = {}
+        for j, s in enumerate(self.symbols):
+            rows = self.valid[:, j]
+            for name, arr in fn(self.series(s)).items():
+                arr = np.asarray(arr)
+                if name not in out:
+                    fill = False if arr.dtype == bool else np.nan
+                    dtype = bool if arr.dtype == bool else np.float64
+                    out[name] = np.full((len(self.time), len(self.symbols)), fill, dtype=dtype)
+                out[name][rows, j] = arr
+        return out
@@ -0,0 +1,191 @@
+"""
+Event-driven multi-coin portfolio backtest for the RSI/MACD/ATR strategy.
+
+Each symbol keeps its own bar calendar (listing date, gaps, interval).
+Signals are computed once per symbol on its own candles; the engine then
+only visits bars where something can happen - the next entry signal of a
+flat symbol, the next stop / exit bar of an open one - merged across
+symbols in open-time order by a heap. Work grows with the number of
+events (log symbols each), not with symbols x bars.
+
+Within one open time, exits are filled before entries (a freed slot and
+its capital are usable by the same bar) and symbols go in the order they
+were added. Shared balance and MAX_OPEN_TRADES slots are checked live.
+"""
+import heapq
+
+import numpy as np
+
+from backtest.engine import REASON_SIGNAL, REASON_STOP, TRADE_DTYPE, _div
+from utils.timeframe import to_ms
+
+PORTFOLIO_TRADE_DTYPE = np.dtype(
+    [("symbol", np.int32), ("entry_time", np.int64), ("exit_time", np.int64)]
+    + TRADE_DTYPE.descr
+)
+
+# heap phases inside one open time
+_EXIT = 0
+_ENTRY = 1
+
+# first window scanned for an exit; doubles while nothing is found
+_SCAN = 64
+
+
+class PortfolioResult:
+    def __init__(self, balance, equity_time, equity, trades, symbols, positions):
+        self.balance = balance
+        self.equity_time = equity_time  # ms open time of every fill
+        self.equity = equity            # balance after that fill
+        self.trades = trades            # closed trades, PORTFOLIO_TRADE_DTYPE
+        self.symbols = symbols          # trades["symbol"] indexes this list
+        self.positions = positions      # still open: {symbol: (entry_time, entry, qty, sl)}
+
+    @property
+    def pnl(self):
+        return self.trades["pnl"]
+
+
+class _Stream:
+    __slots__ = ("time", "close", "low", "atr", "entries", "exit", "qty", "entry", "sl", "entry_idx")
+
+    def __init__(self, time, close, low, atr, entry, exit):
+        self.time = time
+        self.close = close
+        self.low = low
+        self.atr = atr
+        self.entries = np.flatnonzero(entry)
+        self.exit = exit
+        self.qty = self.entry = self.sl = 0.0
+        self.entry_idx = -1
+
+    def next_entry(self, i):
+        k = np.searchsorted(self.entries, i)
+        return int(self.entries[k]) if k < len(self.entries) else -1
+
+    def next_exit(self, i):
+        n = len(self.low)
+        step = _SCAN
+        while i < n:
+            hi = min(n, i + step)
+            hits = np.flatnonzero((self.low[i:hi] <= self.sl) | self.exit[i:hi])
+            if hits.size:
+                return i + int(hits[0])
+            i = hi
+            step *= 2
+        return -1
+
+
+class PortfolioEngine:
+    def __init__(
+        self,
+        strategy,
+        initial_balance=10000.0,
+        risk_per_trade=0.01,
+        fee_pct=0.001,
+        max_open_trades=2,
+        warmup=50,
+    ):
+        self.strategy = strategy
+        self.initial_balance = initial_balance
+        self.risk_per_trade = risk_per_trade
+        self.fee_pct = fee_pct
+        self.max_open_trades = max_open_trades
+        self.warmup = warmup
+
+        self.symbols = []
+        self._streams = []
+
+    def add(self, symbol, arrays):
+        """arrays: time (ms or datetime) / high / low / close of one symbol"""
+        sig = self.strategy.signals(arrays)
+        self.symbols.append(symbol)
+        self._streams.append(_Stream(
+            to_ms(arrays["time"]),
+            np.asarray(arrays["close"], dtype=np.float64),
+            np.asarray(arrays["low"], dtype=np.float64),
+            np.asarray(sig["atr"], dtype=np.float64),
+            np.asarray(sig["entry"], dtype=bool),
+            np.asarray(sig["exit"], dtype=bool),
+        ))
+        return self
+
+    # ================= RUN =================
+    def run(self):
+        streams = self._streams
+        heap = []
+        for k, s in enumerate(streams):
+            j = s.next_entry(self.warmup)
+            if j >= 0:
+                heap.append((s.time[j], _ENTRY, k, j))
+        heapq.heapify(heap)
+
+        balance = self.initial_balance
+        open_trades = 0
+        fee_pct = self.fee_pct
+        equity_time, equity, trades = [], [], []
+
+        while heap:
+            t, phase, k, j = heapq.heappop(heap)
+            s = streams[k]
+
+            if phase == _EXIT:
+                if s.low[j] <= s.sl:
+                    price, reason = s.sl, REASON_STOP
+                else:
+                    price, reason = float(s.close[j]), REASON_SIGNAL
+
+                pnl = s.qty * (price - s.entry)
+                balance += pnl
+                balance -= s.qty * price * fee_pct
+                trades.append((
+                    k, s.time[s.entry_idx], t,
+                    s.entry_idx, j, s.entry, price, s.sl, s.qty, pnl, reason,
+                ))
+                s.qty = 0.0
+                open_trades -= 1
+                equity_time.append(t)
+                equity.append(balance)
+
+                # a symbol never re-enters on the bar it exited
+                nxt = s.next_entry(j + 1)
+                if nxt >= 0:
+                    heapq.heappush(heap, (s.time[nxt], _ENTRY, k, nxt))
+                continue
+
+            if open_trades < self.max_open_trades:
+                price = float(s.close[j])
+                stop = self.strategy.stop_price(price, float(s.atr[j]))
+                a = _div(balance * self.risk_per_trade, price - stop)
+                b = _div(balance, price)
+
+                s.qty = b if b < a else a
+                s.entry, s.sl, s.entry_idx = price, stop, j
+                balance -= s.qty * price * fee_pct
+                open_trades += 1
+                equity_time.append(t)
+                equity.append(balance)
+
+                out = s.next_exit(j + 1)
+                if out >= 0:
+                    heapq.heappush(heap, (s.time[out], _EXIT, k, out))
+                continue
+
+            # no free slot: wait for this symbol's next signal
+            nxt = s.next_entry(j + 1)
+            if nxt >= 0:
+                heapq.heappush(heap, (s.time[nxt], _ENTRY, k, nxt))
+
+        positions = {
+            self.symbols[k]: (int(s.time[s.entry_idx]), s.entry, s.qty, s.sl)
+            for k, s in enumerate(streams)
+            if s.qty != 0
+        }
+        return PortfolioResult(
+            balance,
+            np.asarray(equity_time, dtype=np.int64),
+            np.asarray(equity, dtype=np.float64),
+            np.array(trades, dtype=PORTFOLIO_TRADE_DTYPE),
+            list(self.symbols),
+            positions,
+        )
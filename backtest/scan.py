@@ -0,0 +1,147 @@
+"""
+Parallel single-coin eligibility scan.
+
+Each worker process has its own kline downloader / cache and a share of
+the request-weight budget. It fetches one symbol (network wait) and then
+backtests it (CPU), so with more workers than cores the fetches of some
+symbols overlap the backtests of others. Results come back in input order,
+whatever order the workers finish in.
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from backtest.engine import run_backtest
+from config import config
+from exchange.kline_cache import KlineCache
+from exchange.rate_limit import WeightLimiter
+from strategy.rsi_macd_atr import RsiMacdAtrStrategy
+
+
+class ScanParams:
+    def __init__(
+        self,
+        interval,
+        start_str,
+        end_str,
+        initial_balance=10000.0,
+        risk_per_trade=0.01,
+        fee_pct=0.001,
+        atr_period=14,
+        atr_mult=1.0,
+    ):
+        self.interval = interval
+        self.start_str = start_str
+        self.end_str = end_str
+        self.initial_balance = initial_balance
+        self.risk_per_trade = risk_per_trade
+        self.fee_pct = fee_pct
+        self.atr_period = atr_period
+        self.atr_mult = atr_mult
+
+
+# per-process state, set up once by _init_worker
+_worker = {}
+
+
+def _init_worker(params, weight_limit):
+    _worker["params"] = params
+    _worker["cache"] = KlineCache(
+        limiter=WeightLimiter(weight_limit, ip_limit=config.binance.REQUEST_WEIGHT_LIMIT)
+    )
+    _worker["strategy"] = RsiMacdAtrStrategy(params.atr_period, params.atr_mult)
+
+
+# ================= ONE SYMBOL =================
+def evaluate(symbol, df, params, start=50):
+    """
+    Backtest one prepared frame and compute the eligibility metrics.
+    start=0 for slices of an already warm indicator frame.
+    """
+    res = run_backtest(
+        df, params.initial_balance, params.risk_per_trade, params.fee_pct, params.atr_mult,
+        start=start,
+    )
+    final_balance, trades, equity = res.balance, res.pnl.tolist(), res.equity
+
+    if len(equity) < 2:
+        return {"symbol": symbol, "skipped": "no valid trades / equity curve"}
+
+    peak = np.maximum.accumulate(equity)
+    max_dd = ((equity - peak) / peak).min() * 100
+
+    wins = [t for t in trades if t > 0]
+    losses = [t for t in trades if t < 0]
+
+    avg_win = np.mean(wins) if wins else 0
+    avg_loss = abs(np.mean(losses)) if losses else 1
+
+    return {
+        "symbol": symbol,
+        "final_balance": final_balance,
+        "trades": len(trades),
+        "max_dd": max_dd,
+        "wl": avg_win / avg_loss,
+        "ret_pct": (final_balance - params.initial_balance) / params.initial_balance * 100,
+    }
+
+
+def scan_symbol(symbol):
+    """Fetch + backtest in a worker; never raises, failures come back as results"""
+    params = _worker["params"]
+    try:
+        df = _worker["cache"].frame(symbol, params.interval, params.start_str, params.end_str)
+        if len(df) < params.atr_period:
+            return {"symbol": symbol, "skipped": "not enough data"}
+        _worker["strategy"].add_indicators(df)
+        return evaluate(symbol, df, params)
+    except Exception as e:
+        return {"symbol": symbol, "error": f"{type(e).__name__}: {e}"}
+
+
+# ================= UNIVERSE =================
+def scan(symbols, params, processes=None, progress=None):
+    """
+    Scan every symbol; returns one result dict per symbol, in input order.
+    processes=1 runs in this process. progress(done, total, result) is
+    called as each symbol finishes.
+    """
+    symbols = list(symbols)
+    processes = processes or os.cpu_count() or 1
+    # every process gets an equal slice of the per-IP weight budget
+    weight_limit = config.binance.REQUEST_WEIGHT_LIMIT / processes
+    results = [None] * len(symbols)
+
+    if processes <= 1:
+        _init_worker(params, weight_limit)
+        for i, sym in enumerate(symbols):
+            results[i] = scan_symbol(sym)
+            if progress:
+                progress(i + 1, len(symbols), results[i])
+        return results
+
+    # the scan scripts are unguarded top-level code, so workers must be
+    # forked rather than spawned (spawn would re-run the calling script)
+    methods = multiprocessing.get_all_start_methods()
+    ctx = multiprocessing.get_context("fork") if "fork" in methods else None
+
+    with ProcessPoolExecutor(
+        max_workers=processes,
+        mp_context=ctx,
+        initializer=_init_worker,
+        initargs=(params, weight_limit),
+    ) as pool:
+        futures = {pool.submit(scan_symbol, sym): i for i, sym in enumerate(symbols)}
+        for done, fut in enumerate(as_completed(futures), start=1):
+            i = futures[fut]
+            try:
+                results[i] = fut.result()
+            except Exception as e:
+                # the worker itself died (e.g. killed / out of memory)
+                results[i] = {"symbol": symbols[i], "error": f"{type(e).__name__}: {e}"}
+            if progress:
+                progress(done, len(symbols), results[i])
+
+    return results
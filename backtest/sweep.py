@@ -0,0 +1,211 @@
+"""
+Parameter sweep for the RSI/MACD/ATR strategy.
+
+The grid is expanded into parameter sets, which are grouped by the
+indicator configuration they need (atr_period, rsi_period). Each
+(symbol, group) is one task and every parameter set in the group only
+re-derives the cheap entry / exit masks before running the array
+engine. Tasks are spread over a process pool.
+
+Indicators are cached per worker process and symbol, each by the one
+parameter it depends on: ATR per atr_period, RSI per rsi_period, MACD
+once, so a group only assembles arrays already computed.
+
+python -m backtest.sweep
+"""
+import itertools
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from backtest.scan import ScanParams, evaluate
+from strategy.rsi_macd_atr import atr, entry_signal, exit_signal, macd, rsi
+
+# parameter -> value used when the grid leaves it out
+DEFAULTS = {
+    "atr_period": 14,
+    "atr_mult": 1.0,
+    "rsi_period": 6,
+    "rsi_entry": 30,
+    "rsi_exit": 60,
+    "risk_per_trade": 0.01,
+}
+
+# only these change the indicator arrays; the rest reuse them
+INDICATOR_KEYS = ("atr_period", "rsi_period")
+
+RESULT_COLUMNS = ["final_balance", "ret_pct", "max_dd", "wl", "trades"]
+
+
+def expand_grid(grid):
+    """{param: [values]} -> list of complete parameter dicts (grid order)"""
+    unknown = set(grid) - set(DEFAULTS)
+    if unknown:
+        raise ValueError(f"Unknown sweep parameters: {sorted(unknown)}")
+
+    keys = list(DEFAULTS)
+    values = [list(grid.get(k, [DEFAULTS[k]])) for k in keys]
+    return [dict(zip(keys, combo)) for combo in itertools.product(*values)]
+
+
+class IndicatorCache:
+    """Indicator arrays of one history; each indicator computed once per period"""
+
+    def __init__(self, arrays):
+        self.close = pd.Series(np.asarray(arrays["close"], dtype=float))
+        self.high = pd.Series(np.asarray(arrays["high"], dtype=float))
+        self.low = pd.Series(np.asarray(arrays["low"], dtype=float))
+        self._macd = None
+        self._atr = {}
+        self._rsi = {}
+
+    def get(self, atr_period, rsi_period):
+        """Same arrays as RsiMacdAtrStrategy(atr_period, rsi_period=...).indicators()"""
+        if self._macd is None:
+            self._macd = macd(self.close)
+        if atr_period not in self._atr:
+            self._atr[atr_period] = atr(self.high, self.low, self.close, atr_period)
+        if rsi_period not in self._rsi:
+            self._rsi[rsi_period] = rsi(self.close, rsi_period)
+        return {"rsi6": self._rsi[rsi_period], **self._macd, "atr": self._atr[atr_period]}
+
+
+# per-process state, set up once by _init_worker
+_worker = {}
+
+
+def _init_worker(data, initial_balance, fee_pct):
+    _worker["data"] = data
+    _worker["indicators"] = {}
+    _worker["initial_balance"] = initial_balance
+    _worker["fee_pct"] = fee_pct
+
+
+# ================= ONE TASK =================
+def run_group(symbol, combos):
+    """Backtest every parameter set sharing one indicator configuration"""
+    arrays = _worker["data"][symbol]
+    cache = _worker["indicators"].get(symbol)
+    if cache is None:
+        cache = _worker["indicators"][symbol] = IndicatorCache(arrays)
+    ind = cache.get(combos[0]["atr_period"], combos[0]["rsi_period"])
+
+    frame = {
+        "close": arrays["close"],
+        "low": arrays["low"],
+        "atr": ind["atr"],
+    }
+    signal_args = (ind["rsi6"], ind["dif"], ind["dea"], ind["dif_prev"], ind["dea_prev"])
+    entries, exits = {}, {}
+
+    rows = []
+    for p in combos:
+        # masks are shared by every combo with the same threshold
+        if p["rsi_entry"] not in entries:
+            entries[p["rsi_entry"]] = entry_signal(*signal_args, p["rsi_entry"])
+        if p["rsi_exit"] not in exits:
+            exits[p["rsi_exit"]] = exit_signal(*signal_args, p["rsi_exit"])
+        frame["entry"] = entries[p["rsi_entry"]]
+        frame["exit"] = exits[p["rsi_exit"]]
+
+        params = ScanParams(
+            None, None, None,
+            _worker["initial_balance"],
+            p["risk_per_trade"],
+            _worker["fee_pct"],
+            p["atr_period"],
+            p["atr_mult"],
+        )
+        rows.append({"symbol": symbol, **p, **evaluate(symbol, frame, params)})
+    return rows
+
+
+# ================= SWEEP =================
+def sweep(data, grid, initial_balance=10000.0, fee_pct=0.001, processes=None, progress=None):
+    """
+    data: {symbol: high / low / close arrays (DataFrame or dict)}
+    grid: {param: [values]} over DEFAULTS' keys.
+
+    Returns one row per (symbol, parameter set) with the parameters plus
+    final_balance, ret_pct, max_dd, wl and trades (NaN when the run had no
+    equity curve). progress(done, total) is called as each task finishes.
+    """
+    combos = expand_grid(grid)
+    groups = {}
+    for i, p in enumerate(combos):
+        groups.setdefault(tuple(p[k] for k in INDICATOR_KEYS), []).append((i, p))
+
+    tasks = [
+        (symbol, items)
+        for symbol in data
+        for items in groups.values()
+    ]
+    processes = processes or os.cpu_count() or 1
+    results = {}
+
+    def collect(symbol, items, rows):
+        for (i, _), row in zip(items, rows):
+            results[symbol, i] = row
+
+    if processes <= 1:
+        _init_worker(data, initial_balance, fee_pct)
+        for done, (symbol, items) in enumerate(tasks, start=1):
+            collect(symbol, items, run_group(symbol, [p for _, p in items]))
+            if progress:
+                progress(done, len(tasks))
+    else:
+        # forked workers inherit `data` instead of unpickling a copy each
+        methods = multiprocessing.get_all_start_methods()
+        ctx = multiprocessing.get_context("fork") if "fork" in methods else None
+
+        with ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=ctx,
+            initializer=_init_worker,
+            initargs=(data, initial_balance, fee_pct),
+        ) as pool:
+            futures = {
+                pool.submit(run_group, symbol, [p for _, p in items]): (symbol, items)
+                for symbol, items in tasks
+            }
+            for done, fut in enumerate(as_completed(futures), start=1):
+                collect(*futures[fut], fut.result())
+                if progress:
+                    progress(done, len(tasks))
+
+    rows = [results[symbol, i] for symbol in data for i in range(len(combos))]
+    df = pd.DataFrame(rows)
+    for col in RESULT_COLUMNS:
+        if col not in df:
+            df[col] = float("nan")
+    return df[["symbol", *DEFAULTS, *RESULT_COLUMNS]]
+
+
+if __name__ == "__main__":
+    from binance.client import Client
+
+    from exchange.kline_cache import KlineCache
+
+    SYMBOLS = ["PEPEUSDT", "DOGEUSDT", "SHIBUSDT", "FLOKIUSDT"]
+    INTERVAL = Client.KLINE_INTERVAL_4HOUR
+    START_DATE = "1 Jan 2023"
+    END_DATE = "1 Jan 2025"
+
+    GRID = {
+        "atr_period": [10, 14, 20],
+        "atr_mult": [0.5, 1.0, 1.5, 2.0, 3.0],
+        "rsi_entry": [25, 30, 35, 40],
+        "rsi_exit": [55, 60, 65, 70],
+        "risk_per_trade": [0.005, 0.01],
+    }
+
+    cache = KlineCache()
+    cache.prefetch(SYMBOLS, INTERVAL, START_DATE, END_DATE)
+    data = {s: cache.arrays(s, INTERVAL, START_DATE, END_DATE, fetch=False) for s in SYMBOLS}
+
+    table = sweep(data, GRID, progress=lambda d, t: print(f"🔎 {d}/{t}", end="\r"))
+    print()
+    print(table.sort_values("ret_pct", ascending=False).head(20).to_string(index=False))
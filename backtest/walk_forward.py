@@ -0,0 +1,236 @@
+"""
+Walk-forward optimization for the RSI/MACD/ATR strategy.
+
+History is split into in-sample (IS) / out-of-sample (OOS) folds, rolling
+(fixed-length IS) or anchored (IS always starts at the first tradable
+bar). Each fold's IS window is swept over the parameter grid in a worker
+process; the winner is then traded on the following OOS window and the
+OOS runs are chained into one equity curve.
+
+Indicators are causal recursions, so they are computed once per indicator
+configuration over the whole history and every fold reads its slice: a
+fold picks up the state left by the bars before it (no re-warm-up, no
+per-fold recomputation) and never sees bars after it.
+
+python -m backtest.walk_forward
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from backtest.engine import run_backtest
+from backtest.scan import ScanParams, evaluate
+from backtest.sweep import INDICATOR_KEYS, IndicatorCache, expand_grid
+from strategy.rsi_macd_atr import entry_signal, exit_signal
+
+
+class WalkForwardResult:
+    def __init__(self, balance, equity, folds):
+        self.balance = balance
+        self.equity = equity        # stitched OOS equity, pd.Series
+        self.folds = folds          # one row per fold, pd.DataFrame
+
+
+def windows(n, is_bars, oos_bars, anchored=False, start=50):
+    """
+    (is_start, is_end, oos_start, oos_end) bar indices, half-open.
+    Folds step forward by oos_bars; the last OOS window may be shorter.
+    """
+    folds = []
+    oos_start = start + is_bars
+    while oos_start < n:
+        is_start = start if anchored else oos_start - is_bars
+        oos_end = min(n, oos_start + oos_bars)
+        folds.append((is_start, oos_start, oos_start, oos_end))
+        oos_start = oos_end
+    return folds
+
+
+# ================= SIGNALS =================
+class _Signals:
+    """Whole-history indicators per configuration, entry / exit masks per threshold"""
+
+    def __init__(self, arrays, combos):
+        self.arrays = arrays
+        self.indicators = {}
+        cache = IndicatorCache(arrays)
+        for p in combos:
+            key = tuple(p[k] for k in INDICATOR_KEYS)
+            if key not in self.indicators:
+                self.indicators[key] = cache.get(p["atr_period"], p["rsi_period"])
+        self._masks = {}
+
+    def frame(self, p, lo, hi):
+        key = tuple(p[k] for k in INDICATOR_KEYS)
+        ind = self.indicators[key]
+        args = (ind["rsi6"], ind["dif"], ind["dea"], ind["dif_prev"], ind["dea_prev"])
+
+        if (key, "entry", p["rsi_entry"]) not in self._masks:
+            self._masks[key, "entry", p["rsi_entry"]] = entry_signal(*args, p["rsi_entry"])
+        if (key, "exit", p["rsi_exit"]) not in self._masks:
+            self._masks[key, "exit", p["rsi_exit"]] = exit_signal(*args, p["rsi_exit"])
+
+        return {
+            "close": np.asarray(self.arrays["close"], dtype=float)[lo:hi],
+            "low": np.asarray(self.arrays["low"], dtype=float)[lo:hi],
+            "atr": ind["atr"][lo:hi],
+            "entry": self._masks[key, "entry", p["rsi_entry"]][lo:hi],
+            "exit": self._masks[key, "exit", p["rsi_exit"]][lo:hi],
+        }
+
+
+# per-process state, set up once by _init_worker
+_worker = {}
+
+
+def _init_worker(signals, combos, initial_balance, fee_pct, objective):
+    _worker["signals"] = signals
+    _worker["combos"] = combos
+    _worker["initial_balance"] = initial_balance
+    _worker["fee_pct"] = fee_pct
+    _worker["objective"] = objective
+
+
+def optimize(lo, hi):
+    """Best combo index on bars [lo, hi) and its score"""
+    best, best_score = None, -np.inf
+    for i, p in enumerate(_worker["combos"]):
+        params = ScanParams(
+            None, None, None,
+            _worker["initial_balance"],
+            p["risk_per_trade"],
+            _worker["fee_pct"],
+            p["atr_period"],
+            p["atr_mult"],
+        )
+        # the slice is already past the warm-up: trade from its first bar
+        res = evaluate(None, _worker["signals"].frame(p, lo, hi), params, start=0)
+        score = res.get(_worker["objective"], -np.inf)
+        # NaN scores (e.g. W/L with no trades) never win
+        if score > best_score:
+            best, best_score = i, score
+    return best, best_score
+
+
+# ================= WALK FORWARD =================
+def walk_forward(
+    arrays,
+    grid,
+    is_bars,
+    oos_bars,
+    anchored=False,
+    objective="ret_pct",
+    initial_balance=10000.0,
+    fee_pct=0.001,
+    warmup=50,
+    processes=None,
+):
+    """
+    arrays: time / high / low / close for one symbol (DataFrame or dict).
+    grid: {param: [values]} as for backtest.sweep.
+    objective: column of the scan metrics to maximize in-sample
+    (ret_pct, max_dd, wl, final_balance).
+
+    Each OOS window starts flat with the balance the previous one ended
+    with; a position still open at a window's end is closed at its last
+    close (fee included), so folds never leak into each other.
+    """
+    combos = expand_grid(grid)
+    signals = _Signals(arrays, combos)
+    n = len(arrays["close"])
+    folds = windows(n, is_bars, oos_bars, anchored, warmup)
+    if not folds:
+        raise ValueError(
+            f"{n} bars is too short for is_bars={is_bars} after {warmup} warm-up bars"
+        )
+
+    # IS optimization is the expensive, independent part
+    processes = min(processes or os.cpu_count() or 1, len(folds))
+    ranges = [(is_lo, is_hi) for is_lo, is_hi, _, _ in folds]
+    if processes <= 1:
+        _init_worker(signals, combos, initial_balance, fee_pct, objective)
+        picks = [optimize(lo, hi) for lo, hi in ranges]
+    else:
+        methods = multiprocessing.get_all_start_methods()
+        ctx = multiprocessing.get_context("fork") if "fork" in methods else None
+        with ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=ctx,
+            initializer=_init_worker,
+            initargs=(signals, combos, initial_balance, fee_pct, objective),
+        ) as pool:
+            picks = list(pool.map(optimize, *zip(*ranges)))
+
+    # OOS runs are cheap but chained through the balance, so sequential
+    times = np.asarray(arrays["time"]) if "time" in arrays else np.arange(n)
+    close = np.asarray(arrays["close"], dtype=float)
+    balance = initial_balance
+    curves, rows = [], []
+
+    for (is_lo, is_hi, lo, hi), (best, score) in zip(folds, picks):
+        row = {
+            "is_start": times[is_lo], "oos_start": times[lo], "oos_end": times[hi - 1],
+            "is_score": score, "start_balance": balance,
+        }
+        if best is None:
+            # nothing scored in-sample: sit the window out
+            curves.append(np.full(hi - lo, balance))
+            rows.append({**row, "end_balance": balance, "trades": 0})
+            continue
+
+        p = combos[best]
+        res = run_backtest(
+            signals.frame(p, lo, hi), balance, p["risk_per_trade"], fee_pct, p["atr_mult"],
+            start=0,
+        )
+        equity = res.equity.copy()
+        trades = len(res.trades)
+        balance = res.balance
+        if res.position is not None:
+            _, entry, qty, _ = res.position
+            exit_price = close[hi - 1]
+            balance += qty * (exit_price - entry)
+            balance -= qty * exit_price * fee_pct
+            equity[-1] = balance
+            trades += 1
+
+        curves.append(equity)
+        rows.append({**row, **p, "end_balance": balance, "trades": trades})
+
+    equity = pd.Series(
+        np.concatenate(curves), index=times[folds[0][2]:folds[-1][3]], name="equity"
+    )
+    folds_df = pd.DataFrame(rows)
+    folds_df["oos_ret_pct"] = (folds_df["end_balance"] / folds_df["start_balance"] - 1) * 100
+    return WalkForwardResult(balance, equity, folds_df)
+
+
+if __name__ == "__main__":
+    from binance.client import Client
+
+    from exchange.kline_cache import KlineCache
+
+    SYMBOL = "PEPEUSDT"
+    INTERVAL = Client.KLINE_INTERVAL_4HOUR
+    START_DATE = "1 Jan 2023"
+    END_DATE = "8 Jan 2026"
+
+    IS_BARS = 6 * 180      # ~6 months of 4h candles
+    OOS_BARS = 6 * 30      # ~1 month
+
+    GRID = {
+        "atr_mult": [0.5, 1.0, 1.5, 2.0, 3.0],
+        "rsi_entry": [25, 30, 35, 40],
+        "rsi_exit": [55, 60, 65, 70],
+    }
+
+    df = KlineCache().frame(SYMBOL, INTERVAL, START_DATE, END_DATE)
+    res = walk_forward(df, GRID, IS_BARS, OOS_BARS)
+
+    print(res.folds.to_string(index=False))
+    peak = res.equity.cummax()
+    print(f"\nFinal Balance : {res.balance:.2f}")
+    print(f"Max DD        : {((res.equity - peak) / peak).min() * 100:.2f}%")
@@ -0,0 +1,152 @@
+"""
+Run the benchmark suite and write machine-readable results.
+
+python -m benchmarks                          # full suite, synthetic data
+python -m benchmarks --quick                  # smaller sizes, smoke run
+python -m benchmarks --only on_kline,scan
+python -m benchmarks --cached PEPEUSDT:4h --cached DOGEUSDT:4h
+python -m benchmarks --compare benchmarks/results/<earlier>.json
+
+Results go to benchmarks/results/<UTC timestamp>.json together with the
+git commit and interpreter / library versions. --compare prints the
+ratio new / old for every shared numeric metric.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks import (
+    bench_backtest,
+    bench_decode,
+    bench_indicators,
+    bench_on_kline,
+    bench_portfolio,
+    bench_scan,
+    bench_simulator,
+)
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+def suite(quick=False, cached=None):
+    """name -> zero-argument callable returning a flat {metric: value} dict"""
+    if quick:
+        return {
+            "decode": lambda: bench_decode.run(20_000),
+            "on_kline": lambda: bench_on_kline.run(20_000),
+            "indicators": lambda: bench_indicators.run(100_000, 20_000),
+            "backtest": lambda: bench_backtest.run(2_000),
+            "portfolio": lambda: bench_portfolio.run(20, 5_000, cached),
+            "scan": lambda: bench_scan.run(20, 2_000, cached),
+            "simulator": lambda: bench_simulator.run(50, 5.0),
+        }
+    return {
+        "decode": lambda: bench_decode.run(),
+        "on_kline": lambda: bench_on_kline.run(),
+        "indicators": lambda: bench_indicators.run(),
+        "backtest": lambda: bench_backtest.run(),
+        "portfolio": lambda: bench_portfolio.run(cached=cached),
+        "scan": lambda: bench_scan.run(cached=cached),
+        "simulator": lambda: bench_simulator.run(),
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment():
+    return {
+        "time": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def _plain(value):
+    # numpy scalars -> JSON numbers
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def compare(new, old):
+    """{bench: {metric: new / old}} for numeric metrics present in both runs"""
+    out = {}
+    for name, metrics in new["results"].items():
+        before = old.get("results", {}).get(name, {})
+        ratios = {}
+        for key, value in metrics.items():
+            prev = before.get(key)
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            if isinstance(prev, (int, float)) and not isinstance(prev, bool) and prev:
+                ratios[key] = value / prev
+        if ratios:
+            out[name] = ratios
+    return out
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m benchmarks")
+    ap.add_argument("--quick", action="store_true", help="smaller sizes")
+    ap.add_argument("--only", help="comma-separated benchmark names")
+    ap.add_argument(
+        "--cached", action="append", metavar="SYMBOL:INTERVAL",
+        help="read this series from the local kline cache (repeatable)",
+    )
+    ap.add_argument("--compare", metavar="JSON", help="earlier results file")
+    ap.add_argument("--out", metavar="JSON", help="results path")
+    args = ap.parse_args(argv)
+
+    cached = [tuple(c.split(":", 1)) for c in args.cached] if args.cached else None
+    benches = suite(args.quick, cached)
+    if args.only:
+        names = args.only.split(",")
+        unknown = set(names) - set(benches)
+        if unknown:
+            ap.error(f"unknown benchmark(s): {', '.join(sorted(unknown))}")
+        benches = {name: benches[name] for name in names}
+
+    report = {"env": environment(), "quick": args.quick, "cached": args.cached, "results": {}}
+    for name, bench in benches.items():
+        print(f"▶ {name}", flush=True)
+        result = {key: _plain(value) for key, value in bench().items()}
+        report["results"][name] = result
+        for key, value in result.items():
+            print(f"  {key:26s}: {value:,.2f}" if isinstance(value, float) else f"  {key:26s}: {value}")
+
+    path = args.out or os.path.join(
+        RESULTS_DIR, time.strftime("%Y%m%dT%H%M%SZ", time.gmtime()) + ".json"
+    )
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"💾 {path}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            old = json.load(f)
+        print(f"\n📊 new / old vs {args.compare} ({old.get('env', {}).get('commit')})")
+        for name, ratios in compare(report, old).items():
+            print(f"▶ {name}")
+            for key, ratio in ratios.items():
+                print(f"  {key:26s}: {ratio:.3f}x")
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Single-coin backtest: df.iloc loop vs the array engine (no network).
+
+python -m benchmarks.bench_backtest [n_bars]
+"""
+import sys
+import time
+
+import numpy as np
+
+from backtest.engine import run_backtest
+from benchmarks.data import make_frame
+from strategy.rsi_macd_atr import RsiMacdAtrStrategy
+
+INITIAL_BALANCE = 10_000.0
+RISK_PER_TRADE = 0.01
+FEE_PCT = 0.001
+
+
+# ================= CANDIDATES =================
+def legacy_loop(df, strategy):
+    # the per-bar loop the backtest scripts used to run
+    balance = INITIAL_BALANCE
+    qty = entry = sl = 0.0
+    trades = []
+    equity = []
+
+    for i in range(50, len(df)):
+        row = df.iloc[i]
+
+        if qty == 0:
+            if row["entry"]:
+                entry = row["close"]
+                sl = strategy.stop_price(entry, row["atr"])
+
+                risk_amt = balance * RISK_PER_TRADE
+                qty = min(
+                    risk_amt / (entry - sl),
+                    balance / entry
+                )
+
+                balance -= qty * entry * FEE_PCT
+
+        else:
+            exit_price = None
+
+            if row["low"] <= sl:
+                exit_price = sl
+            elif row["exit"]:
+                exit_price = row["close"]
+
+            if exit_price:
+                pnl = qty * (exit_price - entry)
+                balance += pnl
+                balance -= qty * exit_price * FEE_PCT
+                trades.append(pnl)
+                qty = 0
+
+        equity.append(balance)
+
+    return balance, trades, equity
+
+
+def engine(df, strategy):
+    res = run_backtest(df, INITIAL_BALANCE, RISK_PER_TRADE, FEE_PCT, strategy.atr_mult)
+    return res.balance, res.pnl.tolist(), res.equity
+
+
+def timed(fn, *args, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, out
+
+
+def run(n=9_300):
+    # 9.3k bars ~ 51 months of 4h candles
+    strategy = RsiMacdAtrStrategy()
+    df = strategy.add_indicators(make_frame(n))
+
+    legacy_s, (b1, t1, e1) = timed(legacy_loop, df, strategy, repeat=1)
+    engine_s, (b2, t2, e2) = timed(engine, df, strategy)
+
+    return {
+        "bars": n,
+        "trades": len(t2),
+        "identical": b1 == b2 and t1 == t2 and np.array_equal(np.asarray(e1), e2),
+        "legacy_ms": legacy_s * 1000,
+        "engine_ms": engine_s * 1000,
+        "engine_bars_per_s": n / engine_s,
+        "speedup": legacy_s / engine_s,
+    }
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 9_300
+    for key, value in run(n).items():
+        print(f"{key:12s}: {value:,.2f}" if isinstance(value, float) else f"{key:12s}: {value}")
@@ -0,0 +1,93 @@
+"""
+Kline decoding micro-benchmark (no network).
+
+python -m benchmarks.bench_decode [n_messages]
+"""
+import json
+import sys
+import time
+
+import pandas as pd
+
+from exchange import kline_decoder
+from exchange.kline_decoder import decode_batch, decode_kline, loads
+
+
+def make_messages(n, symbols=("PEPEUSDT", "DOGEUSDT", "SHIBUSDT", "FLOKIUSDT")):
+    out = []
+    for i in range(n):
+        t = 1_700_000_000_000 + i * 60_000
+        price = 0.00001 + (i % 97) * 1e-8
+        out.append(json.dumps({
+            "stream": f"{symbols[i % len(symbols)].lower()}@kline_1m",
+            "data": {
+                "e": "kline", "E": t + 59_999, "s": symbols[i % len(symbols)],
+                "k": {
+                    "t": t, "T": t + 59_999, "s": symbols[i % len(symbols)], "i": "1m",
+                    "o": f"{price:.8f}", "h": f"{price * 1.01:.8f}",
+                    "l": f"{price * 0.99:.8f}", "c": f"{price:.8f}",
+                    "v": "123456789.00", "x": True,
+                },
+            },
+        }))
+    return out
+
+
+# ================= CANDIDATES =================
+def legacy_dict(raw):
+    # what on_kline used to build per message
+    k = json.loads(raw)["data"]["k"]
+    return {
+        "time": pd.to_datetime(k["t"], unit="ms"),
+        "open": float(k["o"]),
+        "high": float(k["h"]),
+        "low": float(k["l"]),
+        "close": float(k["c"]),
+        "volume": float(k["v"]),
+    }
+
+
+def typed_record(raw):
+    return decode_kline(raw)
+
+
+def parsed_only(msg):
+    return decode_kline(msg)
+
+
+def rate(fn, items, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in items:
+            fn(item)
+        best = min(best, time.perf_counter() - start)
+    return len(items) / best
+
+
+def batch_rate(items, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        decode_batch(items)
+        best = min(best, time.perf_counter() - start)
+    return len(items) / best
+
+
+def run(n=50_000):
+    raw = make_messages(n)
+    parsed = [loads(m)["data"] for m in raw]
+
+    return {
+        "fast_json": kline_decoder.FAST_JSON,
+        "legacy_dict_msgs_per_s": rate(legacy_dict, raw[: n // 10]),
+        "typed_record_msgs_per_s": rate(typed_record, raw),
+        "typed_record_preparsed_msgs_per_s": rate(parsed_only, parsed),
+        "batch_columnar_msgs_per_s": batch_rate(raw),
+    }
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    for key, value in run(n).items():
+        print(f"{key:36s}: {value:,.0f}" if isinstance(value, float) else f"{key:36s}: {value}")
@@ -0,0 +1,51 @@
+"""
+RSI / MACD / ATR indicators: vectorized over a long history and the
+incremental on_bar path the live bot runs (no network).
+
+python -m benchmarks.bench_indicators [n_bars]
+"""
+import sys
+import time
+
+from benchmarks.bench_backtest import timed
+from benchmarks.data import make_frame
+from strategy.rsi_macd_atr import RsiMacdAtrStrategy
+
+
+def incremental(bars):
+    strategy = RsiMacdAtrStrategy()
+    for bar in bars:
+        strategy.on_bar(bar)
+    return strategy
+
+
+def run(n=1_000_000, n_incremental=100_000):
+    df = make_frame(n)
+    arrays = {col: df[col].to_numpy() for col in ("high", "low", "close")}
+    strategy = RsiMacdAtrStrategy()
+
+    vector_s, _ = timed(strategy.indicators, arrays)
+    signals_s, _ = timed(strategy.signals, arrays)
+
+    m = min(n, n_incremental)
+    bars = df.iloc[:m][["high", "low", "close"]].to_dict("records")
+    start = time.perf_counter()
+    incremental(bars)
+    incremental_s = time.perf_counter() - start
+
+    return {
+        "bars": n,
+        "indicators_ms": vector_s * 1000,
+        "indicators_bars_per_s": n / vector_s,
+        "signals_ms": signals_s * 1000,
+        "signals_bars_per_s": n / signals_s,
+        "on_bar_bars": m,
+        "on_bar_us": incremental_s / m * 1e6,
+        "on_bar_bars_per_s": m / incremental_s,
+    }
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    for key, value in run(n).items():
+        print(f"{key:22s}: {value:,.2f}" if isinstance(value, float) else f"{key:22s}: {value}")
@@ -0,0 +1,87 @@
+"""
+Live hot path: BinanceATRBot.on_kline per closed-candle message (no
+network, paper fills, notifier stubbed).
+
+python -m benchmarks.bench_on_kline [n_messages]
+"""
+import logging
+import sys
+import time
+
+import numpy as np
+
+from exchange import binance_main_bot
+from exchange.binance_main_bot import BinanceATRBot
+from utils.latency import LatencyHistogram
+
+SYMBOLS = ("PEPEUSDT", "DOGEUSDT", "SHIBUSDT", "FLOKIUSDT")
+
+
+class _Offline:
+    """Stands in for the REST client and the Telegram notifier"""
+
+    def get_symbol_info(self, symbol):
+        return None
+
+    def send(self, text):
+        pass
+
+
+def make_messages(n, symbols=SYMBOLS, seed=5):
+    rng = np.random.default_rng(seed)
+    rounds = n // len(symbols) + 1
+    closes = np.cumprod(1 + rng.normal(0, 0.01, (rounds, len(symbols))), axis=0) * 1e-5
+
+    out = []
+    for i in range(rounds):
+        t = 1_700_000_000_000 + i * 60_000
+        for j, sym in enumerate(symbols):
+            c = closes[i, j]
+            out.append({
+                "e": "kline", "E": t + 59_999, "s": sym,
+                "k": {
+                    "t": t, "T": t + 59_999, "s": sym, "i": "1m", "x": True,
+                    "o": f"{c:.10f}", "h": f"{c * 1.01:.10f}", "l": f"{c * 0.99:.10f}",
+                    "c": f"{c:.10f}", "v": "1000000",
+                },
+            })
+    return out[:n]
+
+
+def run(n=100_000):
+    offline = _Offline()
+    bot = BinanceATRBot(SYMBOLS, warmup_candles=0, client=offline)
+    bot.notifier = offline
+
+    msgs = make_messages(n)
+    hist = LatencyHistogram()
+    on_kline = bot.on_kline
+
+    # per-trade INFO lines would dominate the timing
+    level = binance_main_bot.log.level
+    binance_main_bot.log.setLevel(logging.WARNING)
+    try:
+        start = time.perf_counter()
+        for msg in msgs:
+            t0 = time.perf_counter_ns()
+            on_kline(msg)
+            hist.record((time.perf_counter_ns() - t0) // 1000)
+        elapsed = time.perf_counter() - start
+    finally:
+        binance_main_bot.log.setLevel(level)
+
+    per_msg = hist.summary()
+    return {
+        "messages": n,
+        "msgs_per_s": n / elapsed,
+        "mean_us": per_msg["mean_ms"] * 1000,
+        "p50_us": per_msg["p50_ms"] * 1000,
+        "p99_us": per_msg["p99_ms"] * 1000,
+        "max_us": per_msg["max_ms"] * 1000,
+    }
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    for key, value in run(n).items():
+        print(f"{key:12s}: {value:,.2f}" if isinstance(value, float) else f"{key:12s}: {value}")
@@ -0,0 +1,47 @@
+"""
+Multi-coin PortfolioEngine: signal preparation and the heap-merged run
+over symbols with staggered listing dates (no network).
+
+python -m benchmarks.bench_portfolio [n_symbols] [n_bars]
+"""
+import sys
+import time
+
+from backtest.portfolio import PortfolioEngine
+from benchmarks.bench_backtest import timed
+from benchmarks.data import frames
+from strategy.rsi_macd_atr import RsiMacdAtrStrategy
+
+
+def prepare(data):
+    engine = PortfolioEngine(RsiMacdAtrStrategy(), max_open_trades=5)
+    for symbol, df in data.items():
+        engine.add(symbol, df)
+    return engine
+
+
+def run(n_symbols=100, n_bars=20_000, cached=None):
+    data = frames(n_symbols, n_bars, cached)
+    bars = sum(len(df) for df in data.values())
+
+    start = time.perf_counter()
+    engine = prepare(data)
+    prepare_s = time.perf_counter() - start
+
+    run_s, res = timed(engine.run)
+
+    return {
+        "symbols": len(data),
+        "bars": bars,
+        "trades": len(res.trades),
+        "prepare_ms": prepare_s * 1000,
+        "run_ms": run_s * 1000,
+        "run_bars_per_s": bars / run_s,
+        "total_bars_per_s": bars / (prepare_s + run_s),
+    }
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    for key, value in run(*args).items():
+        print(f"{key:17s}: {value:,.2f}" if isinstance(value, float) else f"{key:17s}: {value}")
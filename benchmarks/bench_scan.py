@@ -0,0 +1,75 @@
+"""
+Per-symbol cost of the eligibility scan: cached read, indicators and
+backtest + metrics, the three steps scan_symbol runs for every symbol.
+Synthetic candles are written to a throwaway KlineCache root, so the read
+goes through the same memory-mapped path as a warm cache (no network).
+
+python -m benchmarks.bench_scan [n_symbols] [n_bars]
+"""
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from backtest.scan import ScanParams, evaluate
+from benchmarks.data import frames
+from exchange.kline_cache import COLUMNS, KlineCache
+from strategy.rsi_macd_atr import RsiMacdAtrStrategy
+from utils.timeframe import to_ms
+
+INTERVAL = "4h"
+
+
+def seed_cache(cache, data, interval):
+    for symbol, df in data.items():
+        columns = {col: df[col].to_numpy() for col in COLUMNS[1:]}
+        columns["time"] = to_ms(df["time"])
+        end = int(columns["time"][-1]) + 1 if len(df) else 0
+        cache._save(cache.path(symbol, interval), columns, [[0, end]])
+
+
+def run(n_symbols=200, n_bars=9_300, cached=None):
+    data = frames(n_symbols, n_bars, cached)
+    params = ScanParams(INTERVAL, 0, None)
+    strategy = RsiMacdAtrStrategy(params.atr_period, params.atr_mult)
+
+    root = tempfile.mkdtemp(prefix="bench_scan_")
+    try:
+        cache = KlineCache(client=object(), root=root)
+        seed_cache(cache, data, INTERVAL)
+
+        read_s = indicators_s = evaluate_s = 0.0
+        for symbol in data:
+            t0 = time.perf_counter()
+            df = cache.frame(symbol, INTERVAL, params.start_str, fetch=False)
+            t1 = time.perf_counter()
+            strategy.add_indicators(df)
+            t2 = time.perf_counter()
+            evaluate(symbol, df, params)
+            t3 = time.perf_counter()
+
+            read_s += t1 - t0
+            indicators_s += t2 - t1
+            evaluate_s += t3 - t2
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    n = len(data)
+    total_s = read_s + indicators_s + evaluate_s
+    return {
+        "symbols": n,
+        "bars": int(np.sum([len(df) for df in data.values()])),
+        "read_ms_per_symbol": read_s / n * 1000,
+        "indicators_ms_per_symbol": indicators_s / n * 1000,
+        "evaluate_ms_per_symbol": evaluate_s / n * 1000,
+        "total_ms_per_symbol": total_s / n * 1000,
+        "symbols_per_s": n / total_s,
+    }
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    for key, value in run(*args).items():
+        print(f"{key:24s}: {value:,.2f}" if isinstance(value, float) else f"{key:24s}: {value}")
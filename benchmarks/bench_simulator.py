@@ -0,0 +1,101 @@
+"""
+End to end against exchange.simulator: REST warm-up, combined websocket,
+dispatcher lanes, indicators and market orders through BinanceSpot, all
+over localhost (no Binance).
+
+python -m benchmarks.bench_simulator [n_symbols] [seconds]
+"""
+import logging
+import sys
+import threading
+import time
+
+from config import config
+from exchange import binance_main_bot
+from exchange.binance_main_bot import BinanceATRBot
+from exchange.binance_spot import BinanceSpot
+from exchange.binance_utils import BinanceClient
+from exchange.simulator import BinanceSimulator, SyntheticFeed
+from trading.ledger import Instrument
+
+WARMUP = 200
+INITIAL_BALANCE = 10000.0
+
+
+class _Silent:
+    def send(self, text):
+        pass
+
+
+def run(n_symbols=500, seconds=20.0, speed=60.0, latency=0.0, jitter=0.0, updates=0):
+    # updates > 0: unclosed klines plus bookTicker ticks for the intrabar stop monitor
+    feed = SyntheticFeed.named(n_symbols, history=WARMUP + 10, updates=updates)
+    # the bot books every symbol against its own initial balance
+    sim = BinanceSimulator(
+        feed, speed=speed, latency=latency, jitter=jitter, balance=INITIAL_BALANCE * n_symbols
+    ).start()
+
+    urls = config.binance.REST_URL, config.binance.STREAM_URL
+    config.binance.REST_URL, config.binance.STREAM_URL = sim.rest_url, sim.stream_url
+    level = binance_main_bot.log.level
+    binance_main_bot.log.setLevel(logging.WARNING)
+    try:
+        spot = BinanceSpot("sim", "sim")
+
+        def execute(symbol, side, qty):
+            if side == "BUY":
+                return spot.market_buy(symbol, qty)
+            return spot.market_sell(symbol, qty)
+
+        bot = BinanceATRBot(
+            feed.symbols, feed.interval, INITIAL_BALANCE, warmup_candles=WARMUP,
+            client=BinanceClient("sim", "sim"), executor=execute, combined_stream=True,
+        )
+        bot.notifier = _Silent()
+        # one exchangeInfo for every symbol instead of one per first trade
+        for info in bot.client.get_exchange_info()["symbols"]:
+            bot.instruments[info["symbol"]] = Instrument.from_symbol_info(info)
+
+        started = time.perf_counter()
+        threading.Thread(target=bot.start, name="bench-bot", daemon=True).start()
+        while not bot.latency.summary().get("decode"):
+            time.sleep(0.05)
+        ready = time.perf_counter()
+
+        before = sum(lane["processed"] for lane in bot.dispatcher.stats())
+        time.sleep(seconds)
+        processed = sum(lane["processed"] for lane in bot.dispatcher.stats()) - before
+
+        summary = bot.latency.summary()
+        bot.stream.stop()
+        bot.dispatcher.stop()
+    finally:
+        sim.stop()
+        config.binance.REST_URL, config.binance.STREAM_URL = urls
+        binance_main_bot.log.setLevel(level)
+
+    total = summary.get("total", {})
+    network = summary.get("network", {})
+    stop = summary.get("stop", {})
+    return {
+        "symbols": n_symbols,
+        "speed": speed,
+        "startup_s": ready - started,
+        "msgs_per_s": processed / seconds,
+        "published": sim.published,
+        "orders": len(sim.orders),
+        "throttled": sim.throttled,
+        "network_p50_ms": network.get("p50_ms", 0.0),
+        "total_p50_ms": total.get("p50_ms", 0.0),
+        "total_p99_ms": total.get("p99_ms", 0.0),
+        "total_max_ms": total.get("max_ms", 0.0),
+        "stops": stop.get("count", 0),
+        "stop_p50_ms": stop.get("p50_ms", 0.0),
+    }
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 20.0
+    for key, value in run(n, seconds).items():
+        print(f"{key:15s}: {value:,.2f}" if isinstance(value, float) else f"{key:15s}: {value}")
@@ -0,0 +1,49 @@
+"""
+Inputs for the benchmarks: synthetic candles, or candles already in the
+local KlineCache (read with fetch=False, so never any network).
+"""
+import numpy as np
+import pandas as pd
+
+from exchange.kline_cache import KlineCache
+
+BAR_MS = 14_400_000  # 4h
+
+
+def make_frame(n, seed=7, bar_ms=BAR_MS, start_ms=0):
+    rng = np.random.default_rng(seed)
+    close = np.cumprod(1 + rng.normal(0, 0.02, n)) * 1e-5
+    return pd.DataFrame({
+        "time": pd.to_datetime(start_ms + np.arange(n) * bar_ms, unit="ms"),
+        "open": close,
+        "high": close * 1.02,
+        "low": close * (1 - rng.uniform(0, 0.05, n)),
+        "close": close,
+        "volume": 1.0,
+    })
+
+
+def cached_frame(symbol, interval, start_str="1 Jan 2017", end_str=None):
+    """Whatever the cache holds for symbol / interval; ValueError if nothing"""
+    df = KlineCache().frame(symbol, interval, start_str, end_str, fetch=False)
+    if df.empty:
+        raise ValueError(f"no cached {symbol} {interval} klines")
+    return df
+
+
+def frames(n_symbols, n_bars, cached=None, seed=0):
+    """
+    {symbol: frame}. cached: list of (symbol, interval) to read from the
+    cache instead; synthetic symbols get staggered listing dates.
+    """
+    if cached:
+        return {sym: cached_frame(sym, interval) for sym, interval in cached}
+
+    rng = np.random.default_rng(seed)
+    out = {}
+    for k in range(n_symbols):
+        listed = int(rng.integers(0, n_bars // 3 + 1))
+        out[f"SYN{k:03d}USDT"] = make_frame(
+            n_bars - listed, seed=seed * 1000 + k, start_ms=listed * BAR_MS
+        )
+    return out
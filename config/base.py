@@ -5,6 +5,11 @@ class BaseConfig:
     def __init__(self):
         self.ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
         self.LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+        self.LOG_FORMAT = os.getenv("LOG_FORMAT", "text")          # text | json
+        self.LOG_FILE = os.getenv("LOG_FILE", "")
+        # per event type: keep 1 in N / at most N per second, e.g. "tick=100"
+        self.LOG_SAMPLE = os.getenv("LOG_SAMPLE", "")
+        self.LOG_RATE_LIMIT = os.getenv("LOG_RATE_LIMIT", "tick=20")
 
         logging.basicConfig(level=self.LOG_LEVEL)
         self.logger = logging.getLogger("CONFIG")
@@ -5,6 +5,21 @@ class BinanceConfig:
         self.API_KEY = os.getenv("BINANCE_API_KEY", "")
         self.SECRET_KEY = os.getenv("BINANCE_SECRET_KEY", "")
         self.TESTNET = os.getenv("BINANCE_TESTNET", "True") == "True"
+        self.REQUEST_WEIGHT_LIMIT = int(os.getenv("BINANCE_REQUEST_WEIGHT_LIMIT", "6000"))
+        self.REST_URL = os.getenv("BINANCE_REST_URL", "https://api.binance.com")
+        self.STREAM_URL = os.getenv("BINANCE_STREAM_URL", "wss://stream.binance.com:9443")
+        # one multiplexed /stream socket per 1024 streams instead of one per symbol
+        self.COMBINED_STREAM = os.getenv("BINANCE_COMBINED_STREAM", "True") == "True"
+        # intrabar stop checks for open positions: bookTicker, aggTrade or "" (candle close only)
+        self.STOP_STREAM = os.getenv("BINANCE_STOP_STREAM", "bookTicker")
+        # real market orders from the live bot (False = paper fills)
+        self.LIVE_ORDERS = os.getenv("BINANCE_LIVE_ORDERS", "False") == "True"
+        # with live orders: a resting STOP_LOSS_LIMIT on the exchange per position
+        self.EXCHANGE_STOPS = os.getenv("BINANCE_EXCHANGE_STOPS", "True") == "True"
+        # backtest kline history, fetched once and then only extended
+        self.KLINE_CACHE_DIR = os.getenv("KLINE_CACHE_DIR", ".cache/klines")
+        # append raw kline messages here for exchange.replay (empty = off)
+        self.STREAM_RECORD_PATH = os.getenv("STREAM_RECORD_PATH", "")
 
     def as_dict(self):
         return {
@@ -6,7 +6,8 @@ class RiskConfig:
         self.MAX_DAILY_LOSS = float(os.getenv("MAX_DAILY_LOSS", "0.03"))
         self.MAX_OPEN_TRADES = int(os.getenv("MAX_OPEN_TRADES", "3"))
         self.TRAILING_ENABLED = os.getenv("TRAILING_ENABLED", "false").lower() == "true"
-        self.TRAILING_PERCENT = float(os.getenv("TRAILING_PERCENT", "0.01"))
+        # percent, like the env files: 0.5 = trail 0.5% below the price
+        self.TRAILING_PERCENT = float(os.getenv("TRAILING_PERCENT", "0.5"))
         self.MAX_TOTAL_RISK = float(os.getenv("MAX_TOTAL_RISK", "0.03"))
         self.MAX_TRADES_PER_SYMBOL = int(os.getenv("MAX_TRADES_PER_SYMBOL", "1"))
         self.MAX_DAILY_TRADES = int(os.getenv("MAX_DAILY_TRADES", "5"))
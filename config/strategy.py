@@ -5,10 +5,15 @@ class StrategyConfig:
         self.STRATEGY_NAME = os.getenv("STRATEGY_NAME", "ema_scalping")
         self.TIMEFRAME = os.getenv("TIMEFRAME", "1m")
         self.LEVERAGE = int(os.getenv("LEVERAGE", "1"))
+        self.CANDLE_WINDOW = int(os.getenv("CANDLE_WINDOW", "1000"))
+        self.WARMUP_CANDLES = int(os.getenv("WARMUP_CANDLES", "500"))
+        self.DISPATCH_WORKERS = int(os.getenv("DISPATCH_WORKERS", "4"))
 
     def as_dict(self):
         return {
             "strategy": self.STRATEGY_NAME,
             "timeframe": self.TIMEFRAME,
-            "leverage": self.LEVERAGE
+            "leverage": self.LEVERAGE,
+            "candle_window": self.CANDLE_WINDOW,
+            "warmup_candles": self.WARMUP_CANDLES
         }
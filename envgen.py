@@ -59,6 +59,9 @@ DEV_CONFIG = {
     "BINANCE_API_KEY": "",
     "BINANCE_SECRET_KEY": "",
     "BINANCE_TESTNET": "True",
+    "BINANCE_STOP_STREAM": "bookTicker",
+    "BINANCE_LIVE_ORDERS": "False",
+    "BINANCE_EXCHANGE_STOPS": "True",
 
     # FEES
     "MAKER_FEE": "0.001",
@@ -83,6 +86,12 @@ DEV_CONFIG = {
     "STRATEGY_NAME": "ema_scalping",
     "TIMEFRAME": "1m",
     "LEVERAGE": "5",
+    "CANDLE_WINDOW": "1000",     # candles kept in memory per symbol
+    "WARMUP_CANDLES": "500",     # history fetched on startup
+
+    # DATA
+    "KLINE_CACHE_DIR": ".cache/klines",
+    "STREAM_RECORD_PATH": "",
 
     # Symbols
     "SYMBOLS":"BTCUSDT,ETHUSDT,SOLUSDT,BNBUSDT",
@@ -103,6 +112,9 @@ PROD_CONFIG = {
     "BINANCE_API_KEY": "REPLACE_ME",
     "BINANCE_SECRET_KEY": "REPLACE_ME",
     "BINANCE_TESTNET": "False",
+    "BINANCE_STOP_STREAM": "bookTicker",
+    "BINANCE_LIVE_ORDERS": "False",
+    "BINANCE_EXCHANGE_STOPS": "True",
 
     # FEES (lower in production)
     "MAKER_FEE": "0.0002",
@@ -121,6 +133,12 @@ PROD_CONFIG = {
     "STRATEGY_NAME": "trend_following",
     "TIMEFRAME": "5m",
     "LEVERAGE": "3",
+    "CANDLE_WINDOW": "1000",
+    "WARMUP_CANDLES": "500",
+
+    # DATA
+    "KLINE_CACHE_DIR": ".cache/klines",
+    "STREAM_RECORD_PATH": "",
 
     # Symbols
     "SYMBOLS":"BTCUSDT,ETHUSDT,SOLUSDT,BNBUSDT",
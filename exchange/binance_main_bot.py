@@ -1,13 +1,41 @@
+import logging
 import os
 import time
-import pandas as pd
-import ta
 
 from binance.client import Client
+from binance.helpers import interval_to_milliseconds
 from binance.streams import ThreadedWebsocketManager
 from dotenv import load_dotenv
+from config import config
+from exchange.binance_stream import CombinedStream, kline_stream, tick_stream
+from exchange.binance_utils import BinanceClient
+from exchange.kline_decoder import Kline, decode_kline
+from exchange.binance_warmup import (
+    KLINES_WEIGHT,
+    MAX_KLINES_PER_REQUEST,
+    fetch_recent_klines,
+)
+from exchange.rate_limit import WeightLimiter
+from exchange.stream_recorder import StreamRecorder
+from strategy.incremental import INDICATOR_FIELDS
+from strategy.rsi_macd_atr import RsiMacdAtrStrategy
+from trading.ledger import Instrument, Ledger
+from trading.trade_state import TradeState
+from trading.trailing import TrailingStopManager
+from trading.trailing_atr import ATRTrailingStopManager
+from utils.candle_store import CandleStore, OHLCV
+from utils.dispatcher import SymbolDispatcher
+from utils.latency import LatencyTracker, Stopwatch
+from utils.logger import get_logger
 from utils.telegram import TelegramNotifier
 
+log = get_logger("bot")
+
+
+def _tick_price(msg):
+    # a market sell fills at the bid; aggTrade only has the last price
+    return float(msg["b"] if "b" in msg else msg["p"])
+
 
 class BinanceATRBot:
     def __init__(
@@ -19,77 +47,197 @@ class BinanceATRBot:
         fee_pct=0.001,
         atr_period=14,
         atr_mult=1.0,
+        window=None,
+        warmup_candles=None,
+        client=None,
+        combined_stream=None,
+        workers=None,
+        executor=None,
+        recorder=None,
+        stop_stream=None,
+        stops=None,
+        trailing=None,
     ):
         # ===== ENV =====
         load_dotenv()
         self.api_key = os.getenv("BINANCE_API_KEY")
         self.api_secret = os.getenv("BINANCE_API_SECRET")
 
-        self.client = Client(self.api_key, self.api_secret)
+        self.client = client or BinanceClient(self.api_key, self.api_secret)
+        # executor(symbol, side, qty) -> exchange order response; None = paper fills
+        self.executor = executor
+        # exchange.stop_orders.StopOrderManager: resting stop per position
+        self.stops = stops
+        # TrailingStopManager / ATRTrailingStopManager; None = config.risk, False = off
+        if trailing is None and config.risk.TRAILING_ENABLED:
+            trailing = TrailingStopManager(config.risk.TRAILING_PERCENT / 100)
+        self.trailing = trailing or None
+        if self.trailing is not None and self.trailing.orders is None:
+            self.trailing.orders = stops    # the exchange stop trails along
         self.notifier = TelegramNotifier()
 
         # ===== CONFIG =====
-        self.symbols = symbols
+        self.symbols = list(symbols)
         self.interval = interval
         self.initial_balance = initial_balance
         self.risk_per_trade = risk_per_trade
         self.fee_pct = fee_pct
         self.atr_period = atr_period
         self.atr_mult = atr_mult
+        self.interval_ms = interval_to_milliseconds(interval)
+        self.window = window or config.strategy.CANDLE_WINDOW
+        self.warmup_candles = (
+            config.strategy.WARMUP_CANDLES if warmup_candles is None else warmup_candles
+        )
+        self.limiter = WeightLimiter(config.binance.REQUEST_WEIGHT_LIMIT)
+        self.combined_stream = (
+            config.binance.COMBINED_STREAM if combined_stream is None else combined_stream
+        )
+        # per-position tick stream for intrabar stops (combined stream or a TWM socket)
+        self.stop_stream = config.binance.STOP_STREAM if stop_stream is None else stop_stream
+        self.stream = None
+        # ThreadedWebsocketManager fallback: one tick socket per open position
+        self.twm = None
+        self._tick_sockets = {}
+        self.dispatcher = SymbolDispatcher(
+            self._handle, workers or config.strategy.DISPATCH_WORKERS
+        )
+        self.latency = LatencyTracker()
+        self.instruments = {}
+        # raw socket messages for exchange.replay; from config in start()
+        self.recorder = recorder
 
         # ===== STATE =====
-        self.state = {
-            s: {
-                "df": pd.DataFrame(),
-                "balance": initial_balance,
-                "qty": 0.0,
-                "entry": 0.0,
-                "sl": 0.0,
-            }
-            for s in symbols
+        self.state = {s: self._new_state() for s in symbols}
+
+    def _new_state(self):
+        return {
+            "store": CandleStore(self.window, OHLCV + INDICATOR_FIELDS),
+            "strategy": RsiMacdAtrStrategy(self.atr_period, self.atr_mult),
+            "ledger": Ledger(self.initial_balance, self.fee_pct),
+            "qty": 0.0,
+            "entry": 0.0,
+            "sl": 0.0,
+            "stop_pending": False,
+            "trade": None,
         }
 
-    # ================= INDICATORS =================
-    def add_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
-        if len(df) < self.atr_period + 5:
-            return df
+    # ================= CANDLES =================
+    def _ingest(self, symbol, k: Kline):
+        s = self.state[symbol]
+
+        # O(1) per bar: running EMA / Wilder state instead of full recompute
+        row = s["strategy"].on_bar(k.candle())
 
-        df["rsi6"] = ta.momentum.RSIIndicator(df["close"], 6).rsi()
+        # bounded history, no per-candle copy of the whole frame
+        s["store"].append(k.open_time, row)
+        return row
 
-        macd = ta.trend.MACD(df["close"])
-        df["dif"] = macd.macd()
-        df["dea"] = macd.macd_signal()
-        df["dif_prev"] = df["dif"].shift(1)
-        df["dea_prev"] = df["dea"].shift(1)
+    def _ingest_rest(self, symbol, row):
+        self._ingest(symbol, Kline.from_rest(symbol, self.interval, row))
 
-        df["atr"] = ta.volatility.AverageTrueRange(
-            df["high"],
-            df["low"],
-            df["close"],
-            self.atr_period,
-        ).average_true_range()
+    def warm_up(self, symbols=None):
+        """Seed candles + indicators from REST before any socket is opened"""
+        symbols = self.symbols if symbols is None else symbols
+        if self.warmup_candles <= 0:
+            return
+
+        history = fetch_recent_klines(
+            self.client,
+            symbols,
+            self.interval,
+            self.warmup_candles,
+            limiter=self.limiter,
+        )
 
-        return df
+        for sym in symbols:
+            for k in history.get(sym, []):
+                self._ingest_rest(sym, k)
+
+        log.info("🔥 Warm-up done: %d/%d symbols seeded", len(history), len(symbols))
+
+    def _backfill(self, symbol, open_time):
+        """Fill candles missed between the last stored bar and open_time"""
+        last = self.state[symbol]["store"].last_time
+
+        self.limiter.acquire(KLINES_WEIGHT)
+        rows = self.client.get_klines(
+            symbol=symbol,
+            interval=self.interval,
+            startTime=last + self.interval_ms,
+            endTime=open_time - 1,
+            limit=MAX_KLINES_PER_REQUEST,
+        )
+        for k in rows:
+            if last < k[0] < open_time:
+                self._ingest_rest(symbol, k)
 
     # ================= TRADING =================
-    def buy(self, symbol: str, price: float, atr: float):
+    def _instrument(self, symbol):
+        """Tick / step grid from exchangeInfo, fetched once per symbol"""
+        inst = self.instruments.get(symbol)
+        if inst is None:
+            try:
+                inst = Instrument.from_symbol_info(self.client.get_symbol_info(symbol))
+            except Exception as e:
+                # paper trading without exchangeInfo: whole units, 1e-8 ticks
+                log.warning("⚠️ No symbol filters for %s (%s), using defaults", symbol, e)
+                inst = Instrument(symbol, "0.00000001", "1")
+            self.instruments[symbol] = inst
+        return inst
+
+    def _execute(self, symbol, side, qty, watch):
+        """Send the order through the executor (if any); False if it failed"""
+        if self.executor is None:
+            return True
+
+        sent_ns = time.time_ns()
+        try:
+            resp = self.executor(symbol, side, qty)
+        except Exception as e:
+            log.error("❌ %s %s order failed: %s", side, symbol, e)
+            return False
+        done_ns = time.time_ns()
+
+        # transactTime splits the round trip into outbound and response legs
+        tx = resp.get("transactTime") if isinstance(resp, dict) else None
+        if tx:
+            self.latency.record("submit", symbol, tx * 1000 - sent_ns // 1000)
+            self.latency.record("ack", symbol, done_ns // 1000 - tx * 1000)
+        else:
+            self.latency.record_ns("ack", symbol, done_ns - sent_ns)
+        if watch:
+            watch.last = time.perf_counter_ns()
+        return True
+
+    def buy(self, symbol: str, price: float, atr: float, watch=None):
         s = self.state[symbol]
+        inst = self._instrument(symbol)
+        ledger = s["ledger"]
 
-        s["entry"] = price
-        s["sl"] = price - atr * self.atr_mult
+        # sized and booked on the exchange's tick / step grid
+        ticks = inst.ticks(price)
+        stop_ticks = inst.ticks(s["strategy"].stop_price(price, atr), "floor")
+        steps = ledger.size(inst, ticks, stop_ticks, self.risk_per_trade)
 
-        risk_amt = s["balance"] * self.risk_per_trade
-        qty = min(
-            risk_amt / (price - s["sl"]),
-            s["balance"] / price,
-        )
-        qty = round(qty, 0)
+        if steps <= 0:
+            return
+        if watch:
+            watch.lap("risk")
 
-        if qty <= 0:
+        qty = inst.qty(steps)
+        if not self._execute(symbol, "BUY", qty, watch):
             return
 
+        ledger.open(inst, ticks, steps)
         s["qty"] = qty
-        s["balance"] -= qty * price * self.fee_pct
+        s["entry"] = inst.price(ticks)
+        s["sl"] = inst.price(stop_ticks)
+        s["stop_pending"] = False
+        if self.trailing is not None:
+            s["trade"] = TradeState(s["entry"], s["sl"], None, qty, atr, symbol)
+        self._protect(symbol)
+        self._watch_stop(symbol)
 
         self.notifier.send(
             f"🚀 <b>BUY</b>\n"
@@ -98,96 +246,313 @@ class BinanceATRBot:
             f"SL: {s['sl']:.8f}\n"
             f"Qty: {qty}"
         )
+        if watch:
+            watch.lap("notify")
 
-        print(f"🟢 BUY {symbol} {qty} @ {price:.8f}")
+        log.info(
+            "🟢 BUY %s %s @ %.8f", symbol, qty, price,
+            extra={"event": "trade", "symbol": symbol, "side": "BUY"},
+        )
 
-    def sell(self, symbol: str, price: float):
+    def sell(self, symbol: str, price: float, watch=None, fill=None):
+        """fill: (qty, quote qty) the exchange stop already sold, from stops.filled()"""
         s = self.state[symbol]
-
-        pnl = s["qty"] * (price - s["entry"])
-        s["balance"] += pnl
-        s["balance"] -= s["qty"] * price * self.fee_pct
+        inst = self._instrument(symbol)
+        ledger = s["ledger"]
+        if watch:
+            watch.lap("risk")
+
+        # whatever the exchange stop already sold is booked at its own price
+        pnl = 0
+        sold_qty, sold_quote = 0.0, 0.0
+        if fill is None and self.stops is not None:
+            fill = self.stops.release(symbol)
+        if fill is not None:
+            steps = min(inst.steps(fill[0]), ledger.held(symbol))
+            if steps > 0:
+                pnl, _ = ledger.close(inst, inst.ticks(fill[1] / fill[0]), steps)
+                sold_qty, sold_quote = fill
+            s["qty"] = inst.qty(ledger.held(symbol))
+
+        # market-sell only the rest
+        if s["qty"] > 0:
+            if not self._execute(symbol, "SELL", s["qty"], watch):
+                self._protect(symbol)
+                return
+            part, _ = ledger.close(inst, inst.ticks(price))
+            pnl += part
+            sold_qty += s["qty"]
+            sold_quote += s["qty"] * price
+
+        price = sold_quote / sold_qty if sold_qty else price
+        pnl = ledger.to_quote(pnl)
 
         self.notifier.send(
             f"🔴 <b>SELL</b>\n"
             f"Symbol: {symbol}\n"
             f"Price: {price:.8f}\n"
             f"PnL: {pnl:.2f}\n"
-            f"Balance: {s['balance']:.2f}"
+            f"Balance: {s['ledger'].balance:.2f}"
         )
+        if watch:
+            watch.lap("notify")
 
-        print(f"🔴 SELL {symbol} @ {price:.8f} PnL={pnl:.2f}")
+        log.info(
+            "🔴 SELL %s @ %.8f PnL=%.2f", symbol, price, pnl,
+            extra={"event": "trade", "symbol": symbol, "side": "SELL"},
+        )
 
         s["qty"] = 0.0
+        s["trade"] = None
+        self._unwatch_stop(symbol)
 
-    # ================= WS CALLBACK =================
-    def on_kline(self, msg):
-        if "k" not in msg:
+    # ================= INTRABAR STOPS =================
+    def _protect(self, symbol):
+        if self.stops is None:
+            return
+        s = self.state[symbol]
+        try:
+            self.stops.protect(symbol, s["qty"], s["sl"])
+        except Exception as e:
+            log.error("❌ %s stop order failed, no exchange-side stop: %s", symbol, e)
+
+    def _exchange_fill(self, symbol):
+        if self.stops is None:
+            return None
+        try:
+            return self.stops.filled(symbol)
+        except Exception as e:
+            log.warning("⚠️ %s: stop order status unknown: %s", symbol, e)
+            return None
+
+    def _trail(self, symbol, row):
+        """Raise the stop after a closed candle; the manager moves the exchange order"""
+        s = self.state[symbol]
+        trade = s["trade"]
+        try:
+            if isinstance(self.trailing, ATRTrailingStopManager):
+                self.trailing.update(trade, row["close"], row["atr"])
+            else:
+                self.trailing.update(trade, row["close"])
+        except Exception as e:
+            log.error("❌ %s trailing stop not moved on the exchange: %s", symbol, e)
+
+        # the intrabar monitor and the candle-close check follow it either way
+        inst = self._instrument(symbol)
+        s["sl"] = max(s["sl"], inst.price(inst.ticks(trade.stop, "floor")))
+
+    def _watch_stop(self, symbol):
+        if not self.stop_stream:
             return
+        if self.stream is not None:
+            self.stream.subscribe(tick_stream(symbol, self.stop_stream), self.on_tick)
+        elif self.twm is not None and symbol not in self._tick_sockets:
+            start = (
+                self.twm.start_aggtrade_socket if self.stop_stream == "aggTrade"
+                else self.twm.start_symbol_book_ticker_socket
+            )
+            self._tick_sockets[symbol] = start(callback=self.on_tick, symbol=symbol)
 
-        k = msg["k"]
-        print(k["s"], k["i"], "closed =", k["x"], "price =", k["c"])
+    def _unwatch_stop(self, symbol):
+        if not self.stop_stream:
+            return
+        if self.stream is not None:
+            self.stream.unsubscribe(tick_stream(symbol, self.stop_stream))
+        elif symbol in self._tick_sockets:
+            self.twm.stop_socket(self._tick_sockets.pop(symbol))
+
+    def on_tick(self, msg):
+        """
+        Socket thread, every bookTicker / aggTrade of a symbol in a position:
+        one float compare; only a stop crossing goes to the symbol's lane.
+        """
+        s = self.state.get(msg.get("s"))     # TWM also delivers error events
+        if s is None or s["qty"] == 0 or s["stop_pending"]:
+            return
 
-        # only closed candles
-        if not k["x"]:
+        if _tick_price(msg) <= s["sl"]:
+            s["stop_pending"] = True
+            if not self.dispatcher.submit(msg["s"], (time.time_ns(), msg)):
+                # lane full: the next crossing tick tries again
+                s["stop_pending"] = False
+
+    def on_stop(self, msg, received_ns):
+        """Lane thread: exit at the crossing tick unless the candle close got there first"""
+        symbol = msg["s"]
+        s = self.state.get(symbol)
+        if s is None or s["qty"] == 0:
             return
+        s["stop_pending"] = False   # a failed order re-arms on the next tick
 
-        symbol = k["s"]
-        s = self.state[symbol]
+        self.sell(symbol, _tick_price(msg))
+        self.latency.record_ns("stop", symbol, time.time_ns() - received_ns)
 
-        candle = {
-            "time": pd.to_datetime(k["t"], unit="ms"),
-            "open": float(k["o"]),
-            "high": float(k["h"]),
-            "low": float(k["l"]),
-            "close": float(k["c"]),
-            "volume": float(k["v"]),
-        }
+    # ================= WS CALLBACK =================
+    def dispatch(self, msg):
+        """Socket thread: hand off to the symbol's ordered lane and return"""
+        k = msg.get("k")
+        if k is not None:
+            received_ns = time.time_ns()
+            if self.recorder is not None:
+                self.recorder.write(received_ns, msg)
+            self.dispatcher.submit(k["s"], (received_ns, msg))
+
+    def _handle(self, item):
+        received_ns, msg = item
+        if "k" in msg:
+            self.on_kline(msg, received_ns)
+        else:
+            self.on_stop(msg, received_ns)
 
-        s["df"] = pd.concat(
-            [s["df"], pd.DataFrame([candle])],
-            ignore_index=True,
-        )
+    def on_kline(self, msg, received_ns=None):
+        raw = msg.get("k")
+        if raw is None:
+            return
 
-        s["df"] = self.add_indicators(s["df"])
+        # tick tracing: skipped entirely (no args, no record) unless DEBUG
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug(
+                "%s %s closed=%s price=%s", raw["s"], raw["i"], raw["x"], raw["c"],
+                extra={"event": "tick", "symbol": raw["s"]},
+            )
 
-        if len(s["df"]) < 50:
+        # only closed candles; intra-minute updates are never parsed
+        if not raw["x"]:
             return
 
-        row = s["df"].iloc[-1]
+        started_ns = time.time_ns()
+        watch = Stopwatch(self.latency, raw["s"])
 
-        # ===== ENTRY =====
-        if s["qty"] == 0:
-            if (
-                row["rsi6"] > 30
-                and row["dif_prev"] < row["dea_prev"]
-                and row["dif"] > row["dea"]
-            ):
-                self.buy(symbol, row["close"], row["atr"])
+        k = decode_kline(msg)
+        symbol = k.symbol
+        s = self.state.get(symbol)
+        if s is None:
+            return  # late message after unsubscribe
+        watch.lap("decode")
 
-        # ===== EXIT =====
+        if received_ns is None:
+            received_ns = started_ns
         else:
-            if row["low"] <= s["sl"]:
-                self.sell(symbol, s["sl"])
-            elif (
-                row["rsi6"] < 60
-                and row["dif_prev"] > row["dea_prev"]
-                and row["dif"] < row["dea"]
-            ):
-                self.sell(symbol, row["close"])
+            self.latency.record_ns("queue", symbol, started_ns - received_ns)
+        self.latency.record("network", symbol, received_ns // 1000 - k.event_time * 1000)
+
+        # ===== STITCH ONTO WARM-UP HISTORY =====
+        last = s["store"].last_time
+        if last is not None:
+            if k.open_time <= last:
+                return  # already seeded from REST
+            if k.open_time - last > self.interval_ms:
+                try:
+                    self._backfill(symbol, k.open_time)
+                except Exception as e:
+                    log.warning("⚠️ Backfill failed for %s: %s", symbol, e)
+                watch.lap("backfill")
+
+        row = self._ingest(symbol, k)
+        watch.lap("indicators")
+
+        if s["strategy"].ready:
+            # ===== ENTRY =====
+            if s["qty"] == 0:
+                entry = row["entry"]
+                watch.lap("signal")
+                if entry:
+                    self.buy(symbol, row["close"], row["atr"], watch)
+
+            # ===== EXIT =====
+            else:
+                price = s["strategy"].exit_price(row, s["sl"])
+                watch.lap("signal")
+                # the exchange stop may have sold between candles
+                fill = self._exchange_fill(symbol)
+                if fill is not None:
+                    self.sell(symbol, row["close"], watch, fill)
+                elif price is not None:
+                    self.sell(symbol, price, watch)
+                elif self.trailing is not None:
+                    self._trail(symbol, row)
+
+        self.latency.record("total", symbol, time.time_ns() // 1000 - k.event_time * 1000)
+
+    # ================= SUBSCRIPTIONS =================
+    def subscribe(self, symbol: str):
+        """Add a symbol at runtime; other symbols keep their sockets"""
+        if symbol not in self.state:
+            self.state[symbol] = self._new_state()
+            self.warm_up([symbol])
+        if symbol not in self.symbols:
+            self.symbols.append(symbol)
+
+        if self.stream is not None:
+            self.stream.subscribe(kline_stream(symbol, self.interval), self.dispatch)
+
+    def unsubscribe(self, symbol: str):
+        """Stop streaming a symbol; its state is kept while a position is open"""
+        if self.stream is not None:
+            self.stream.unsubscribe(kline_stream(symbol, self.interval))
+        if symbol in self.symbols:
+            self.symbols.remove(symbol)
+        if self.state.get(symbol, {}).get("qty", 0) == 0:
+            self.state.pop(symbol, None)
 
     # ================= START BOT =================
     def start(self):
-        twm = ThreadedWebsocketManager(self.api_key, self.api_secret)
-        twm.start()
-
-        for sym in self.symbols:
-            twm.start_kline_socket(
-                callback=self.on_kline,
-                symbol=sym,
-                interval=self.interval,
+        if self.recorder is None and config.binance.STREAM_RECORD_PATH:
+            self.recorder = StreamRecorder(config.binance.STREAM_RECORD_PATH)
+
+        self.warm_up()
+        self.dispatcher.start()
+
+        if self.combined_stream:
+            self.stream = CombinedStream(config.binance.STREAM_URL)
+            for sym in self.symbols:
+                self.stream.subscribe(kline_stream(sym, self.interval), self.dispatch)
+            self.stream.start()
+        else:
+            self.twm = twm = ThreadedWebsocketManager(self.api_key, self.api_secret)
+            twm.start()
+
+            for sym in self.symbols:
+                twm.start_kline_socket(
+                    callback=self.dispatch,
+                    symbol=sym,
+                    interval=self.interval,
+                )
+
+        if self.stop_stream:
+            log.info(
+                "🎯 Intrabar stops on %s (%s)", self.stop_stream,
+                "combined stream" if self.stream is not None else "one socket per position",
+            )
+        else:
+            log.warning("⚠️ Intrabar stops off: stops are only checked at candle close")
+        log.info("🚀 Bot running 24×365 (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(60)
+                self.report_dispatch()
+                self.report_latency()
+        finally:
+            if self.recorder is not None:
+                self.recorder.close()
+
+    def report_dispatch(self):
+        for lane in self.dispatcher.stats():
+            log.info(
+                "📬 lane %d (%d symbols): depth=%d max=%d done=%d dropped=%d "
+                "wait avg=%.2fms max=%.2fms",
+                lane["lane"], lane["symbols"], lane["depth"], lane["max_depth"],
+                lane["processed"], lane["dropped"], lane["wait_avg_ms"], lane["wait_max_ms"],
+                extra={"event": "dispatch", **lane},
             )
 
-        print("🚀 Bot running 24×365 (Ctrl+C to stop)")
-        while True:
-            time.sleep(60)
+    def report_latency(self, symbol=None):
+        """Dump p50/p99/max per stage (all symbols merged unless one is given)"""
+        summary = self.latency.summary(symbol)
+        for stage, h in summary.items():
+            log.info(
+                "⏱️ %s %s: n=%d p50=%.2fms p99=%.2fms max=%.2fms",
+                symbol or "all", stage, h["count"], h["p50_ms"], h["p99_ms"], h["max_ms"],
+                extra={"event": "latency", "stage": stage, "symbol": symbol or "all", **h},
+            )
+        return summary
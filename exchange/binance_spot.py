@@ -1,10 +1,10 @@
-from binance.client import Client
 from binance.enums import *
+from exchange.binance_utils import BinanceClient
 
 class BinanceSpot:
 
     def __init__(self, api_key, api_secret, fee_rate=0.001):
-        self.client = Client(api_key, api_secret)
+        self.client = BinanceClient(api_key, api_secret)
         self.fee_rate = fee_rate
 
     def get_balance(self, asset="USDT"):
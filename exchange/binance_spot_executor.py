@@ -1,33 +1,75 @@
-from binance.client import Client
-from exchange.binance_utils import adjust_quantity_to_step
+from exchange.binance_utils import BinanceClient, adjust_quantity_to_step
+from trading.ledger import Instrument
+
+TESTNET_REST_URL = "https://testnet.binance.vision"
 
 
 class BinanceSpotExecutor:
 
     def __init__(self, api_key, secret_key, testnet=True):
-        self.client = Client(api_key, secret_key)
-        if testnet:
-            self.client.API_URL = "https://testnet.binance.vision/api"
+        # testnet=False: config.binance.REST_URL (live API or a local simulator)
+        self.client = BinanceClient(
+            api_key, secret_key, rest_url=TESTNET_REST_URL if testnet else None
+        )
+        self.instruments = {}
+
+    def instrument(self, symbol):
+        """Tick / step grid from exchangeInfo, fetched once per symbol"""
+        inst = self.instruments.get(symbol)
+        if inst is None:
+            inst = Instrument.from_symbol_info(self.client.get_symbol_info(symbol))
+            self.instruments[symbol] = inst
+        return inst
+
+    def __call__(self, symbol, side, quantity):
+        """BinanceATRBot executor interface: executor(symbol, side, qty)"""
+        if side == "BUY":
+            return self.place_market_buy(symbol, quantity)
+        return self.market_sell(symbol, quantity)
 
     def place_market_buy(self, symbol, quantity):
+        inst = self.instrument(symbol)
         return self.client.order_market_buy(
             symbol=symbol,
-            quantity=quantity
+            quantity=inst.qty_str(inst.steps(quantity))
         )
 
-    def place_stop_loss(self, symbol, quantity, stop_price):
+    def place_stop_loss(self, symbol, quantity, stop_price, limit_offset=0.001):
+        # prices on the symbol's tick grid: PEPE-style quotes have 8 decimals, not 2
+        inst = self.instrument(symbol)
         return self.client.create_order(
             symbol=symbol,
             side="SELL",
             type="STOP_LOSS_LIMIT",
             timeInForce="GTC",
-            quantity=quantity,
-            stopPrice=round(stop_price, 2),
-            price=round(stop_price * 0.999, 2)
+            quantity=inst.qty_str(inst.steps(quantity)),
+            stopPrice=inst.price_str(inst.ticks(stop_price)),
+            price=inst.price_str(inst.ticks(stop_price * (1 - limit_offset), "floor"))
+        )
+
+    def place_oco_sell(self, symbol, quantity, target_price, stop_price, limit_offset=0.001):
+        """Take-profit limit + stop-limit; whichever fills cancels the other"""
+        inst = self.instrument(symbol)
+        return self.client.create_oco_order(
+            symbol=symbol,
+            side="SELL",
+            quantity=inst.qty_str(inst.steps(quantity)),
+            price=inst.price_str(inst.ticks(target_price)),
+            stopPrice=inst.price_str(inst.ticks(stop_price)),
+            stopLimitPrice=inst.price_str(inst.ticks(stop_price * (1 - limit_offset), "floor")),
+            stopLimitTimeInForce="GTC"
         )
 
+    def cancel_order(self, symbol, order_id):
+        # for an OCO leg this cancels the whole order list
+        return self.client.cancel_order(symbol=symbol, orderId=order_id)
+
+    def get_order(self, symbol, order_id):
+        return self.client.get_order(symbol=symbol, orderId=order_id)
+
     def market_sell(self, symbol, quantity):
+        inst = self.instrument(symbol)
         return self.client.order_market_sell(
             symbol=symbol,
-            quantity=quantity
+            quantity=inst.qty_str(inst.steps(quantity))
         )
@@ -0,0 +1,222 @@
+import itertools
+import json
+import threading
+import time
+
+import websocket
+
+from exchange.kline_decoder import loads
+from utils.logger import get_logger
+
+log = get_logger("stream")
+
+
+def kline_stream(symbol, interval):
+    return f"{symbol.lower()}@kline_{interval}"
+
+
+def tick_stream(symbol, kind="bookTicker"):
+    """<symbol>@bookTicker (best bid / ask) or <symbol>@aggTrade"""
+    return f"{symbol.lower()}@{kind}"
+
+
+class _Connection:
+    """One /stream socket carrying up to max_streams subscriptions"""
+
+    def __init__(self, owner, name):
+        self.owner = owner
+        self.name = name
+        self.streams = set()
+
+        self.pending_sub = set()
+        self.pending_unsub = set()
+        self._lock = threading.Lock()
+
+        self.ws = None
+        self.connected = False
+        self.running = False
+        self.threads = []
+
+    # ================= LIFECYCLE =================
+    def start(self):
+        self.running = True
+        for target in (self._run, self._sender):
+            t = threading.Thread(target=target, name=f"{self.name}-{target.__name__}", daemon=True)
+            t.start()
+            self.threads.append(t)
+
+    def stop(self):
+        self.running = False
+        if self.ws:
+            self.ws.close()
+
+    def _run(self):
+        backoff = 1
+        while self.running:
+            self.ws = websocket.WebSocketApp(
+                f"{self.owner.url}/stream",
+                on_open=self._on_open,
+                on_message=self._on_message,
+                on_error=self._on_error,
+                on_close=self._on_close,
+            )
+            started = time.monotonic()
+            self.ws.run_forever(ping_interval=180, ping_timeout=10)
+            self.connected = False
+
+            if not self.running:
+                break
+            # reset backoff after a healthy session (Binance drops every 24h)
+            backoff = 1 if time.monotonic() - started > 60 else min(backoff * 2, 60)
+            log.warning("🔌 %s disconnected, reconnecting in %ss", self.name, backoff)
+            time.sleep(backoff)
+
+    # ================= SUBSCRIPTIONS =================
+    def add(self, stream):
+        with self._lock:
+            self.streams.add(stream)
+            self.pending_unsub.discard(stream)
+            self.pending_sub.add(stream)
+
+    def remove(self, stream):
+        with self._lock:
+            self.streams.discard(stream)
+            self.pending_sub.discard(stream)
+            self.pending_unsub.add(stream)
+
+    def _sender(self):
+        # batch control frames; Binance allows 5 incoming messages/s per socket
+        interval = 1.0 / self.owner.max_messages_per_second
+        while self.running:
+            time.sleep(interval)
+            if not self.connected:
+                continue
+
+            with self._lock:
+                if self.pending_unsub:
+                    method, params = "UNSUBSCRIBE", self.pending_unsub
+                    self.pending_unsub = set()
+                elif self.pending_sub:
+                    method, params = "SUBSCRIBE", self.pending_sub
+                    self.pending_sub = set()
+                else:
+                    continue
+
+            self._control(method, sorted(params))
+
+    def _control(self, method, params):
+        try:
+            self.ws.send(json.dumps({
+                "method": method,
+                "params": params,
+                "id": next(self.owner.ids),
+            }))
+        except Exception as e:
+            log.error("❌ %s %s failed: %s", self.name, method, e)
+            with self._lock:
+                if method == "SUBSCRIBE":
+                    self.pending_sub |= set(params) & self.streams
+                else:
+                    self.pending_unsub |= set(params) - self.streams
+
+    # ================= WS EVENTS =================
+    def _on_open(self, ws):
+        log.info("✅ %s connected", self.name)
+        with self._lock:
+            # fresh socket: everything we own must be (re)subscribed
+            self.pending_sub = set(self.streams)
+            self.pending_unsub = set()
+        self.connected = True
+
+    def _on_message(self, ws, message):
+        msg = loads(message)
+        stream = msg.get("stream")
+        if stream is None:
+            return  # control responses: {"result": null, "id": n}
+
+        handler = self.owner.handlers.get(stream)
+        if handler is None:
+            return
+        try:
+            handler(msg["data"])
+        except Exception as e:
+            log.exception("❌ handler error on %s: %s", stream, e)
+
+    def _on_error(self, ws, error):
+        log.error("❌ %s error: %s", self.name, error)
+
+    def _on_close(self, ws, status, reason):
+        self.connected = False
+
+
+class CombinedStream:
+    """
+    Multiplexed Binance market streams (/stream + SUBSCRIBE).
+
+    Streams are packed into as few sockets as the exchange allows and
+    demultiplexed to per-stream handlers. subscribe / unsubscribe work at
+    runtime and only touch the socket that owns the stream.
+    """
+
+    def __init__(
+        self,
+        url="wss://stream.binance.com:9443",
+        max_streams=1024,
+        max_connections=5,
+        max_messages_per_second=4,
+    ):
+        self.url = url.rstrip("/")
+        self.max_streams = max_streams
+        self.max_connections = max_connections
+        self.max_messages_per_second = max_messages_per_second
+
+        self.handlers = {}
+        self.owner = {}             # stream -> _Connection
+        self.connections = []
+        self.ids = itertools.count(1)
+        self.running = False
+        self._lock = threading.Lock()
+
+    def start(self):
+        self.running = True
+        for conn in self.connections:
+            conn.start()
+
+    def stop(self):
+        self.running = False
+        for conn in self.connections:
+            conn.stop()
+
+    def _pick_connection(self):
+        open_conns = [c for c in self.connections if len(c.streams) < self.max_streams]
+        if open_conns:
+            return min(open_conns, key=lambda c: len(c.streams))
+
+        if len(self.connections) >= self.max_connections:
+            raise RuntimeError("stream capacity exhausted")
+
+        conn = _Connection(self, f"stream-{len(self.connections)}")
+        self.connections.append(conn)
+        if self.running:
+            conn.start()
+        return conn
+
+    def subscribe(self, stream, handler):
+        with self._lock:
+            self.handlers[stream] = handler
+            if stream in self.owner:
+                return
+            conn = self._pick_connection()
+            self.owner[stream] = conn
+            conn.add(stream)
+
+    def unsubscribe(self, stream):
+        with self._lock:
+            conn = self.owner.pop(stream, None)
+            if conn:
+                conn.remove(stream)
+            self.handlers.pop(stream, None)
+
+    @property
+    def streams(self):
+        return sorted(self.owner)
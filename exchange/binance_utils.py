@@ -1,5 +1,21 @@
 import math
 
+from binance.client import Client
+from config import config
+
+
+class BinanceClient(Client):
+    """
+    python-binance Client on config.binance.REST_URL: the live API, the
+    testnet or a local exchange.simulator.
+    """
+
+    def __init__(self, api_key=None, api_secret=None, rest_url=None, **kwargs):
+        # BaseClient formats API_URL with endpoint / tld; a plain URL passes through
+        self.API_URL = (rest_url or config.binance.REST_URL).rstrip("/") + "/api"
+        super().__init__(api_key, api_secret, **kwargs)
+
+
 def adjust_quantity_to_step(qty, step_size, min_qty):
     """
     Adjust quantity to Binance LOT_SIZE rules
@@ -0,0 +1,63 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from exchange.rate_limit import WeightLimiter
+from utils.logger import get_logger
+
+log = get_logger("warmup")
+
+KLINES_WEIGHT = 2               # GET /api/v3/klines
+MAX_KLINES_PER_REQUEST = 1000
+
+
+def fetch_closed_klines(client, symbol, interval, limit, limiter=None):
+    """
+    Last `limit` CLOSED klines (raw Binance rows, oldest first).
+    Pages backwards when limit exceeds one request.
+    """
+    now_ms = int(time.time() * 1000)
+    total = limit + 1   # the newest row is usually still open
+    rows = []
+    end_time = None
+
+    while len(rows) < total:
+        need = min(total - len(rows), MAX_KLINES_PER_REQUEST)
+        if limiter:
+            limiter.acquire(KLINES_WEIGHT)
+
+        params = {"symbol": symbol, "interval": interval, "limit": need}
+        if end_time is not None:
+            params["endTime"] = end_time
+        page = client.get_klines(**params)
+
+        if not page:
+            break
+        rows = page + rows
+        end_time = page[0][0] - 1
+
+        if len(page) < need:
+            break
+
+    # the newest row is the still-open candle; the socket delivers it closed
+    rows = [r for r in rows if r[6] < now_ms]
+    return rows[-limit:]
+
+
+def fetch_recent_klines(client, symbols, interval, limit=500, max_workers=8, limiter=None):
+    """
+    Fetch closed history for every symbol concurrently.
+    Returns {symbol: rows}; symbols that fail are left out and start cold.
+    """
+    limiter = limiter or WeightLimiter()
+
+    def job(symbol):
+        try:
+            return symbol, fetch_closed_klines(client, symbol, interval, limit, limiter)
+        except Exception as e:
+            log.warning("⚠️ Warm-up failed for %s: %s", symbol, e)
+            return symbol, None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        results = pool.map(job, symbols)
+
+    return {sym: rows for sym, rows in results if rows is not None}
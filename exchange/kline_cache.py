@@ -0,0 +1,230 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+from binance.helpers import convert_ts_str, interval_to_milliseconds
+
+from config import config
+from exchange.binance_warmup import KLINES_WEIGHT, MAX_KLINES_PER_REQUEST
+from exchange.kline_downloader import KlineDownloader
+from exchange.rate_limit import WeightLimiter
+from utils.logger import get_logger
+
+log = get_logger("kline_cache")
+
+COLUMNS = ("time", "open", "high", "low", "close", "volume")
+_DTYPES = {"time": np.int64}
+
+
+def _to_ms(value):
+    # int ms, "1 Jan 2025" / "now UTC" strings, or datetimes
+    if value is None:
+        return int(time.time() * 1000)
+    if hasattr(value, "timestamp"):
+        return int(value.timestamp() * 1000)
+    return int(convert_ts_str(value))
+
+
+def _subtract(start, end, ranges):
+    """Parts of [start, end) not covered by the sorted, merged ranges"""
+    gaps = []
+    cursor = start
+    for a, b in ranges:
+        if b <= cursor:
+            continue
+        if a >= end:
+            break
+        if a > cursor:
+            gaps.append((cursor, a))
+        cursor = max(cursor, b)
+    if cursor < end:
+        gaps.append((cursor, end))
+    return gaps
+
+
+def _merge(ranges):
+    out = []
+    for a, b in sorted(tuple(r) for r in ranges):
+        if out and a <= out[-1][1]:
+            out[-1][1] = max(out[-1][1], b)
+        else:
+            out.append([a, b])
+    return out
+
+
+class KlineCache:
+    """
+    On-disk columnar kline store: one .npy per column under
+    {root}/{SYMBOL}/{interval}/ plus coverage.json listing the [start, end)
+    open-time ranges already downloaded (empty ranges included, so
+    pre-listing history is never asked for twice).
+
+    Reads are memory-mapped; only the parts of a request missing from the
+    coverage index go to REST, and only closed candles are ever stored.
+    client defaults to a KlineDownloader (header-aware, concurrent); a
+    python-binance Client also works and is paced by `limiter`.
+    """
+
+    def __init__(self, client=None, root=None, limiter=None):
+        # one budget for the cache and its downloader: the weight limit is per IP
+        self.limiter = limiter or WeightLimiter(config.binance.REQUEST_WEIGHT_LIMIT)
+        self.client = client or KlineDownloader(limiter=self.limiter)
+        self.root = root or config.binance.KLINE_CACHE_DIR
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    # ================= PATHS / INDEX =================
+    def path(self, symbol, interval):
+        return os.path.join(self.root, symbol.upper(), interval)
+
+    def _series_lock(self, symbol, interval):
+        with self._lock:
+            return self._locks.setdefault((symbol, interval), threading.Lock())
+
+    def coverage(self, symbol, interval):
+        try:
+            with open(os.path.join(self.path(symbol, interval), "coverage.json")) as f:
+                return [tuple(r) for r in json.load(f)]
+        except FileNotFoundError:
+            return []
+
+    def missing(self, symbol, interval, start, end):
+        """Uncovered [start, end) ranges, ms open time"""
+        return _subtract(start, end, self.coverage(symbol, interval))
+
+    # ================= STORAGE =================
+    def _load(self, symbol, interval, mmap=True):
+        folder = self.path(symbol, interval)
+        out = {}
+        for col in COLUMNS:
+            try:
+                arr = np.load(os.path.join(folder, f"{col}.npy"), mmap_mode="r" if mmap else None)
+            except (FileNotFoundError, ValueError):
+                # no file yet, or a zero-length column (nothing to map)
+                arr = np.empty(0, dtype=_DTYPES.get(col, np.float64))
+            out[col] = arr
+        return out
+
+    def _save(self, folder, columns, coverage):
+        os.makedirs(folder, exist_ok=True)
+        # write-then-rename so a reader never maps a half-written column
+        for col in COLUMNS:
+            tmp = os.path.join(folder, f".{col}.tmp.npy")
+            np.save(tmp, columns[col])
+            os.replace(tmp, os.path.join(folder, f"{col}.npy"))
+
+        tmp = os.path.join(folder, ".coverage.tmp")
+        with open(tmp, "w") as f:
+            json.dump(coverage, f)
+        os.replace(tmp, os.path.join(folder, "coverage.json"))
+
+    def _fetch(self, symbol, interval, start, end):
+        """Raw klines with start <= open_time < end, paging forwards"""
+        if isinstance(self.client, KlineDownloader):
+            return self.client.fetch_range(symbol, interval, start, end)
+
+        rows = []
+        cursor = start
+        while cursor < end:
+            self.limiter.acquire(KLINES_WEIGHT)
+            page = self.client.get_klines(
+                symbol=symbol,
+                interval=interval,
+                startTime=cursor,
+                endTime=end - 1,
+                limit=MAX_KLINES_PER_REQUEST,
+            )
+            if not page:
+                break
+            rows.extend(page)
+            cursor = page[-1][0] + 1
+            if len(page) < MAX_KLINES_PER_REQUEST:
+                break
+        return [r for r in rows if start <= r[0] < end]
+
+    # ================= UPDATE =================
+    def update(self, symbol, interval, start, end):
+        """Download the uncovered parts of [start, end) and merge them in"""
+        step = interval_to_milliseconds(interval)
+        if step:
+            # the current candle is still open; never cache (or cover) it
+            now = int(time.time() * 1000)
+            end = min(end, now - now % step)
+        if end <= start:
+            return 0
+
+        with self._series_lock(symbol, interval):
+            gaps = self.missing(symbol, interval, start, end)
+            if not gaps:
+                return 0
+
+            rows = []
+            for a, b in gaps:
+                rows.extend(self._fetch(symbol, interval, a, b))
+
+            old = self._load(symbol, interval, mmap=False)
+            new = {
+                "time": np.fromiter((r[0] for r in rows), np.int64, len(rows)),
+            }
+            for i, col in enumerate(COLUMNS[1:], start=1):
+                new[col] = np.fromiter((float(r[i]) for r in rows), np.float64, len(rows))
+
+            times = np.concatenate([new["time"], old["time"]])
+            # fresh rows first so they win on duplicate open times
+            times, first = np.unique(times, return_index=True)
+            merged = {"time": times}
+            for col in COLUMNS[1:]:
+                merged[col] = np.concatenate([new[col], old[col]])[first]
+
+            coverage = _merge(self.coverage(symbol, interval) + gaps)
+            self._save(self.path(symbol, interval), merged, coverage)
+
+        log.info(
+            "💾 %s %s: +%d candles in %d gap(s)", symbol, interval, len(rows), len(gaps),
+            extra={"event": "cache", "symbol": symbol},
+        )
+        return len(rows)
+
+    def prefetch(self, symbols, interval, start_str, end_str=None, max_workers=8):
+        """
+        Fill the cache for many symbols concurrently (before a per-symbol
+        loop). Returns {symbol: candles added, or the exception}.
+        """
+        start, end = _to_ms(start_str), _to_ms(end_str)
+
+        def job(symbol):
+            try:
+                return self.update(symbol, interval, start, end + 1)
+            except Exception as e:
+                log.warning("⚠️ Prefetch failed for %s: %s", symbol, e)
+                return e
+
+        symbols = list(symbols)
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            return dict(zip(symbols, pool.map(job, symbols)))
+
+    # ================= READ =================
+    def arrays(self, symbol, interval, start_str, end_str=None, fetch=True):
+        """
+        Columns for start <= open_time <= end (same bounds as
+        get_historical_klines). Memory-mapped, read-only.
+        """
+        start, end = _to_ms(start_str), _to_ms(end_str)
+        if fetch:
+            self.update(symbol, interval, start, end + 1)
+
+        cols = self._load(symbol, interval)
+        lo = np.searchsorted(cols["time"], start, side="left")
+        hi = np.searchsorted(cols["time"], end, side="right")
+        return {col: arr[lo:hi] for col, arr in cols.items()}
+
+    def frame(self, symbol, interval, start_str, end_str=None, fetch=True):
+        """DataFrame shaped like the scripts' fetch_data(): time, OHLCV floats"""
+        cols = self.arrays(symbol, interval, start_str, end_str, fetch)
+        df = pd.DataFrame({col: cols[col] for col in COLUMNS[1:]})
+        df.insert(0, "time", pd.to_datetime(cols["time"], unit="ms"))
+        return df
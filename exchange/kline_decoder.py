@@ -0,0 +1,133 @@
+import numpy as np
+
+try:
+    import orjson
+
+    def loads(raw):
+        return orjson.loads(raw)
+
+    FAST_JSON = True
+except ImportError:  # optional: pip install orjson
+    import json
+
+    def loads(raw):
+        return json.loads(raw)
+
+    FAST_JSON = False
+
+
+# one row of a columnar batch / on-disk record
+KLINE_DTYPE = np.dtype([
+    ("open_time", np.int64),
+    ("close_time", np.int64),
+    ("event_time", np.int64),
+    ("open", np.float64),
+    ("high", np.float64),
+    ("low", np.float64),
+    ("close", np.float64),
+    ("volume", np.float64),
+    ("closed", np.bool_),
+])
+
+
+class Kline:
+    """Compact typed kline: int ms timestamps, float OHLCV, no per-row dict"""
+
+    __slots__ = (
+        "symbol", "interval", "open_time", "close_time", "event_time",
+        "open", "high", "low", "close", "volume", "closed",
+    )
+
+    def __init__(self, symbol, interval, open_time, close_time, event_time,
+                 open, high, low, close, volume, closed):
+        self.symbol = symbol
+        self.interval = interval
+        self.open_time = open_time
+        self.close_time = close_time
+        self.event_time = event_time
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+        self.closed = closed
+
+    def candle(self):
+        return {
+            "open": self.open,
+            "high": self.high,
+            "low": self.low,
+            "close": self.close,
+            "volume": self.volume,
+        }
+
+    @classmethod
+    def from_rest(cls, symbol, interval, row):
+        """Row from GET /api/v3/klines (always closed when we keep it)"""
+        return cls(
+            symbol, interval, row[0], row[6], row[6],
+            float(row[1]), float(row[2]), float(row[3]), float(row[4]), float(row[5]),
+            True,
+        )
+
+
+# ================= SINGLE MESSAGE =================
+def decode_kline(msg):
+    """
+    Kline event (raw str/bytes, stream payload or combined envelope) → Kline.
+    Returns None for anything that is not a kline.
+    """
+    if isinstance(msg, (str, bytes, bytearray)):
+        msg = loads(msg)
+    if "data" in msg:
+        msg = msg["data"]
+
+    k = msg.get("k")
+    if k is None:
+        return None
+
+    return Kline(
+        k["s"], k["i"], k["t"], k["T"], msg.get("E", k["T"]),
+        float(k["o"]), float(k["h"]), float(k["l"]), float(k["c"]), float(k["v"]),
+        k["x"],
+    )
+
+
+# ================= BATCH =================
+def decode_batch(msgs):
+    """
+    Many kline events → columnar arrays in one pass.
+    Returns (symbols, structured array of KLINE_DTYPE).
+    """
+    ks, events = [], []
+    for msg in msgs:
+        if isinstance(msg, (str, bytes, bytearray)):
+            msg = loads(msg)
+        if "data" in msg:
+            msg = msg["data"]
+        k = msg.get("k")
+        if k is not None:
+            ks.append(k)
+            events.append(msg.get("E", k["T"]))
+
+    n = len(ks)
+    out = np.empty(n, dtype=KLINE_DTYPE)
+    if not n:
+        return np.array([], dtype=object), out
+
+    out["open_time"] = np.fromiter((k["t"] for k in ks), np.int64, n)
+    out["close_time"] = np.fromiter((k["T"] for k in ks), np.int64, n)
+    out["event_time"] = np.fromiter(events, np.int64, n)
+    out["closed"] = np.fromiter((k["x"] for k in ks), np.bool_, n)
+
+    # one flat float pass is ~2x faster than numpy parsing the strings
+    prices = np.fromiter(
+        (float(x) for k in ks for x in (k["o"], k["h"], k["l"], k["c"], k["v"])),
+        np.float64,
+        n * 5,
+    ).reshape(n, 5)
+    for i, field in enumerate(("open", "high", "low", "close", "volume")):
+        out[field] = prices[:, i]
+
+    symbols = np.array([k["s"] for k in ks], dtype=object)
+    return symbols, out
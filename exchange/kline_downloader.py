@@ -0,0 +1,145 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import config
+from exchange.binance_warmup import KLINES_WEIGHT, MAX_KLINES_PER_REQUEST
+from exchange.rate_limit import WeightLimiter
+from utils.logger import get_logger
+
+log = get_logger("downloader")
+
+
+class KlineDownloader:
+    """
+    Concurrent /api/v3/klines client over one pooled keep-alive session.
+
+    Every request passes the shared WeightLimiter first; each response's
+    X-MBX-USED-WEIGHT-1M header re-syncs it with the exchange's count, and
+    a 429 / 418 pauses all workers for Retry-After instead of hammering on.
+    get_klines() takes the same arguments as python-binance's Client, so
+    this can be handed to KlineCache (or anything else reading klines).
+    """
+
+    def __init__(
+        self,
+        base_url=None,
+        max_workers=8,
+        limiter=None,
+        max_retries=5,
+        timeout=10.0,
+        session=None,
+    ):
+        self.base_url = (base_url or config.binance.REST_URL).rstrip("/")
+        self.max_workers = max_workers
+        self.limiter = limiter or WeightLimiter(config.binance.REQUEST_WEIGHT_LIMIT)
+        self.max_retries = max_retries
+        self.timeout = timeout
+
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+        self.session = session
+
+        self.requests = 0
+        self.throttled = 0
+        self.used_weight = 0
+
+    # ================= HTTP =================
+    def _get(self, path, params, weight):
+        backoff = 1.0
+        for _ in range(self.max_retries + 1):
+            self.limiter.acquire(weight)
+            try:
+                resp = self.session.get(
+                    f"{self.base_url}{path}", params=params, timeout=self.timeout
+                )
+            except requests.RequestException as e:
+                log.warning("⚠️ %s failed (%s), retrying in %.0fs", path, e, backoff)
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 30)
+                continue
+            self.requests += 1
+
+            used = resp.headers.get("X-MBX-USED-WEIGHT-1M")
+            if used is not None:
+                self.used_weight = int(used)
+                self.limiter.observe(self.used_weight)
+
+            if resp.status_code in (418, 429):
+                # 429 = slow down, 418 = IP banned for Retry-After seconds
+                self.throttled += 1
+                wait = float(resp.headers.get("Retry-After", backoff))
+                log.warning(
+                    "⛔ HTTP %d on %s, pausing all requests for %.0fs",
+                    resp.status_code, path, wait,
+                    extra={"event": "throttle", "status": resp.status_code},
+                )
+                self.limiter.pause(wait)
+                backoff = min(backoff * 2, 30)
+                continue
+
+            if resp.status_code >= 500:
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 30)
+                continue
+
+            resp.raise_for_status()
+            return resp.json()
+
+        raise RuntimeError(f"{path} {params}: gave up after {self.max_retries} retries")
+
+    def get_klines(self, symbol, interval, startTime=None, endTime=None, limit=500):
+        params = {"symbol": symbol, "interval": interval, "limit": limit}
+        if startTime is not None:
+            params["startTime"] = startTime
+        if endTime is not None:
+            params["endTime"] = endTime
+        return self._get("/api/v3/klines", params, KLINES_WEIGHT)
+
+    # ================= BULK =================
+    def fetch_range(self, symbol, interval, start, end):
+        """Raw klines with start <= open_time < end, paging forwards"""
+        rows = []
+        cursor = start
+        while cursor < end:
+            page = self.get_klines(
+                symbol=symbol,
+                interval=interval,
+                startTime=cursor,
+                endTime=end - 1,
+                limit=MAX_KLINES_PER_REQUEST,
+            )
+            if not page:
+                break
+            rows.extend(page)
+            cursor = page[-1][0] + 1
+            if len(page) < MAX_KLINES_PER_REQUEST:
+                break
+        return [r for r in rows if start <= r[0] < end]
+
+    def fetch_many(self, jobs):
+        """
+        jobs: iterable of (symbol, interval, start_ms, end_ms).
+        Returns {(symbol, interval): rows or the exception that stopped it}.
+        """
+        jobs = list(jobs)
+
+        def job(args):
+            try:
+                return self.fetch_range(*args)
+            except Exception as e:
+                log.warning("⚠️ %s %s download failed: %s", args[0], args[1], e)
+                return e
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            results = list(pool.map(job, jobs))
+
+        return {(sym, interval): rows for (sym, interval, _, _), rows in zip(jobs, results)}
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,59 @@
+import threading
+import time
+
+
+class WeightLimiter:
+    """
+    Client-side token bucket for Binance REQUEST_WEIGHT (per IP, per minute).
+    acquire() blocks until the request fits, keeping `headroom` of the
+    limit in reserve for the rest of the process.
+
+    observe() syncs the bucket with the exchange's own count
+    (X-MBX-USED-WEIGHT-1M), which also covers other processes on the same
+    IP; pause() stops every caller after a 429 / 418 Retry-After. A
+    process holding only a slice of the budget passes the whole per-IP
+    figure as `ip_limit` so the header is compared against the right total.
+    """
+
+    def __init__(self, limit=6000, window=60.0, headroom=0.9, ip_limit=None):
+        self.capacity = limit * headroom
+        self.ip_capacity = (ip_limit or limit) * headroom
+        self.rate = self.capacity / window
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        # updated may sit in the future while a pause() is in force
+        if now > self.updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def acquire(self, weight=1):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self.paused_until:
+                    wait = self.paused_until - now
+                elif self.tokens >= weight:
+                    self.tokens -= weight
+                    return
+                else:
+                    wait = (weight - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def observe(self, used_weight):
+        """Exchange-reported weight used this minute; never trust more than that"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens = min(self.tokens, self.ip_capacity - used_weight)
+
+    def pause(self, seconds):
+        with self._lock:
+            now = time.monotonic()
+            self.paused_until = max(self.paused_until, now + seconds)
+            # start refilling from empty once the pause is over
+            self.tokens = 0.0
+            self.updated = self.paused_until
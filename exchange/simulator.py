@@ -0,0 +1,886 @@
+"""
+Local stand-in for the Binance spot API, for load tests that must not
+touch the exchange.
+
+One HTTP server answers the REST endpoints the code uses (ping / time,
+exchangeInfo, klines, ticker/24hr, ticker/price, account, order, order/oco,
+openOrders) and upgrades GET /stream to a combined websocket (SUBSCRIBE /
+UNSUBSCRIBE frames, {"stream", "data"} envelopes) carrying klines, plus
+bookTicker and aggTrade derived from each kline update. Resting LIMIT,
+LIMIT_MAKER, STOP_LOSS_LIMIT and OCO orders lock their funds and are
+matched against every price the feed publishes. Candles come from a
+SyntheticFeed (random walks, any number of symbols) or a RecordedFeed
+(a StreamRecorder file) and are played at `speed` x their own clock.
+
+Knobs: REST latency + jitter per request, the X-MBX-USED-WEIGHT-1M
+header with 429 / Retry-After once `weight_limit` is spent, and forced
+websocket disconnects every `disconnect_every` seconds. Socket latency
+is emulated by back-dating each message's event time "E", so the bot's
+network stage sees it without the feed being slowed down.
+
+Point the bot, BinanceSpot and BinanceSpotExecutor(testnet=False) at it:
+
+    python -m exchange.simulator --symbols 500 --speed 60 --port 8080
+    BINANCE_REST_URL=http://127.0.0.1:8080 BINANCE_STREAM_URL=ws://127.0.0.1:8080
+"""
+import argparse
+import base64
+import bisect
+import hashlib
+import itertools
+import json
+import random
+import socket
+import struct
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+from binance.helpers import interval_to_milliseconds
+
+from exchange.binance_stream import kline_stream, tick_stream
+from exchange.kline_decoder import loads
+from exchange.stream_recorder import dumps, read_frames
+from utils.logger import get_logger
+
+log = get_logger("simulator")
+
+QUOTE = "USDT"
+TICK_SIZE = "0.00000001"
+STEP_SIZE = "0.01"
+MIN_NOTIONAL = "5"
+
+# REQUEST_WEIGHT per GET endpoint (spot API docs); everything else costs 1
+WEIGHTS = {
+    "/api/v3/exchangeInfo": 20,
+    "/api/v3/account": 20,
+    "/api/v3/klines": 2,
+    "/api/v3/ticker/24hr": 2,
+    "/api/v3/ticker/price": 2,
+    "/api/v3/order": 4,
+    "/api/v3/openOrders": 6,
+}
+ALL_SYMBOLS_WEIGHT = {"/api/v3/ticker/24hr": 80, "/api/v3/ticker/price": 4, "/api/v3/openOrders": 80}
+
+_WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+_TEXT, _CLOSE, _PING, _PONG = 0x1, 0x8, 0x9, 0xA
+
+
+def _fmt(x):
+    return f"{x:.8f}"
+
+
+def _rest_row(k):
+    """Websocket kline payload -> GET /api/v3/klines row"""
+    return [
+        k["t"], k["o"], k["h"], k["l"], k["c"], k["v"], k["T"],
+        k.get("q", "0"), k.get("n", 0), "0", "0", "0",
+    ]
+
+
+# ================= FEEDS =================
+class SyntheticFeed:
+    """
+    Geometric random walks for `symbols`, stepped together bar by bar.
+    `history` closed bars ending now are available over REST from the
+    start; `updates` unclosed ticks per bar are streamed before the close.
+    """
+
+    def __init__(self, symbols, interval="1m", history=1000, updates=0, vol=0.004, seed=0):
+        self.symbols = list(symbols)
+        self.interval = interval
+        self.interval_ms = interval_to_milliseconds(interval)
+        self.updates = updates
+        self.vol = vol
+        self.rng = np.random.default_rng(seed)
+
+        self.close = 10 ** self.rng.uniform(-5, 2, len(self.symbols))
+        now = int(time.time() * 1000)
+        self.open_time = now - now % self.interval_ms - history * self.interval_ms
+
+        self.history = {sym: [] for sym in self.symbols}
+        for _ in range(history):
+            for msg in self._bar(0):
+                self.history[msg["s"]].append(_rest_row(msg["k"]))
+
+    @classmethod
+    def named(cls, n, **kwargs):
+        return cls([f"SIM{i:03d}{QUOTE}" for i in range(n)], **kwargs)
+
+    def _bar(self, updates):
+        n = len(self.symbols)
+        t = self.open_time
+        o = self.close
+        c = o * np.exp(self.rng.normal(0, self.vol, n))
+        wick = 1 + np.abs(self.rng.normal(0, self.vol / 2, (2, n)))
+        h = np.maximum(o, c) * wick[0]
+        l = np.minimum(o, c) / wick[1]
+        v = self.rng.uniform(1e3, 1e5, n) / np.sqrt(o)
+
+        self.close = c
+        self.open_time += self.interval_ms
+
+        msgs = []
+        for u in range(1, updates + 2):
+            frac = u / (updates + 1)
+            closed = u == updates + 1
+            cu = o + (c - o) * frac
+            hu = h if closed else np.maximum(o, cu)
+            lu = l if closed else np.minimum(o, cu)
+            for j, sym in enumerate(self.symbols):
+                msgs.append({
+                    "e": "kline", "E": 0, "s": sym,
+                    "k": {
+                        "t": t, "T": t + self.interval_ms - 1, "s": sym, "i": self.interval,
+                        "o": _fmt(o[j]), "h": _fmt(hu[j]), "l": _fmt(lu[j]), "c": _fmt(cu[j]),
+                        "v": _fmt(v[j] * frac), "q": _fmt(v[j] * frac * cu[j]), "n": 0,
+                        "x": closed,
+                    },
+                })
+        return msgs
+
+    def __iter__(self):
+        """(feed time ms, message): ticks spread over the bar, closes at its end"""
+        step = self.interval_ms // (self.updates + 1)
+        n = len(self.symbols)
+        while True:
+            t = self.open_time
+            for i, msg in enumerate(self._bar(self.updates)):
+                yield t + step * (i // n + 1), msg
+
+
+class RecordedFeed:
+    """Messages of a StreamRecorder file, on their recorded receive clock"""
+
+    def __init__(self, path):
+        self.path = path
+        self.history = {}
+        symbols, self.interval = {}, None
+        for _, msg in read_frames(path):
+            k = msg.get("k")
+            if k is not None:
+                symbols.setdefault(k["s"], None)
+                self.interval = self.interval or k["i"]
+        self.symbols = list(symbols)
+
+    def __iter__(self):
+        for received_ns, msg in read_frames(self.path):
+            if msg.get("k") is not None:
+                yield received_ns // 1_000_000, msg
+
+
+# ================= WEBSOCKET =================
+class _WsClient:
+    """Server side of one RFC 6455 connection (unmasked out, masked in)"""
+
+    def __init__(self, sock, rfile, streams):
+        self.sock = sock
+        self.rfile = rfile
+        self.streams = set(streams)
+        self.opened = time.monotonic()
+        self.alive = True
+        self._lock = threading.Lock()
+
+    def send(self, payload, opcode=_TEXT):
+        n = len(payload)
+        if n < 126:
+            head = struct.pack("!BB", 0x80 | opcode, n)
+        elif n < 65536:
+            head = struct.pack("!BBH", 0x80 | opcode, 126, n)
+        else:
+            head = struct.pack("!BBQ", 0x80 | opcode, 127, n)
+        with self._lock:
+            try:
+                self.sock.sendall(head + payload)
+            except OSError:
+                self.alive = False
+
+    def recv(self):
+        """(opcode, payload) of the next frame; None once the socket is gone"""
+        try:
+            head = self.rfile.read(2)
+            if len(head) < 2:
+                return None
+            n = head[1] & 0x7F
+            if n == 126:
+                n = struct.unpack("!H", self.rfile.read(2))[0]
+            elif n == 127:
+                n = struct.unpack("!Q", self.rfile.read(8))[0]
+            mask = self.rfile.read(4) if head[1] & 0x80 else None
+            data = self.rfile.read(n)
+        except (OSError, struct.error):
+            return None
+        if mask:
+            data = bytes(b ^ mask[i % 4] for i, b in enumerate(data))
+        return head[0] & 0x0F, data
+
+    def close(self):
+        self.alive = False
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+
+class _ApiError(Exception):
+    def __init__(self, status, code, msg, headers=None):
+        super().__init__(msg)
+        self.status = status
+        self.body = {"code": code, "msg": msg}
+        self.headers = headers or {}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive, like the real API
+
+    def log_message(self, fmt, *args):
+        pass
+
+    def do_GET(self):
+        if self.headers.get("Upgrade", "").lower() == "websocket":
+            self.server.sim._websocket(self)
+        else:
+            self._rest("GET")
+
+    def do_POST(self):
+        self._rest("POST")
+
+    def do_DELETE(self):
+        self._rest("DELETE")
+
+    def _rest(self, method):
+        url = urlsplit(self.path)
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            body = self.rfile.read(length).decode()
+            params.update({k: v[-1] for k, v in parse_qs(body).items()})
+
+        status, payload, headers = self.server.sim._rest(method, url.path, params)
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in headers.items():
+            self.send_header(key, str(value))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+# ================= SIMULATOR =================
+class BinanceSimulator:
+    def __init__(
+        self,
+        feed,
+        host="127.0.0.1",
+        port=0,
+        speed=1.0,
+        latency=0.0,
+        jitter=0.0,
+        weight_limit=6000,
+        disconnect_every=0.0,
+        balance=10000.0,
+        fee_rate=0.001,
+        seed=0,
+    ):
+        self.feed = feed
+        self.speed = speed
+        self.latency = latency
+        self.jitter = jitter
+        self.weight_limit = weight_limit
+        self.disconnect_every = disconnect_every
+        self.fee_rate = fee_rate
+        self.random = random.Random(seed)
+
+        self.symbols = {sym: self._symbol_info(sym) for sym in feed.symbols}
+        self.interval = feed.interval
+        self.klines = {sym: list(feed.history.get(sym, [])) for sym in feed.symbols}
+        self.times = {sym: [row[0] for row in rows] for sym, rows in self.klines.items()}
+        self.last = {sym: float(rows[-1][4]) if rows else 0.0 for sym, rows in self.klines.items()}
+
+        self.balances = {QUOTE: balance}
+        for info in self.symbols.values():
+            self.balances.setdefault(info["baseAsset"], 0.0)
+        self.locked = {}
+        self.orders = []
+        self._by_id = {}
+        self._resting = {}          # symbol -> {orderId: order} still on the book
+        self._lists = {}            # orderListId -> leg orderIds
+        self._holds = {}            # ("order" | "list", id) -> (asset, locked amount)
+        self._order_ids = itertools.count(1)
+        self._list_ids = itertools.count(1)
+
+        self.clients = []
+        self.published = 0
+        self.requests = 0
+        self.throttled = 0
+        self._minute = None
+        self._used = 0
+        self._lock = threading.Lock()
+
+        self.routes = {
+            ("GET", "/api/v3/ping"): lambda p: {},
+            ("GET", "/api/v3/time"): lambda p: {"serverTime": int(time.time() * 1000)},
+            ("GET", "/api/v3/exchangeInfo"): self._exchange_info,
+            ("GET", "/api/v3/klines"): self._klines,
+            ("GET", "/api/v3/ticker/24hr"): self._ticker,
+            ("GET", "/api/v3/ticker/price"): self._price,
+            ("GET", "/api/v3/account"): self._account,
+            ("POST", "/api/v3/order"): self._order,
+            ("POST", "/api/v3/order/oco"): self._oco,
+            ("GET", "/api/v3/order"): self._get_order,
+            ("DELETE", "/api/v3/order"): self._cancel,
+            ("GET", "/api/v3/openOrders"): self._open_orders,
+        }
+        self.server = ThreadingHTTPServer((host, port), _Handler)
+        self.server.daemon_threads = True
+        self.server.sim = self
+        self.running = False
+        self.threads = []
+
+    @property
+    def rest_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def stream_url(self):
+        host, port = self.server.server_address[:2]
+        return f"ws://{host}:{port}"
+
+    def start(self):
+        self.running = True
+        for target in (self.server.serve_forever, self._pump):
+            t = threading.Thread(target=target, name=f"sim-{target.__name__}", daemon=True)
+            t.start()
+            self.threads.append(t)
+        log.info(
+            "🧪 Simulator on %s: %d symbols, %s x%g",
+            self.rest_url, len(self.symbols), self.interval, self.speed,
+        )
+        return self
+
+    def stop(self):
+        self.running = False
+        self.disconnect()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def disconnect(self):
+        """Drop every websocket now; clients have to reconnect and resubscribe"""
+        with self._lock:
+            clients, self.clients = self.clients, []
+        for c in clients:
+            c.close()
+
+    def stats(self):
+        return {
+            "published": self.published,
+            "clients": len(self.clients),
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "orders": len(self.orders),
+        }
+
+    # ================= FEED =================
+    def _pump(self):
+        start = time.monotonic()
+        first = None
+        for feed_ms, msg in self.feed:
+            if not self.running:
+                return
+            if first is None:
+                first = feed_ms
+            ahead = (feed_ms - first) / 1000 / self.speed - (time.monotonic() - start)
+            if ahead > 0:
+                time.sleep(ahead)
+            self._publish(msg)
+
+            if self.disconnect_every:
+                now = time.monotonic()
+                for c in list(self.clients):
+                    if now - c.opened > self.disconnect_every:
+                        self._drop(c)
+
+    def _publish(self, msg):
+        k = msg["k"]
+        sym = k["s"]
+        self.last[sym] = float(k["c"])
+        if self._resting.get(sym):
+            self._match(sym, self.last[sym])
+        if k["x"]:
+            self.klines[sym].append(_rest_row(k))
+            self.times[sym].append(k["t"])
+
+        msg = dict(msg)
+        msg["E"] = int(time.time() * 1000 - self._delay() * 1000)
+        frames = {kline_stream(sym, k["i"]): lambda: msg}
+        # every kline update doubles as a best bid / ask and a trade print
+        frames[tick_stream(sym, "bookTicker")] = lambda: {
+            "u": self.published, "s": sym,
+            "b": k["c"], "B": "1.00000000", "a": k["c"], "A": "1.00000000",
+        }
+        frames[tick_stream(sym, "aggTrade")] = lambda: {
+            "e": "aggTrade", "E": msg["E"], "s": sym, "a": self.published,
+            "p": k["c"], "q": "1.00000000", "T": msg["E"], "m": True,
+        }
+
+        encoded = {}
+        for c in list(self.clients):
+            for stream in c.streams.intersection(frames):
+                if stream not in encoded:
+                    encoded[stream] = (
+                        b'{"stream":"' + stream.encode() + b'","data":' + dumps(frames[stream]()) + b"}"
+                    )
+                c.send(encoded[stream])
+            if not c.alive:
+                self._drop(c)
+        self.published += 1
+
+    def _drop(self, client):
+        with self._lock:
+            if client in self.clients:
+                self.clients.remove(client)
+        client.close()
+
+    def _websocket(self, handler):
+        key = handler.headers.get("Sec-WebSocket-Key", "")
+        accept = base64.b64encode(hashlib.sha1((key + _WS_GUID).encode()).digest()).decode()
+        handler.send_response(101, "Switching Protocols")
+        handler.send_header("Upgrade", "websocket")
+        handler.send_header("Connection", "Upgrade")
+        handler.send_header("Sec-WebSocket-Accept", accept)
+        handler.end_headers()
+        handler.close_connection = True
+
+        query = parse_qs(urlsplit(handler.path).query)
+        streams = query.get("streams", [""])[0].split("/") if query.get("streams") else []
+        client = _WsClient(handler.connection, handler.rfile, streams)
+        with self._lock:
+            self.clients.append(client)
+
+        while client.alive:
+            frame = client.recv()
+            if frame is None:
+                break
+            opcode, data = frame
+            if opcode == _PING:
+                client.send(data, _PONG)
+            elif opcode == _CLOSE:
+                client.send(data[:2], _CLOSE)
+                break
+            elif opcode == _TEXT:
+                client.send(self._control(client, loads(data)))
+        self._drop(client)
+
+    def _control(self, client, req):
+        method, params = req.get("method"), req.get("params") or []
+        result = None
+        if method == "SUBSCRIBE":
+            client.streams.update(params)
+        elif method == "UNSUBSCRIBE":
+            client.streams.difference_update(params)
+        elif method == "LIST_SUBSCRIPTIONS":
+            result = sorted(client.streams)
+        return dumps({"result": result, "id": req.get("id")})
+
+    # ================= REST =================
+    def _delay(self):
+        return self.latency + self.random.uniform(0, self.jitter) if self.jitter else self.latency
+
+    def _weight(self, method, path, params):
+        if method != "GET":
+            return 1
+        if path in ALL_SYMBOLS_WEIGHT and "symbol" not in params:
+            return ALL_SYMBOLS_WEIGHT[path]
+        return WEIGHTS.get(path, 1)
+
+    def _spend(self, weight):
+        """Binance counts weight per calendar minute; returns (used, retry_after)"""
+        now = time.time()
+        with self._lock:
+            minute = int(now // 60)
+            if minute != self._minute:
+                self._minute, self._used = minute, 0
+            if self._used + weight > self.weight_limit:
+                return self._used, int(60 - now % 60) + 1
+            self._used += weight
+            return self._used, 0
+
+    def _rest(self, method, path, params):
+        delay = self._delay()
+        if delay > 0:
+            time.sleep(delay)
+
+        used, retry_after = self._spend(self._weight(method, path, params))
+        headers = {"X-MBX-USED-WEIGHT-1M": used, "X-MBX-USED-WEIGHT": used}
+        with self._lock:
+            self.requests += 1
+            if retry_after:
+                self.throttled += 1
+        if retry_after:
+            headers["Retry-After"] = retry_after
+            return 429, {"code": -1003, "msg": "Too many requests; simulator weight limit."}, headers
+
+        route = self.routes.get((method, path))
+        if route is None:
+            return 404, {"code": -1000, "msg": f"Unknown endpoint {method} {path}"}, headers
+        try:
+            return 200, route(params), headers
+        except _ApiError as e:
+            return e.status, e.body, headers
+        except (KeyError, ValueError) as e:
+            return 400, {"code": -1102, "msg": f"Bad parameter: {e}"}, headers
+
+    def _symbol(self, params):
+        sym = params["symbol"].upper()
+        if sym not in self.symbols:
+            raise _ApiError(400, -1121, "Invalid symbol.")
+        return sym
+
+    def _symbol_info(self, sym):
+        return {
+            "symbol": sym,
+            "status": "TRADING",
+            "baseAsset": sym[: -len(QUOTE)] if sym.endswith(QUOTE) else sym,
+            "baseAssetPrecision": 8,
+            "quoteAsset": QUOTE,
+            "quotePrecision": 8,
+            "quoteAssetPrecision": 8,
+            "orderTypes": ["LIMIT", "LIMIT_MAKER", "MARKET", "STOP_LOSS_LIMIT", "TAKE_PROFIT_LIMIT"],
+            "icebergAllowed": True,
+            "ocoAllowed": True,
+            "isSpotTradingAllowed": True,
+            "permissions": ["SPOT"],
+            "filters": [
+                {"filterType": "PRICE_FILTER", "minPrice": TICK_SIZE,
+                 "maxPrice": "1000000.00000000", "tickSize": TICK_SIZE},
+                {"filterType": "LOT_SIZE", "minQty": STEP_SIZE,
+                 "maxQty": "9000000000.00000000", "stepSize": STEP_SIZE},
+                {"filterType": "NOTIONAL", "minNotional": MIN_NOTIONAL,
+                 "applyMinToMarket": True, "avgPriceMins": 5},
+            ],
+        }
+
+    def _exchange_info(self, params):
+        if "symbol" in params:
+            symbols = [self.symbols[self._symbol(params)]]
+        elif "symbols" in params:
+            symbols = [self.symbols[self._symbol({"symbol": s})] for s in json.loads(params["symbols"])]
+        else:
+            symbols = list(self.symbols.values())
+        return {
+            "timezone": "UTC",
+            "serverTime": int(time.time() * 1000),
+            "rateLimits": [{
+                "rateLimitType": "REQUEST_WEIGHT", "interval": "MINUTE",
+                "intervalNum": 1, "limit": self.weight_limit,
+            }],
+            "symbols": symbols,
+        }
+
+    def _klines(self, params):
+        sym = self._symbol(params)
+        if params["interval"] != self.interval:
+            raise _ApiError(400, -1120, f"Simulator only serves {self.interval} klines.")
+        limit = min(int(params.get("limit", 500)), 1000)
+        times, rows = self.times[sym], self.klines[sym]
+
+        hi = len(times)
+        if "endTime" in params:
+            hi = bisect.bisect_right(times, int(params["endTime"]), 0, hi)
+        if "startTime" in params:
+            lo = bisect.bisect_left(times, int(params["startTime"]), 0, hi)
+            return rows[lo:min(hi, lo + limit)]
+        return rows[max(0, hi - limit):hi]
+
+    def _ticker_one(self, sym):
+        bars = 86_400_000 // interval_to_milliseconds(self.interval)
+        rows = self.klines[sym][-bars:]
+        last = self.last[sym]
+        if not rows:
+            return {"symbol": sym, "lastPrice": _fmt(last), "priceChangePercent": "0.000"}
+        first = float(rows[0][1])
+        volume = sum(float(r[5]) for r in rows)
+        quote = sum(float(r[7]) for r in rows)
+        return {
+            "symbol": sym,
+            "priceChange": _fmt(last - first),
+            "priceChangePercent": f"{(last / first - 1) * 100:.3f}" if first else "0.000",
+            "weightedAvgPrice": _fmt(quote / volume if volume else last),
+            "prevClosePrice": rows[0][4],
+            "lastPrice": _fmt(last),
+            "bidPrice": _fmt(last),
+            "askPrice": _fmt(last),
+            "openPrice": rows[0][1],
+            "highPrice": _fmt(max(float(r[2]) for r in rows)),
+            "lowPrice": _fmt(min(float(r[3]) for r in rows)),
+            "volume": _fmt(volume),
+            "quoteVolume": _fmt(quote),
+            "openTime": rows[0][0],
+            "closeTime": rows[-1][6],
+            "count": 0,
+        }
+
+    def _ticker(self, params):
+        if "symbol" in params:
+            return self._ticker_one(self._symbol(params))
+        return [self._ticker_one(sym) for sym in self.symbols]
+
+    def _price(self, params):
+        if "symbol" in params:
+            sym = self._symbol(params)
+            return {"symbol": sym, "price": _fmt(self.last[sym])}
+        return [{"symbol": sym, "price": _fmt(self.last[sym])} for sym in self.symbols]
+
+    def _account(self, params):
+        with self._lock:
+            balances = [
+                {"asset": asset, "free": _fmt(free), "locked": _fmt(self.locked.get(asset, 0.0))}
+                for asset, free in self.balances.items()
+            ]
+        return {
+            "makerCommission": 10, "takerCommission": 10,
+            "canTrade": True, "canWithdraw": False, "canDeposit": False,
+            "accountType": "SPOT", "balances": balances, "permissions": ["SPOT"],
+        }
+
+    # ================= ORDERS =================
+    def _new_order(self, sym, side, order_type, qty, price=0.0, stop=0.0, list_id=-1, params=None):
+        params = params or {}
+        order = {
+            "symbol": sym,
+            "orderId": next(self._order_ids),
+            "orderListId": list_id,
+            "clientOrderId": params.get("newClientOrderId", ""),
+            "transactTime": int(time.time() * 1000),
+            "price": _fmt(price),
+            "origQty": _fmt(qty),
+            "executedQty": _fmt(0),
+            "cummulativeQuoteQty": _fmt(0),
+            "status": "NEW",
+            "timeInForce": params.get("timeInForce", "GTC"),
+            "type": order_type,
+            "side": side,
+            "stopPrice": _fmt(stop),
+            "isWorking": order_type != "STOP_LOSS_LIMIT",
+            "fills": [],
+        }
+        self.orders.append(order)
+        self._by_id[order["orderId"]] = order
+        return order
+
+    def _hold(self, key, sym, side, qty, price):
+        """Lock what a resting order can spend; caller holds self._lock"""
+        asset = self.symbols[sym]["baseAsset"] if side == "SELL" else QUOTE
+        amount = qty if side == "SELL" else qty * price * (1 + self.fee_rate)
+        if self.balances[asset] < amount - 1e-12:
+            raise _ApiError(400, -2010, "Account has insufficient balance for requested action.")
+        self.balances[asset] -= amount
+        self.locked[asset] = self.locked.get(asset, 0.0) + amount
+        self._holds[key] = (asset, amount)
+
+    def _release(self, key):
+        asset, amount = self._holds.pop(key)
+        self.locked[asset] -= amount
+        self.balances[asset] += amount
+
+    def _legs(self, order):
+        if order["orderListId"] == -1:
+            return [order], ("order", order["orderId"])
+        ids = self._lists[order["orderListId"]]
+        return [self._by_id[i] for i in ids], ("list", order["orderListId"])
+
+    def _rest_order(self, order):
+        self._resting.setdefault(order["symbol"], {})[order["orderId"]] = order
+
+    def _close_legs(self, legs, status):
+        for leg in legs:
+            self._resting[leg["symbol"]].pop(leg["orderId"], None)
+            if leg["status"] in ("NEW", "PARTIALLY_FILLED"):
+                leg["status"] = status
+
+    def _fill(self, order, price):
+        """Resting order executes in full at price; other OCO legs expire"""
+        sym, qty = order["symbol"], float(order["origQty"])
+        base = self.symbols[sym]["baseAsset"]
+        cost = qty * price
+        fee = cost * self.fee_rate
+
+        legs, key = self._legs(order)
+        asset, amount = self._holds.pop(key)
+        self.locked[asset] -= amount
+        if order["side"] == "SELL":
+            self.balances[QUOTE] += cost - fee
+        else:
+            self.balances[base] += qty
+            self.balances[QUOTE] += amount - cost - fee
+
+        order.update(
+            status="FILLED", executedQty=_fmt(qty), cummulativeQuoteQty=_fmt(cost),
+            updateTime=int(time.time() * 1000),
+            fills=[{"price": _fmt(price), "qty": _fmt(qty), "commission": _fmt(fee),
+                    "commissionAsset": QUOTE, "tradeId": order["orderId"]}],
+        )
+        self._close_legs(legs, "EXPIRED")
+
+    def _match(self, sym, last):
+        with self._lock:
+            for order in list(self._resting.get(sym, {}).values()):
+                if order["status"] != "NEW":
+                    continue
+                sell = order["side"] == "SELL"
+                triggered = False
+                if not order["isWorking"]:
+                    stop = float(order["stopPrice"])
+                    if not (last <= stop if sell else last >= stop):
+                        continue
+                    order["isWorking"] = triggered = True
+
+                limit = float(order["price"])
+                if last >= limit if sell else last <= limit:
+                    # a stop that triggers into a marketable limit takes the book
+                    self._fill(order, last if triggered else limit)
+
+    def _market(self, sym, side, params):
+        base = self.symbols[sym]["baseAsset"]
+        price = self.last[sym]
+        if "quantity" in params:
+            qty = float(params["quantity"])
+        else:
+            qty = float(params["quoteOrderQty"]) / price
+        cost = qty * price
+        fee = cost * self.fee_rate
+
+        with self._lock:
+            if side == "BUY":
+                if self.balances[QUOTE] < cost + fee:
+                    raise _ApiError(400, -2010, "Account has insufficient balance for requested action.")
+                self.balances[QUOTE] -= cost + fee
+                self.balances[base] += qty
+            else:
+                if self.balances[base] < qty - 1e-12:
+                    raise _ApiError(400, -2010, "Account has insufficient balance for requested action.")
+                self.balances[base] = max(self.balances[base] - qty, 0.0)
+                self.balances[QUOTE] += cost - fee
+
+            order = self._new_order(sym, side, "MARKET", qty, params=params)
+        order.update(
+            executedQty=_fmt(qty), cummulativeQuoteQty=_fmt(cost), status="FILLED",
+            fills=[{"price": _fmt(price), "qty": _fmt(qty), "commission": _fmt(fee),
+                    "commissionAsset": QUOTE, "tradeId": order["orderId"]}],
+        )
+        return order
+
+    def _order(self, params):
+        sym = self._symbol(params)
+        side, order_type = params["side"], params["type"]
+        if order_type == "MARKET":
+            return self._market(sym, side, params)
+        if order_type not in ("LIMIT", "LIMIT_MAKER", "STOP_LOSS_LIMIT"):
+            raise _ApiError(400, -1116, "Invalid orderType.")
+
+        qty, price = float(params["quantity"]), float(params["price"])
+        stop = float(params.get("stopPrice", 0))
+        last = self.last[sym]
+        if order_type == "LIMIT_MAKER" and (last >= price if side == "SELL" else last <= price):
+            raise _ApiError(400, -2010, "Order would immediately match and take.")
+
+        with self._lock:
+            order = self._new_order(sym, side, order_type, qty, price, stop, params=params)
+            self._hold(("order", order["orderId"]), sym, side, qty, price)
+            self._rest_order(order)
+        self._match(sym, last)
+        return order
+
+    def _oco(self, params):
+        sym = self._symbol(params)
+        side = params["side"]
+        qty, price = float(params["quantity"]), float(params["price"])
+        stop, stop_limit = float(params["stopPrice"]), float(params["stopLimitPrice"])
+        last = self.last[sym]
+        if not (price > last > stop if side == "SELL" else price < last < stop):
+            raise _ApiError(400, -2010, "The relationship of the prices for the orders is not correct.")
+
+        with self._lock:
+            list_id = next(self._list_ids)
+            legs = [
+                self._new_order(sym, side, "LIMIT_MAKER", qty, price, list_id=list_id),
+                self._new_order(sym, side, "STOP_LOSS_LIMIT", qty, stop_limit, stop, list_id, params),
+            ]
+            self._lists[list_id] = [leg["orderId"] for leg in legs]
+            self._hold(("list", list_id), sym, side, qty, max(price, stop_limit))
+            for leg in legs:
+                self._rest_order(leg)
+
+        return {
+            "orderListId": list_id,
+            "contingencyType": "OCO",
+            "listStatusType": "EXEC_STARTED",
+            "listOrderStatus": "EXECUTING",
+            "listClientOrderId": params.get("listClientOrderId", ""),
+            "transactionTime": int(time.time() * 1000),
+            "symbol": sym,
+            "orders": [
+                {"symbol": sym, "orderId": leg["orderId"], "clientOrderId": leg["clientOrderId"]}
+                for leg in legs
+            ],
+            "orderReports": legs,
+        }
+
+    def _get_order(self, params):
+        sym = self._symbol(params)
+        order = self._by_id.get(int(params["orderId"]))
+        if order is None or order["symbol"] != sym:
+            raise _ApiError(400, -2013, "Order does not exist.")
+        return order
+
+    def _cancel(self, params):
+        sym = self._symbol(params)
+        order = self._by_id.get(int(params["orderId"]))
+        with self._lock:
+            if order is None or order["symbol"] != sym or order["status"] != "NEW":
+                raise _ApiError(400, -2011, "Unknown order sent.")
+            # cancelling one OCO leg cancels the whole list
+            legs, key = self._legs(order)
+            self._release(key)
+            self._close_legs(legs, "CANCELED")
+        return order
+
+    def _open_orders(self, params):
+        symbols = [self._symbol(params)] if "symbol" in params else list(self._resting)
+        return [o for sym in symbols for o in list(self._resting.get(sym, {}).values())]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local Binance stand-in for load tests")
+    parser.add_argument("--symbols", type=int, default=500, help="synthetic symbol count")
+    parser.add_argument("--recording", help="play a StreamRecorder file instead")
+    parser.add_argument("--interval", default="1m")
+    parser.add_argument("--updates", type=int, default=0, help="unclosed ticks per bar")
+    parser.add_argument("--speed", type=float, default=60.0, help="feed clock multiplier")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="seconds, uniform")
+    parser.add_argument("--weight-limit", type=int, default=6000)
+    parser.add_argument("--disconnect-every", type=float, default=0.0, help="seconds, 0 = never")
+    args = parser.parse_args()
+
+    if args.recording:
+        feed = RecordedFeed(args.recording)
+    else:
+        feed = SyntheticFeed.named(args.symbols, interval=args.interval, updates=args.updates)
+
+    sim = BinanceSimulator(
+        feed, args.host, args.port, args.speed, args.latency, args.jitter,
+        args.weight_limit, args.disconnect_every,
+    ).start()
+    try:
+        while True:
+            time.sleep(10)
+            log.info("🧪 %s", sim.stats(), extra={"event": "simulator", **sim.stats()})
+    except KeyboardInterrupt:
+        sim.stop()
@@ -0,0 +1,152 @@
+"""
+Exchange-side protective orders for open long positions.
+
+protect() rests a STOP_LOSS_LIMIT sell at the stop, or an OCO (limit
+take-profit + stop-limit) when a target is known, on the symbol's tick
+grid, so the stop holds even while this process is slow or down.
+move() only ever raises the stop: spot stops cannot be amended, so the
+order is cancelled and placed again. release() takes the protection off
+before a strategy exit and returns what the exchange already sold
+(partial fills too), so the caller books that and sells only the rest.
+"""
+from binance.exceptions import BinanceAPIException
+
+from config import config
+from exchange.binance_spot_executor import BinanceSpotExecutor
+from utils.logger import get_logger
+
+log = get_logger("stops")
+
+
+class _Protection:
+    __slots__ = ("order_ids", "qty", "stop_ticks", "target", "sold")
+
+    def __init__(self, order_ids, qty, stop_ticks, target, sold):
+        self.order_ids = order_ids
+        self.qty = qty                  # whole position
+        self.stop_ticks = stop_ticks
+        self.target = target
+        self.sold = sold                # (qty, quote) executed by replaced orders
+
+
+def _executed(orders, sold):
+    qty, quote = sold
+    for o in orders:
+        qty += float(o["executedQty"])
+        quote += float(o["cummulativeQuoteQty"])
+    return (qty, quote) if qty > 0 else None
+
+
+class StopOrderManager:
+    """executor: BinanceSpotExecutor (or anything with the same order methods)"""
+
+    def __init__(self, executor, limit_offset=0.001):
+        self.executor = executor
+        self.limit_offset = limit_offset    # stop-limit price this far below the trigger
+        self.active = {}                    # symbol -> _Protection
+
+    def protect(self, symbol, qty, stop, target=None):
+        return self._place(symbol, qty, stop, target, (0.0, 0.0))
+
+    def _place(self, symbol, qty, stop, target, sold):
+        inst = self.executor.instrument(symbol)
+        left = inst.qty(inst.steps(qty) - inst.steps(sold[0]))
+        if target is None:
+            resp = self.executor.place_stop_loss(symbol, left, stop, self.limit_offset)
+            order_ids = [resp["orderId"]]
+        else:
+            resp = self.executor.place_oco_sell(symbol, left, target, stop, self.limit_offset)
+            order_ids = [o["orderId"] for o in resp["orders"]]
+
+        self.active[symbol] = _Protection(order_ids, qty, inst.ticks(stop), target, sold)
+        log.info(
+            "🛡️ %s %s %s stop %s%s", symbol, "OCO" if target else "STOP_LOSS_LIMIT", left,
+            inst.price_str(inst.ticks(stop)),
+            f" target {inst.price_str(inst.ticks(target))}" if target else "",
+            extra={"event": "stop_order", "symbol": symbol},
+        )
+        return resp
+
+    def move(self, symbol, stop):
+        """Raise the exchange stop to `stop`; False if not higher or already filled"""
+        p = self.active.get(symbol)
+        if p is None:
+            return False
+        inst = self.executor.instrument(symbol)
+        if inst.ticks(stop) <= p.stop_ticks:
+            return False
+
+        sold = self._cancel(symbol, p) or p.sold
+        if inst.steps(sold[0]) >= inst.steps(p.qty):
+            return False    # stopped out meanwhile; filled() / release() report it
+        del self.active[symbol]
+        try:
+            # a partial fill stays sold; only the rest is protected again
+            self._place(symbol, p.qty, stop, p.target, sold)
+        except Exception:
+            log.error("❌ %s unprotected: re-placing the stop failed", symbol)
+            raise
+        return True
+
+    def filled(self, symbol):
+        """(qty, quote qty) once the exchange sold the whole position, else None"""
+        p = self.active.get(symbol)
+        fill = self._fill(symbol, p) if p is not None else None
+        if fill is None:
+            return None
+        inst = self.executor.instrument(symbol)
+        if inst.steps(fill[0]) < inst.steps(p.qty):
+            return None
+        del self.active[symbol]
+        return fill
+
+    def release(self, symbol):
+        """
+        Cancel before our own exit. Returns (qty, quote qty) the exchange
+        already sold, partial fills included, or None if nothing executed.
+        """
+        p = self.active.pop(symbol, None)
+        if p is None:
+            return None
+        try:
+            return self._cancel(symbol, p)
+        except Exception as e:
+            # spot cannot oversell: a stale stop fails once the coins are gone
+            log.warning("⚠️ %s: cancelling the stop order failed: %s", symbol, e)
+            return None
+
+    def _cancel(self, symbol, p):
+        """Executed (qty, quote) of the cancelled order(s), None if nothing sold"""
+        try:
+            # one leg cancels the whole OCO list
+            resp = self.executor.cancel_order(symbol, p.order_ids[-1])
+        except BinanceAPIException:
+            fill = self._fill(symbol, p)
+            if fill is None:
+                raise
+            return fill     # filled before the cancel got there
+
+        reports = resp.get("orderReports") or [resp]
+        if len(reports) < len(p.order_ids):
+            # the cancel only reported the leg it was sent for
+            return self._fill(symbol, p)
+        return _executed(reports, p.sold)
+
+    def _fill(self, symbol, p):
+        return _executed(
+            [self.executor.get_order(symbol, order_id) for order_id in p.order_ids], p.sold
+        )
+
+
+def order_layer(cfg=None):
+    """
+    (executor, stops) for BinanceATRBot from config: (None, None) for paper
+    trading, a BinanceSpotExecutor plus its StopOrderManager for live orders.
+    """
+    cfg = cfg or config.binance
+    if not cfg.LIVE_ORDERS:
+        return None, None
+    executor = BinanceSpotExecutor(cfg.API_KEY, cfg.SECRET_KEY, testnet=cfg.TESTNET)
+    # resting stops have to sit on the account the market orders use
+    stops = StopOrderManager(executor) if cfg.EXCHANGE_STOPS else None
+    return executor, stops
@@ -0,0 +1,102 @@
+"""
+Append-only recording of raw websocket messages.
+
+File layout: an 8-byte magic, then one frame per message:
+
+    int64 received_ns | uint32 length | compact JSON payload
+
+Frames are little-endian and never rewritten, so a file cut short by a
+crash is still readable up to the last complete frame. exchange.replay
+reads them back.
+"""
+import struct
+import threading
+import time
+
+from exchange.kline_decoder import loads
+from utils.logger import get_logger
+
+try:
+    import orjson
+
+    def dumps(msg):
+        return orjson.dumps(msg)
+
+except ImportError:  # optional: pip install orjson
+    import json
+
+    def dumps(msg):
+        return json.dumps(msg, separators=(",", ":")).encode()
+
+
+log = get_logger("recorder")
+
+MAGIC = b"KLREC01\n"
+FRAME = struct.Struct("<qI")
+
+
+class StreamRecorder:
+    """
+    Thread-safe: socket callbacks of several connections may write at once.
+    Writes go to a userspace buffer; flushed every `flush_seconds` and on close.
+    """
+
+    def __init__(self, path, closed_only=False, flush_seconds=1.0):
+        self.path = path
+        self.closed_only = closed_only
+        self.flush_seconds = flush_seconds
+        self.count = 0
+
+        self._lock = threading.Lock()
+        self._file = open(path, "ab")
+        if self._file.tell() == 0:
+            self._file.write(MAGIC)
+        self._flushed = time.monotonic()
+
+    def write(self, received_ns, msg):
+        if self.closed_only and not msg.get("k", {}).get("x"):
+            return
+
+        payload = dumps(msg)
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(FRAME.pack(received_ns, len(payload)))
+            self._file.write(payload)
+            self.count += 1
+
+            now = time.monotonic()
+            if now - self._flushed >= self.flush_seconds:
+                self._file.flush()
+                self._flushed = now
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        log.info("💾 %d messages recorded to %s", self.count, self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_frames(path):
+    """Yield (received_ns, msg) in recorded order; stops at a truncated tail"""
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path}: not a stream recording")
+
+        while True:
+            head = f.read(FRAME.size)
+            if len(head) < FRAME.size:
+                return
+            received_ns, length = FRAME.unpack(head)
+            payload = f.read(length)
+            if len(payload) < length:
+                log.warning("⚠️ %s: truncated last frame ignored", path)
+                return
+            yield received_ns, loads(payload)
@@ -1,11 +1,12 @@
 import os
 import json
 import pandas as pd
-import ta
 import websocket
 from binance.client import Client
 from dotenv import load_dotenv
 
+from strategy.rsi_macd_atr import RsiMacdAtrStrategy
+
 # ================= LOAD ENV =================
 load_dotenv()
 API_KEY = os.getenv("BINANCE_API_KEY")
@@ -23,35 +24,23 @@ FEE_PCT = 0.001
 
 ATR_PERIOD = 14
 ATR_MULT = 1.0
+STRATEGY = RsiMacdAtrStrategy(atr_period=ATR_PERIOD, atr_mult=ATR_MULT)
 
 # ================= CLIENT =================
 client = Client(API_KEY, API_SECRET)
 
 # ================= STATE =================
-df = pd.DataFrame()
 balance = INITIAL_BALANCE
 qty = 0.0
 entry = 0.0
 sl = 0.0
 
 # ================= HELPERS =================
-def add_indicators(df):
-    df["rsi6"] = ta.momentum.RSIIndicator(df["close"], 6).rsi()
-    macd = ta.trend.MACD(df["close"])
-    df["dif"] = macd.macd()
-    df["dea"] = macd.macd_signal()
-    df["dif_prev"] = df["dif"].shift(1)
-    df["dea_prev"] = df["dea"].shift(1)
-    df["atr"] = ta.volatility.AverageTrueRange(
-        df["high"], df["low"], df["close"], ATR_PERIOD
-    ).average_true_range()
-    return df
-
 def place_buy(price, atr):
     global qty, entry, sl, balance
 
     entry = price
-    sl = entry - atr * ATR_MULT
+    sl = STRATEGY.stop_price(entry, atr)
 
     risk_amt = balance * RISK_PER_TRADE
     qty = min(
@@ -84,7 +73,7 @@ def place_sell(price):
 
 # ================= WS CALLBACK =================
 def on_message(ws, message):
-    global df, qty
+    global qty
 
     msg = json.loads(message)
     k = msg["k"]
@@ -102,34 +91,22 @@ def on_message(ws, message):
         "volume": float(k["v"]),
     }
 
-    df = pd.concat([df, pd.DataFrame([candle])], ignore_index=True)
-    df = add_indicators(df)
+    # O(1) per candle: indicator state is updated, nothing is recomputed
+    row = STRATEGY.on_bar(candle)
 
-    if len(df) < 50:
+    if not STRATEGY.ready:
         return
 
-    row = df.iloc[-1]
-
     # ===== ENTRY =====
     if qty == 0:
-        if (
-            row["rsi6"] > 30
-            and row["dif_prev"] < row["dea_prev"]
-            and row["dif"] > row["dea"]
-        ):
+        if row["entry"]:
             place_buy(row["close"], row["atr"])
 
     # ===== EXIT =====
     else:
-        if row["low"] <= sl:
-            place_sell(sl)
-
-        elif (
-            row["rsi6"] < 60
-            and row["dif_prev"] > row["dea_prev"]
-            and row["dif"] < row["dea"]
-        ):
-            place_sell(row["close"])
+        price = STRATEGY.exit_price(row, sl)
+        if price is not None:
+            place_sell(price)
 
 def on_open(ws):
     print("✅ WebSocket Connected")
@@ -1,9 +1,8 @@
-import pandas as pd
 import numpy as np
 from binance.client import Client
-from decimal import Decimal, getcontext
-
-getcontext().prec = 28
+from exchange.kline_cache import KlineCache
+from trading.ledger import Instrument, Ledger
+from utils.timeframe import align
 
 # ================= CONFIG =================
 SYMBOL = "PEPEUSDT"
@@ -15,20 +14,23 @@ SLOW = 26
 SIGNAL = 9
 
 ATR_PERIOD = 14
-ATR_MULTIPLIER = Decimal("3.5")
+ATR_MULTIPLIER = 3.5
 
-TP1_ATR = Decimal("2.0")
-TP2_ATR = Decimal("4.5")
-TP1_RATIO = Decimal("0.5")
+TP1_ATR = 2.0
+TP2_ATR = 4.5
+TP1_RATIO = 0.5
 
-RISK_PERCENT = Decimal("0.01")
-FEE_RATE = Decimal("0.001")
+RISK_PERCENT = 0.01
+FEE_RATE = "0.001"
 
-START_BALANCE = Decimal("10000")
+START_BALANCE = 10000
 COOLDOWN_BARS = 30   # 30 minutes
 
 # ================= CLIENT =================
-client = Client()
+CACHE = KlineCache()
+
+# PRICE_FILTER / LOT_SIZE / NOTIONAL as the exchange has them today
+INSTRUMENT = Instrument.from_symbol_info(Client().get_symbol_info(SYMBOL))
 
 # ================= HELPERS =================
 def ema(series, period):
@@ -36,20 +38,16 @@ def ema(series, period):
 
 # ================= LOAD DATA =================
 def load_klines(interval):
-    klines = client.get_historical_klines(
-        SYMBOL, interval, START, END
-    )
-    df = pd.DataFrame(klines, columns=[
-        "time","o","h","l","c","v",
-        "_","_","_","_","_","_"
-    ])
-    df["time"] = pd.to_datetime(df["time"], unit="ms")
-    df[["o","h","l","c"]] = df[["o","h","l","c"]].astype(float)
+    df = CACHE.frame(SYMBOL, interval, START, END)
+    df = df.rename(columns={"open": "o", "high": "h", "low": "l", "close": "c"})
     return df[["time","o","h","l","c"]]
 
+TREND_INTERVAL = Client.KLINE_INTERVAL_4HOUR
+EXEC_INTERVAL = Client.KLINE_INTERVAL_15MINUTE
+
 print("📥 Loading data...")
-df15 = load_klines(Client.KLINE_INTERVAL_4HOUR)
-df1  = load_klines(Client.KLINE_INTERVAL_15MINUTE)
+df15 = load_klines(TREND_INTERVAL)
+df1  = load_klines(EXEC_INTERVAL)
 
 # ================= INDICATORS =================
 # ---- 15m trend ----
@@ -81,67 +79,72 @@ tr = np.maximum(
 )
 df1["atr"] = tr.rolling(ATR_PERIOD).mean()
 
+# ---- trend of the last *closed* higher-timeframe candle, per execution bar ----
+df1["trend"] = align(
+    df1["time"], EXEC_INTERVAL, df15["time"], TREND_INTERVAL, df15[["trend"]]
+)["trend"]
+
 # ================= BACKTEST =================
-balance = START_BALANCE
-equity = START_BALANCE
-peak = START_BALANCE
-max_dd = Decimal("0")
+# money is exact integer ticks / steps / quote units; signals stay float
+ledger = Ledger(START_BALANCE, FEE_RATE)
+inst = INSTRUMENT
+
+close_t = inst.ticks(df1["c"].to_numpy())
+atr_t = df1["atr"].to_numpy() * inst.ticks(1.0)     # ATR in (fractional) ticks
+dif = df1["dif"].to_numpy()
+dea = df1["dea"].to_numpy()
+trend = df1["trend"].to_numpy()
+
+peak = ledger.units
+max_dd = 0.0
 
 in_pos = False
-entry = Decimal("0")
-qty = Decimal("0")
-stop = Decimal("0")
+entry = 0
+stop = 0
 tp1_hit = False
 cooldown = 0
 
 trades = wins = losses = 0
-gross_profit = Decimal("0")
-gross_loss = Decimal("0")
+gross_profit = 0
+gross_loss = 0
 
-i15 = 0
 
 print("🚀 Starting backtest...")
 
 for i in range(2, len(df1)):
-    row = df1.iloc[i]
-
     if cooldown > 0:
         cooldown -= 1
         continue
 
-    # ---- sync 15m ----
-    while i15 + 1 < len(df15) and df15.iloc[i15 + 1]["time"] <= row["time"]:
-        i15 += 1
-
-    if i15 >= len(df15) or not df15.iloc[i15]["trend"]:
+    if not trend[i]:
         continue
 
-    if np.isnan(row["atr"]):
+    if np.isnan(atr_t[i]):
         continue
 
-    price = Decimal(str(row["c"]))
-    atr = Decimal(str(row["atr"]))
-
-    prev1 = df1.iloc[i - 1]
+    price = int(close_t[i])
+    atr = atr_t[i]
 
     # ================= ENTRY (FIXED & STRONG) =================
-    dif_slope = row["dif"] - prev1["dif"]
-    hist_now = row["dif"] - row["dea"]
-    hist_prev = prev1["dif"] - prev1["dea"]
+    dif_slope = dif[i] - dif[i - 1]
+    hist_now = dif[i] - dea[i]
+    hist_prev = dif[i - 1] - dea[i - 1]
 
     entry_signal = (
-        prev1["dif"] <= prev1["dea"] and      # real cross
-        row["dif"] > row["dea"] and
-        row["dif"] > 0 and row["dea"] > 0 and # strong zone
+        dif[i - 1] <= dea[i - 1] and          # real cross
+        dif[i] > dea[i] and
+        dif[i] > 0 and dea[i] > 0 and         # strong zone
         dif_slope > abs(hist_prev) * 0.5 and  # momentum expansion
         hist_now > hist_prev                  # histogram growing
     )
 
     if not in_pos and entry_signal:
-        risk = balance * RISK_PERCENT
-        stop_dist = atr * ATR_MULTIPLIER
-        qty = risk / stop_dist
+        stop_dist = int(np.ceil(atr * ATR_MULTIPLIER))
+        steps = ledger.size(inst, price, price - stop_dist, RISK_PERCENT)
+        if steps <= 0:
+            continue
 
+        ledger.open(inst, price, steps)
         entry = price
         stop = entry - stop_dist
         tp1_hit = False
@@ -152,48 +155,27 @@ for i in range(2, len(df1)):
         continue
 
     # ================= EXITS =================
+    closed = None
+
     # TP1
     if not tp1_hit and price >= entry + atr * TP1_ATR:
-        sell_qty = qty * TP1_RATIO
-        pnl = (price - entry) * sell_qty
-        fee = price * sell_qty * FEE_RATE
-        net = pnl - fee
-
-        balance += net
-        equity += net
-        qty -= sell_qty
+        sell_steps = int(ledger.held(SYMBOL) * TP1_RATIO)
+        if sell_steps > 0:
+            ledger.close(inst, price, sell_steps)
         tp1_hit = True
         stop = entry  # breakeven
 
     # TP2
     elif tp1_hit and price >= entry + atr * TP2_ATR:
-        pnl = (price - entry) * qty
-        fee = price * qty * FEE_RATE
-        net = pnl - fee
-
-        balance += net
-        equity += net
-
-        trades += 1
-        if net > 0:
-            wins += 1
-            gross_profit += net
-        else:
-            losses += 1
-            gross_loss += abs(net)
-
-        in_pos = False
-        cooldown = COOLDOWN_BARS
+        closed = ledger.close(inst, price)
 
     # STOP
     elif price <= stop:
-        pnl = (price - entry) * qty
-        fee = price * qty * FEE_RATE
-        net = pnl - fee
-
-        balance += net
-        equity += net
+        closed = ledger.close(inst, price)
 
+    if closed is not None:
+        pnl, fee = closed
+        net = pnl - fee
         trades += 1
         if net > 0:
             wins += 1
@@ -205,19 +187,20 @@ for i in range(2, len(df1)):
         in_pos = False
         cooldown = COOLDOWN_BARS
 
-    peak = max(peak, equity)
-    max_dd = max(max_dd, (peak - equity) / peak)
+    peak = max(peak, ledger.units)
+    max_dd = max(max_dd, (peak - ledger.units) / peak)
 
 # ================= REPORT =================
 profit_factor = (
     gross_profit / gross_loss
-    if gross_loss > 0 else Decimal("0")
+    if gross_loss > 0 else 0
 )
 
 print("\n====== BACKTEST RESULT ======")
 print(f"Trades        : {trades}")
 print(f"Win Rate (%)  : {round((wins / trades) * 100, 2) if trades else 0}")
-print(f"Net PnL       : {round(equity - START_BALANCE, 2)} USDT")
+print(f"Net PnL       : {ledger.balance - START_BALANCE:.2f} USDT")
+print(f"Fees          : {ledger.to_quote(ledger.fees):.2f} USDT")
 print(f"Max Drawdown  : {round(max_dd * 100, 2)}%")
-print(f"Profit Factor : {round(profit_factor, 2)}")
+print(f"Profit Factor : {profit_factor:.2f}")
 print("============================")
@@ -1,7 +1,7 @@
-import pandas as pd
 import numpy as np
 from binance.client import Client
-import ta
+from exchange.kline_cache import KlineCache
+from strategy.rsi_macd_atr import RsiMacdAtrStrategy
 
 # ================= CONFIG =================
 SYMBOL = "PEPEUSDT"
@@ -11,54 +11,20 @@ END_DATE   = "1 Jan 2026"
 
 INITIAL_BALANCE = 10_000.0
 FEE_PCT = 0.001        # 0.1% Binance spot fee
+
+# RSI(6) + MACD(12,26,9) entry / exit; no ATR stop in this script
+STRATEGY = RsiMacdAtrStrategy()
 # ==========================================
 
-client = Client()  # no API key needed for historical data
+CACHE = KlineCache()
 
 
 # ================= DATA =================
 def fetch_data():
-    klines = client.get_historical_klines(
-        SYMBOL, INTERVAL, START_DATE, END_DATE
-    )
-
-    df = pd.DataFrame(klines, columns=[
-        "time","open","high","low","close","volume",
-        "_","_","_","_","_","_"
-    ])
-
-    df = df[["time","open","high","low","close","volume"]]
-    df["time"] = pd.to_datetime(df["time"], unit="ms")
-    df[["open","high","low","close","volume"]] = df[
-        ["open","high","low","close","volume"]
-    ].astype(float)
-
-    return df
+    return CACHE.frame(SYMBOL, INTERVAL, START_DATE, END_DATE)
 
 
 # ================= INDICATORS =================
-def add_indicators(df):
-    # RSI(6)
-    df["rsi6"] = ta.momentum.RSIIndicator(
-        close=df["close"], window=6
-    ).rsi()
-
-    # MACD (DIF & DEA)
-    macd = ta.trend.MACD(
-        close=df["close"],
-        window_slow=26,
-        window_fast=12,
-        window_sign=9
-    )
-    df["dif"] = macd.macd()
-    df["dea"] = macd.macd_signal()
-
-    # Previous values for crossover detection
-    df["dif_prev"] = df["dif"].shift(1)
-    df["dea_prev"] = df["dea"].shift(1)
-
-    return df
-
 
 # ================= BACKTEST =================
 def backtest(df):
@@ -73,11 +39,7 @@ def backtest(df):
 
         # ================= BUY =================
         if position_qty == 0:
-            buy_signal = (
-                row["rsi6"] > 30
-                and row["dif_prev"] < row["dea_prev"]
-                and row["dif"] > row["dea"]
-            )
+            buy_signal = row["entry"]
 
             if buy_signal:
                 entry_price = row["close"]
@@ -88,11 +50,7 @@ def backtest(df):
 
         # ================= SELL =================
         else:
-            sell_signal = (
-                row["rsi6"] < 60
-                and row["dif_prev"] > row["dea_prev"]
-                and row["dif"] < row["dea"]
-            )
+            sell_signal = row["exit"]
 
             if sell_signal:
                 exit_price = row["close"]
@@ -112,7 +70,7 @@ def backtest(df):
 
 # ================= RUN =================
 df = fetch_data()
-df = add_indicators(df)
+df = STRATEGY.add_indicators(df)
 
 final_balance, trades = backtest(df)
 
@@ -1,6 +1,8 @@
-import pandas as pd
 import numpy as np
+import pandas as pd
 from binance.client import Client
+from backtest.panel import PricePanel
+from exchange.kline_cache import KlineCache
 import ta
 
 # ===================== CONFIG =====================
@@ -24,27 +26,7 @@ COOLDOWN_CANDLES = 5
 MIN_CANDLES = 100
 # ==================================================
 
-client = Client()
-
-
-# ===================== DATA =====================
-def fetch_data(symbol):
-    klines = client.get_historical_klines(
-        symbol, INTERVAL, START_DATE, END_DATE
-    )
-
-    df = pd.DataFrame(klines, columns=[
-        "time", "open", "high", "low", "close", "volume",
-        "_", "_", "_", "_", "_", "_"
-    ])
-
-    df = df[["time", "open", "high", "low", "close", "volume"]]
-    df["time"] = pd.to_datetime(df["time"], unit="ms")
-    df[["open", "high", "low", "close", "volume"]] = df[
-        ["open", "high", "low", "close", "volume"]
-    ].astype(float)
-
-    return df
+CACHE = KlineCache()
 
 
 # ===================== INDICATORS =====================
@@ -69,99 +51,79 @@ def add_indicators(df):
 
 
 # ===================== LOAD ALL SYMBOLS =====================
-market_data = {}
-
-for symbol in SYMBOLS:
-    df = fetch_data(symbol)
-    df = add_indicators(df)
-    market_data[symbol] = df
+PANEL = PricePanel.from_cache(CACHE, SYMBOLS, INTERVAL, START_DATE, END_DATE)
+# indicators per coin on its own candles, scattered back onto the shared axis
+market_data = PANEL.compute(lambda s: add_indicators(pd.DataFrame(s)))
 
 
 # ===================== BACKTEST =====================
+def entry_signals(data):
+    """time x symbol entry mask for the whole panel; NaN compares False"""
+    return (
+        (data["ema20"] > data["ema50"])
+        & (data["volume"] > data["vol_ma"])
+        & (data["adx"] > ADX_MIN)
+        & (data["rsi_prev"] < 50)
+        & (data["rsi"] >= 50)
+    )
+
+
 def portfolio_backtest(data):
     balance = INITIAL_BALANCE
+    n = len(SYMBOLS)
 
-    positions = {
-        s: {
-            "qty": 0.0,
-            "entry": 0.0,
-            "sl": 0.0,
-            "tp": 0.0,
-            "cooldown": 0
-        } for s in SYMBOLS
-    }
+    # position state as arrays over symbols, same order as the panel columns
+    qty = np.zeros(n)
+    entry = np.zeros(n)
+    sl = np.zeros(n)
+    tp = np.zeros(n)
+    cooldown = np.zeros(n, dtype=np.int64)
 
     trades = []
     equity_curve = []
 
-    # assume all data aligned by index (1H candles)
-    max_len = min(len(df) for df in data.values())
-
-    for i in range(MIN_CANDLES, max_len):
-        for symbol in SYMBOLS:
-            row = data[symbol].iloc[i]
-            pos = positions[symbol]
-
-            # ===== cooldown =====
-            if pos["cooldown"] > 0:
-                pos["cooldown"] -= 1
-                continue
-
-            # ===== ENTRY =====
-            if pos["qty"] == 0:
-                if (
-                    row["ema20"] > row["ema50"]
-                    and row["volume"] > row["vol_ma"]
-                    and row["adx"] > ADX_MIN
-                    and row["rsi_prev"] < 50 <= row["rsi"]
-                ):
-                    entry = row["close"]
-                    atr = row["atr"]
-
-                    sl = entry - (atr * SL_ATR_MULT)
-                    tp = entry + (atr * TP_ATR_MULT)
-
-                    risk_amount = balance * RISK_PER_TRADE
-                    risk_per_unit = entry - sl
-                    qty = risk_amount / risk_per_unit
-
-                    max_qty = balance / entry
-                    qty = min(qty, max_qty)
-
-                    fee = qty * entry * FEE_PCT
-                    balance -= fee
-
-                    pos.update({
-                        "qty": qty,
-                        "entry": entry,
-                        "sl": sl,
-                        "tp": tp
-                    })
-
-            # ===== EXIT =====
+    close, high, low, atr = PANEL["close"], PANEL["high"], PANEL["low"], data["atr"]
+    signal = entry_signals(data)
+    # each coin warms up on its own candles: a late listing waits MIN_CANDLES bars
+    ready = PANEL.valid & (np.cumsum(PANEL.valid, axis=0) > MIN_CANDLES)
+
+    for i in range(MIN_CANDLES, len(PANEL)):
+        # ===== cooldown: every own bar of a cooling coin counts down =====
+        cooling = ready[i] & (cooldown > 0)
+        cooldown[cooling] -= 1
+        active = ready[i] & ~cooling
+
+        # ===== whole cross-section at once =====
+        held = active & (qty > 0)
+        stop_hit = held & (low[i] <= sl)
+        tp_hit = held & ~stop_hit & (high[i] >= tp)
+        exit_price = np.where(stop_hit, sl, tp)
+        exiting = (stop_hit | tp_hit) & (exit_price != 0)
+        entering = active & (qty == 0) & signal[i]
+
+        # balance is shared: only the coins with an event are booked, in column order
+        for j in np.flatnonzero(exiting | entering):
+            if entering[j]:
+                price = close[i, j]
+                stop = price - (atr[i, j] * SL_ATR_MULT)
+
+                risk_amount = balance * RISK_PER_TRADE
+                risk_per_unit = price - stop
+                q = min(risk_amount / risk_per_unit, balance / price)
+
+                balance -= q * price * FEE_PCT
+                qty[j], entry[j], sl[j] = q, price, stop
+                tp[j] = price + (atr[i, j] * TP_ATR_MULT)
             else:
-                exit_price = None
-
-                if row["low"] <= pos["sl"]:
-                    exit_price = pos["sl"]
-                elif row["high"] >= pos["tp"]:
-                    exit_price = pos["tp"]
-
-                if exit_price:
-                    pnl = pos["qty"] * (exit_price - pos["entry"])
-                    fee = pos["qty"] * exit_price * FEE_PCT
-                    net_pnl = pnl - fee
-
-                    balance += net_pnl
-                    trades.append(net_pnl)
-
-                    pos.update({
-                        "qty": 0.0,
-                        "entry": 0.0,
-                        "sl": 0.0,
-                        "tp": 0.0,
-                        "cooldown": COOLDOWN_CANDLES
-                    })
+                pnl = qty[j] * (exit_price[j] - entry[j])
+                fee = qty[j] * exit_price[j] * FEE_PCT
+                net_pnl = pnl - fee
+
+                balance += net_pnl
+                trades.append(net_pnl)
+
+                qty[j] = entry[j] = sl[j] = tp[j] = 0.0
+                cooldown[j] = COOLDOWN_CANDLES
 
         equity_curve.append(balance)
 
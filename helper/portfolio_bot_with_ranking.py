@@ -1,8 +1,9 @@
-import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta, timezone
 from binance.client import Client
-import ta
+from exchange.kline_cache import KlineCache
+from backtest.engine import run_backtest
+from strategy.rsi_macd_atr import RsiMacdAtrStrategy
 
 # ================= CONFIG =================
 SYMBOLS = ["PEPEUSDT", "DOGEUSDT", "SHIBUSDT", "FLOKIUSDT"]
@@ -17,11 +18,12 @@ FEE_PCT = 0.001
 
 ATR_PERIOD = 14
 ATR_MULT = 2.0
+STRATEGY = RsiMacdAtrStrategy(atr_period=ATR_PERIOD, atr_mult=ATR_MULT)
 
 MAX_OPEN_TRADES = 1          # meme-coin safety
 # ==========================================
 
-client = Client()
+CACHE = KlineCache()
 
 END_DATE = datetime.now(timezone.utc)
 START_DATE = END_DATE - timedelta(days=LOOKBACK_MONTHS * 30)
@@ -29,91 +31,19 @@ START_DATE = END_DATE - timedelta(days=LOOKBACK_MONTHS * 30)
 
 # ================= DATA =================
 def fetch_data(symbol):
-    klines = client.get_historical_klines(
+    return CACHE.frame(
         symbol,
         INTERVAL,
         START_DATE.strftime("%d %b %Y"),
-        END_DATE.strftime("%d %b %Y")
+        END_DATE.strftime("%d %b %Y"),
     )
 
-    df = pd.DataFrame(klines, columns=[
-        "time","open","high","low","close","volume",
-        "_","_","_","_","_","_"
-    ])
-
-    df = df[["time","open","high","low","close","volume"]]
-    df["time"] = pd.to_datetime(df["time"], unit="ms")
-    df[["open","high","low","close","volume"]] = df[
-        ["open","high","low","close","volume"]
-    ].astype(float)
-
-    return df
-
-
-def add_indicators(df):
-    df["rsi6"] = ta.momentum.RSIIndicator(df["close"], 6).rsi()
-
-    macd = ta.trend.MACD(df["close"])
-    df["dif"] = macd.macd()
-    df["dea"] = macd.macd_signal()
-    df["dif_prev"] = df["dif"].shift(1)
-    df["dea_prev"] = df["dea"].shift(1)
-
-    df["atr"] = ta.volatility.AverageTrueRange(
-        df["high"], df["low"], df["close"], ATR_PERIOD
-    ).average_true_range()
-
-    return df
-
 
 # ================= STRATEGY (SINGLE COIN) =================
 def backtest_single_coin(df):
-    balance = INITIAL_BALANCE
-    qty = entry = sl = 0.0
-    trades = []
-    equity = []
-
-    for i in range(50, len(df)):
-        row = df.iloc[i]
-
-        if qty == 0:
-            if (
-                row["rsi6"] > 30
-                and row["dif_prev"] < row["dea_prev"]
-                and row["dif"] > row["dea"]
-            ):
-                entry = row["close"]
-                sl = entry - row["atr"] * ATR_MULT
-
-                risk_amt = balance * RISK_PER_TRADE
-                qty = min(
-                    risk_amt / (entry - sl),
-                    balance / entry
-                )
-                balance -= qty * entry * FEE_PCT
-
-        else:
-            exit_price = None
-
-            if row["low"] <= sl:
-                exit_price = sl
-            elif (
-                row["rsi6"] < 60
-                and row["dif_prev"] > row["dea_prev"]
-                and row["dif"] < row["dea"]
-            ):
-                exit_price = row["close"]
-
-            if exit_price:
-                pnl = qty * (exit_price - entry)
-                balance += pnl
-                balance -= qty * exit_price * FEE_PCT
-                trades.append(pnl)
-                qty = 0
-
-        equity.append(balance)
-
-    return balance, trades, equity
+    # array engine: same trades / balance / equity as the old iloc loop
+    res = run_backtest(df, INITIAL_BALANCE, RISK_PER_TRADE, FEE_PCT, ATR_MULT)
+    return res.balance, res.pnl.tolist(), res.equity
 
 
 # ================= ELIGIBILITY =================
@@ -122,8 +52,11 @@ market = {}
 
 print("\n===== ROLLING 6-MONTH ELIGIBILITY =====")
 
+CACHE.prefetch(
+    SYMBOLS, INTERVAL, START_DATE.strftime("%d %b %Y"), END_DATE.strftime("%d %b %Y")
+)
 for sym in SYMBOLS:
-    df = add_indicators(fetch_data(sym))
+    df = STRATEGY.add_indicators(fetch_data(sym))
     market[sym] = df
 
     final_balance, trades, equity = backtest_single_coin(df)
@@ -186,53 +119,13 @@ print("=======================================\n")
 
 # ================= FINAL PORTFOLIO =================
 def trade_top_coin(df):
-    balance = INITIAL_BALANCE
-    qty = entry = sl = 0.0
-    equity = []
-
-    for i in range(50, len(df)):
-        row = df.iloc[i]
-
-        if qty == 0:
-            if (
-                row["rsi6"] > 30
-                and row["dif_prev"] < row["dea_prev"]
-                and row["dif"] > row["dea"]
-            ):
-                entry = row["close"]
-                sl = entry - row["atr"] * ATR_MULT
-
-                risk_amt = balance * RISK_PER_TRADE
-                qty = min(
-                    risk_amt / (entry - sl),
-                    balance / entry
-                )
-                balance -= qty * entry * FEE_PCT
-
-        else:
-            exit_price = None
-
-            if row["low"] <= sl:
-                exit_price = sl
-            elif (
-                row["rsi6"] < 60
-                and row["dif_prev"] > row["dea_prev"]
-                and row["dif"] < row["dea"]
-            ):
-                exit_price = row["close"]
-
-            if exit_price:
-                balance += qty * (exit_price - entry)
-                balance -= qty * exit_price * FEE_PCT
-                qty = 0
-
-        equity.append(balance)
+    res = run_backtest(df, INITIAL_BALANCE, RISK_PER_TRADE, FEE_PCT, ATR_MULT)
 
-    equity = np.array(equity)
+    equity = res.equity
     peak = np.maximum.accumulate(equity)
     max_dd = ((equity - peak) / peak).min() * 100
 
-    return balance, max_dd
+    return res.balance, max_dd
 
 
 # ================= RUN =================
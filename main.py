@@ -1,7 +1,11 @@
 from exchange.binance_main_bot import BinanceATRBot
+from exchange.stop_orders import order_layer
 
 if __name__ == "__main__":
+    executor, stops = order_layer()
     bot = BinanceATRBot(
-        symbols=["PEPEUSDT", "DOGEUSDT", "SHIBUSDT", "FLOKIUSDT"]
+        symbols=["PEPEUSDT", "DOGEUSDT", "SHIBUSDT", "FLOKIUSDT"],
+        executor=executor,
+        stops=stops,
     )
     bot.start()
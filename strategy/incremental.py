@@ -0,0 +1,152 @@
+import math
+
+import numpy as np
+
+
+# ================= RECURSIONS =================
+class EWMState:
+    """
+    One step of pandas ewm(adjust=False).mean() per observation.
+    Same arithmetic as pandas, so values match ta bit-for-bit.
+    """
+
+    __slots__ = ("alpha", "min_periods", "value", "nobs")
+
+    def __init__(self, alpha, min_periods):
+        # pandas converts span / alpha to center-of-mass and back
+        self.alpha = 1.0 / (1.0 + (1.0 - alpha) / alpha)
+        self.min_periods = min_periods
+        self.value = math.nan
+        self.nobs = 0
+
+    @classmethod
+    def from_span(cls, span, min_periods=None):
+        alpha = 1.0 / (1.0 + (span - 1) / 2.0)
+        return cls(alpha, span if min_periods is None else min_periods)
+
+    def update(self, x):
+        # leading NaNs (e.g. MACD before the slow EMA is ready) are skipped
+        if x != x:
+            return self.current
+
+        self.nobs += 1
+        if self.value != self.value:
+            self.value = x
+        elif self.value != x:
+            old_wt = 1.0 - self.alpha
+            self.value = (old_wt * self.value + self.alpha * x) / (old_wt + self.alpha)
+
+        return self.current
+
+    @property
+    def current(self):
+        return self.value if self.nobs >= self.min_periods else math.nan
+
+
+class RSIState:
+    """Wilder RSI, same as ta.momentum.RSIIndicator"""
+
+    __slots__ = ("up", "down", "prev_close")
+
+    def __init__(self, window=14):
+        self.up = EWMState(1.0 / window, window)
+        self.down = EWMState(1.0 / window, window)
+        self.prev_close = math.nan
+
+    def update(self, close):
+        diff = close - self.prev_close
+        self.prev_close = close
+
+        # ta turns the first (NaN) diff into 0.0 for both legs
+        up = self.up.update(diff if diff > 0 else 0.0)
+        down = self.down.update(-diff if diff < 0 else -0.0)
+
+        if down == 0:
+            return 100.0
+        return 100 - (100 / (1 + up / down))
+
+
+class MACDState:
+    """DIF / DEA, same as ta.trend.MACD (macd / macd_signal)"""
+
+    __slots__ = ("fast", "slow", "signal")
+
+    def __init__(self, window_fast=12, window_slow=26, window_sign=9):
+        self.fast = EWMState.from_span(window_fast)
+        self.slow = EWMState.from_span(window_slow)
+        self.signal = EWMState.from_span(window_sign)
+
+    def update(self, close):
+        dif = self.fast.update(close) - self.slow.update(close)
+        dea = self.signal.update(dif)
+        return dif, dea
+
+
+class ATRState:
+    """Wilder ATR, same as ta.volatility.AverageTrueRange (0.0 while warming up)"""
+
+    __slots__ = ("window", "value", "prev_close", "seed", "count")
+
+    def __init__(self, window=14):
+        self.window = window
+        self.value = 0.0
+        self.prev_close = math.nan
+        self.seed = []
+        self.count = 0
+
+    def update(self, high, low, close):
+        tr = high - low
+        if self.prev_close == self.prev_close:
+            tr = max(tr, abs(high - self.prev_close), abs(low - self.prev_close))
+        self.prev_close = close
+        self.count += 1
+
+        if self.count < self.window:
+            self.seed.append(tr)
+        elif self.count == self.window:
+            self.seed.append(tr)
+            self.value = float(np.array(self.seed).sum()) / self.window
+            self.seed = None
+        else:
+            self.value = (self.value * (self.window - 1) + tr) / float(self.window)
+
+        return self.value
+
+
+# ================= ENGINE =================
+INDICATOR_FIELDS = ("rsi6", "dif", "dea", "dif_prev", "dea_prev", "atr")
+
+
+class IncrementalIndicators:
+    """
+    Streaming RSI(6) / MACD / ATR for one symbol.
+    Every update is O(1); values equal the ta columns used by add_indicators.
+    """
+
+    def __init__(self, atr_period=14, rsi_period=6):
+        self.rsi = RSIState(rsi_period)
+        self.macd = MACDState()
+        self.atr = ATRState(atr_period)
+
+        self.count = 0
+        self.values = dict.fromkeys(INDICATOR_FIELDS, math.nan)
+        self.values["atr"] = 0.0
+
+    def update(self, high, low, close):
+        v = self.values
+        dif, dea = self.macd.update(close)
+
+        v["dif_prev"] = v["dif"]
+        v["dea_prev"] = v["dea"]
+        v["rsi6"] = self.rsi.update(close)
+        v["dif"] = dif
+        v["dea"] = dea
+        v["atr"] = self.atr.update(high, low, close)
+
+        self.count += 1
+        return v
+
+    def warm(self, highs, lows, closes):
+        for h, l, c in zip(highs, lows, closes):
+            self.update(h, l, c)
+        return self.values
@@ -0,0 +1,137 @@
+import numpy as np
+import pandas as pd
+import ta
+
+from strategy.incremental import IncrementalIndicators
+
+
+# ================= KERNELS =================
+# Shared by the vectorized and the incremental paths. Written with & / <
+# so the same code works on scalars and on whole NumPy arrays; NaN
+# comparisons are False, exactly like the old `and` chains.
+def entry_signal(rsi6, dif, dea, dif_prev, dea_prev, rsi_entry=30):
+    return (rsi6 > rsi_entry) & (dif_prev < dea_prev) & (dif > dea)
+
+
+def exit_signal(rsi6, dif, dea, dif_prev, dea_prev, rsi_exit=60):
+    return (rsi6 < rsi_exit) & (dif_prev > dea_prev) & (dif < dea)
+
+
+# ================= VECTORIZED INDICATORS =================
+# One function per indicator so a sweep can cache each by its own period;
+# inputs are float pd.Series, outputs NumPy arrays.
+def rsi(close, period):
+    return ta.momentum.RSIIndicator(close, period).rsi().to_numpy()
+
+
+def macd(close):
+    """MACD(12, 26, 9): dif / dea and their previous values"""
+    m = ta.trend.MACD(close)
+    dif = m.macd()
+    dea = m.macd_signal()
+    return {
+        "dif": dif.to_numpy(),
+        "dea": dea.to_numpy(),
+        "dif_prev": dif.shift(1).to_numpy(),
+        "dea_prev": dea.shift(1).to_numpy(),
+    }
+
+
+def atr(high, low, close, period):
+    return ta.volatility.AverageTrueRange(high, low, close, period).average_true_range().to_numpy()
+
+
+class RsiMacdAtrStrategy:
+    """
+    Long-only rule used by the live bot and the backtests:
+
+    entry: rsi6 > 30 and DIF crosses above DEA
+    exit : low <= stop (fill at stop), or rsi6 < 60 and DIF crosses below DEA
+    stop : entry - ATR * atr_mult
+    """
+
+    def __init__(
+        self,
+        atr_period=14,
+        atr_mult=1.0,
+        rsi_period=6,
+        rsi_entry=30,
+        rsi_exit=60,
+        warmup=50,
+    ):
+        self.atr_period = atr_period
+        self.atr_mult = atr_mult
+        self.rsi_period = rsi_period
+        self.rsi_entry = rsi_entry
+        self.rsi_exit = rsi_exit
+        self.warmup = warmup
+
+        self.engine = IncrementalIndicators(atr_period, rsi_period)
+
+    # ================= VECTORIZED =================
+    def indicators(self, arrays):
+        """arrays: mapping of high / low / close (arrays, Series or DataFrame)"""
+        close = pd.Series(np.asarray(arrays["close"], dtype=float))
+        high = pd.Series(np.asarray(arrays["high"], dtype=float))
+        low = pd.Series(np.asarray(arrays["low"], dtype=float))
+
+        return {
+            "rsi6": rsi(close, self.rsi_period),
+            **macd(close),
+            "atr": atr(high, low, close, self.atr_period),
+        }
+
+    def signals(self, arrays, ind=None):
+        """Indicator arrays plus boolean entry / exit arrays for a whole history"""
+        ind = self.indicators(arrays) if ind is None else ind
+        out = dict(ind)
+        out["entry"] = entry_signal(
+            ind["rsi6"], ind["dif"], ind["dea"], ind["dif_prev"], ind["dea_prev"],
+            self.rsi_entry,
+        )
+        out["exit"] = exit_signal(
+            ind["rsi6"], ind["dif"], ind["dea"], ind["dif_prev"], ind["dea_prev"],
+            self.rsi_exit,
+        )
+        return out
+
+    def add_indicators(self, df):
+        """DataFrame convenience for the scripts: adds indicator + signal columns"""
+        for key, values in self.signals(df).items():
+            df[key] = values
+        return df
+
+    # ================= INCREMENTAL =================
+    def on_bar(self, bar):
+        """
+        bar: mapping with high / low / close (a candle dict).
+        O(1); returns bar + indicators + entry / exit flags.
+        """
+        v = self.engine.update(bar["high"], bar["low"], bar["close"])
+        row = dict(bar)
+        row.update(v)
+        row["entry"] = bool(entry_signal(
+            v["rsi6"], v["dif"], v["dea"], v["dif_prev"], v["dea_prev"], self.rsi_entry
+        ))
+        row["exit"] = bool(exit_signal(
+            v["rsi6"], v["dif"], v["dea"], v["dif_prev"], v["dea_prev"], self.rsi_exit
+        ))
+        return row
+
+    @property
+    def ready(self):
+        # bars [0, warmup) only build indicator state, same as range(50, len(df))
+        return self.engine.count > self.warmup
+
+    # ================= POSITION RULES =================
+    def stop_price(self, entry, atr):
+        return entry - atr * self.atr_mult
+
+    @staticmethod
+    def exit_price(row, sl):
+        """Stop first (filled at the stop), then the signal exit at close"""
+        if row["low"] <= sl:
+            return sl
+        if row["exit"]:
+            return row["close"]
+        return None
@@ -0,0 +1,225 @@
+"""
+Fixed-point money math on the exchange's own grid.
+
+Prices are integer ticks (price / tickSize), quantities integer steps
+(qty / stepSize) and quote amounts integer units of 10**-quote_decimals
+(8 for USDT on Binance). Everything is plain integer arithmetic - exact,
+no Decimal objects - and the Instrument conversions accept NumPy arrays
+as well as scalars, so whole price columns convert in one call.
+
+Rounding follows what the exchange will accept or charge: order prices
+go to the nearest tick, quantities are floored to the step, fees and
+other debits are rounded up, credits rounded down.
+"""
+from decimal import Decimal
+
+import numpy as np
+
+# float -> grid conversions: absorb representation error (0.29999999...)
+_EPS = 1e-9
+
+
+def _fixed(value):
+    """'0.00100000' -> (1, 3), i.e. value == num * 10**-dec"""
+    sign, digits, exp = Decimal(str(value)).normalize().as_tuple()
+    num = int("".join(map(str, digits)) or 0)
+    if sign:
+        num = -num
+    if exp >= 0:
+        return num * 10 ** exp, 0
+    return num, -exp
+
+
+def _ceil_div(a, b):
+    return -(-a // b)
+
+
+def _to_grid(values, scale, mode):
+    x = np.asarray(values, dtype=np.float64) * scale
+    if mode == "floor":
+        out = np.floor(x + _EPS)
+    elif mode == "ceil":
+        out = np.ceil(x - _EPS)
+    else:
+        out = np.rint(x)
+    if out.ndim == 0:
+        return int(out)
+    return out.astype(np.int64)
+
+
+class Instrument:
+    """Tick / step grid of one symbol (PRICE_FILTER, LOT_SIZE, NOTIONAL)"""
+
+    def __init__(
+        self,
+        symbol,
+        tick_size,
+        step_size,
+        min_qty="0",
+        min_notional="0",
+        quote_decimals=8,
+    ):
+        self.symbol = symbol
+        self.tick_size = str(tick_size)
+        self.step_size = str(step_size)
+        self.quote_decimals = quote_decimals
+
+        tick, tick_dec = _fixed(tick_size)
+        step, step_dec = _fixed(step_size)
+        if tick <= 0 or step <= 0:
+            raise ValueError(f"{symbol}: tick and step sizes must be positive")
+
+        # one tick / one step as (integer, decimals) and as float multipliers
+        self._tick, self._tick_dec = tick, tick_dec
+        self._step, self._step_dec = step, step_dec
+        self._ticks_per_price = 10 ** tick_dec / tick
+        self._steps_per_qty = 10 ** step_dec / step
+
+        # 1 tick x 1 step in quote units = _unit_num / _unit_den
+        shift = quote_decimals - tick_dec - step_dec
+        self._unit_num = tick * step * 10 ** max(shift, 0)
+        self._unit_den = 10 ** max(-shift, 0)
+
+        self.min_steps = self.steps(min_qty, "ceil")
+        min_num, min_dec = _fixed(min_notional)
+        self.min_notional = _ceil_div(min_num * 10 ** quote_decimals, 10 ** min_dec)
+
+    @classmethod
+    def from_symbol_info(cls, info, quote_decimals=8):
+        """From client.get_symbol_info(symbol) / one exchangeInfo entry"""
+        filters = {f["filterType"]: f for f in info.get("filters", [])}
+        notional = filters.get("NOTIONAL") or filters.get("MIN_NOTIONAL") or {}
+        return cls(
+            info["symbol"],
+            filters["PRICE_FILTER"]["tickSize"],
+            filters["LOT_SIZE"]["stepSize"],
+            filters["LOT_SIZE"].get("minQty", "0"),
+            notional.get("minNotional", "0"),
+            quote_decimals,
+        )
+
+    # ================= GRID =================
+    def ticks(self, price, mode="round"):
+        return _to_grid(price, self._ticks_per_price, mode)
+
+    def steps(self, qty, mode="floor"):
+        return _to_grid(qty, self._steps_per_qty, mode)
+
+    def price(self, ticks):
+        return np.multiply(ticks, self._tick) / 10 ** self._tick_dec
+
+    def qty(self, steps):
+        return np.multiply(steps, self._step) / 10 ** self._step_dec
+
+    def price_str(self, ticks):
+        """Exact decimal string for an order parameter"""
+        return _format(ticks * self._tick, self._tick_dec)
+
+    def qty_str(self, steps):
+        return _format(steps * self._step, self._step_dec)
+
+    # ================= MONEY =================
+    def notional(self, ticks, steps, up=False):
+        """ticks x steps in quote units (floored, or rounded up for debits)"""
+        raw = ticks * steps * self._unit_num
+        if self._unit_den == 1:
+            return raw
+        return _ceil_div(raw, self._unit_den) if up else raw // self._unit_den
+
+    def tradable(self, ticks, steps):
+        """LOT_SIZE minQty and NOTIONAL minNotional both satisfied"""
+        return (steps >= max(self.min_steps, 1)) & (
+            self.notional(ticks, steps) >= self.min_notional
+        )
+
+
+def _format(num, dec):
+    if dec == 0:
+        return str(num)
+    sign = "-" if num < 0 else ""
+    digits = str(abs(num)).rjust(dec + 1, "0")
+    return f"{sign}{digits[:-dec]}.{digits[-dec:]}"
+
+
+class Ledger:
+    """
+    Realized balance of one account in quote units, same bookkeeping as the
+    backtests: the entry fee is paid when a position opens, PnL and the
+    exit fee are booked when (part of) it closes.
+    """
+
+    def __init__(self, balance, fee_rate="0.001", quote_decimals=8):
+        self.quote_decimals = quote_decimals
+        self.scale = 10 ** quote_decimals
+        self._fee_num, fee_dec = _fixed(fee_rate)
+        self._fee_den = 10 ** fee_dec
+
+        self.units = self.to_units(balance)
+        self.fees = 0
+        self.positions = {}     # symbol -> [entry_ticks, steps]
+
+    # ================= CONVERSION =================
+    def to_units(self, amount, mode="floor"):
+        return _to_grid(amount, self.scale, mode)
+
+    def to_quote(self, units):
+        return units / self.scale
+
+    @property
+    def balance(self):
+        return self.units / self.scale
+
+    def fee(self, notional):
+        """Commission on a notional (quote units), rounded up; arrays work too"""
+        return _ceil_div(notional * self._fee_num, self._fee_den)
+
+    # ================= SIZING =================
+    def size(self, inst, ticks, stop_ticks, risk_per_trade):
+        """
+        Steps risking `risk_per_trade` of the balance between entry and stop,
+        capped at what the balance can buy; 0 if below the symbol's minimums
+        or if the stop is not below the entry.
+        """
+        per_step = inst.notional(ticks - stop_ticks, 1, up=True)
+        if per_step <= 0:
+            return 0
+
+        risk_num, risk_dec = _fixed(risk_per_trade)
+        by_risk = self.units * risk_num // (per_step * 10 ** risk_dec)
+        by_cash = self.units // max(inst.notional(ticks, 1, up=True), 1)
+
+        steps = min(by_risk, by_cash)
+        return steps if inst.tradable(ticks, steps) else 0
+
+    # ================= POSITIONS =================
+    def open(self, inst, ticks, steps):
+        """Book an entry; returns the fee paid (quote units)"""
+        if inst.symbol in self.positions:
+            raise ValueError(f"{inst.symbol}: position already open")
+
+        fee = self.fee(inst.notional(ticks, steps, up=True))
+        self.units -= fee
+        self.fees += fee
+        self.positions[inst.symbol] = [ticks, steps]
+        return fee
+
+    def close(self, inst, ticks, steps=None):
+        """Book an exit of `steps` (default: all); returns (pnl, fee) in quote units"""
+        entry, held = self.positions[inst.symbol]
+        steps = held if steps is None else min(steps, held)
+
+        diff = ticks - entry
+        # a loss is a debit: round its magnitude up
+        pnl = inst.notional(diff, steps) if diff >= 0 else -inst.notional(-diff, steps, up=True)
+        fee = self.fee(inst.notional(ticks, steps, up=True))
+
+        self.units += pnl - fee
+        self.fees += fee
+        if steps == held:
+            del self.positions[inst.symbol]
+        else:
+            self.positions[inst.symbol][1] = held - steps
+        return pnl, fee
+
+    def held(self, symbol):
+        return self.positions.get(symbol, (0, 0))[1]
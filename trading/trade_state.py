@@ -1,6 +1,7 @@
 
 class TradeState:
-    def __init__(self, entry, stop, target, qty, atr):
+    def __init__(self, entry, stop, target, qty, atr, symbol=None):
+        self.symbol = symbol
         self.entry = entry
         self.initial_stop = stop
         self.stop = stop
@@ -3,13 +3,17 @@ from trading.trade_state import TradeState
 
 class TrailingStopManager:
 
-    def __init__(self, trail_pct=0.005):
+    def __init__(self, trail_pct=0.005, orders=None):
         """
         trail_pct = 0.5% trailing stop
+        orders = StopOrderManager to move the exchange stop along
         """
         self.trail_pct = trail_pct
+        self.orders = orders
 
     def update(self, trade: TradeState, current_price: float):
+        old_stop = trade.stop
+
         # 1️⃣ Breakeven logic
         if not trade.breakeven_done:
             if current_price >= trade.entry + trade.risk:
@@ -22,4 +26,8 @@ class TrailingStopManager:
             new_stop = current_price * (1 - self.trail_pct)
             if new_stop > trade.stop:
                 trade.stop = new_stop
-                print(f"🔁 Trailing stop updated → {round(trade.stop, 2)}")
+                print(f"🔁 Trailing stop updated → {trade.stop:.8f}")
+
+        # resting exchange stop follows (StopOrderManager only ever raises it)
+        if self.orders is not None and trade.stop > old_stop:
+            self.orders.move(trade.symbol, trade.stop)
@@ -1,9 +1,12 @@
 class ATRTrailingStopManager:
 
-    def __init__(self, atr_multiplier=2.0):
+    def __init__(self, atr_multiplier=2.0, orders=None):
         self.atr_multiplier = atr_multiplier
+        self.orders = orders    # StopOrderManager, optional
 
     def update(self, trade, current_price, current_atr):
+        old_stop = trade.stop
+
         # 1️⃣ Move to breakeven at +1R
         if not trade.breakeven_done:
             if current_price >= trade.entry + trade.risk:
@@ -16,4 +19,8 @@ class ATRTrailingStopManager:
             new_stop = current_price - (current_atr * self.atr_multiplier)
             if new_stop > trade.stop:
                 trade.stop = new_stop
-                print(f"🔁 ATR Trailing Stop → {round(trade.stop, 2)}")
+                print(f"🔁 ATR Trailing Stop → {trade.stop:.8f}")
+
+        # keep the resting exchange stop in step
+        if self.orders is not None and trade.stop > old_stop:
+            self.orders.move(trade.symbol, trade.stop)
@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+
+
+OHLCV = ("open", "high", "low", "close", "volume")
+
+
+class CandleStore:
+    """
+    Fixed-capacity candle history for one symbol.
+
+    Rows are written twice (slot and slot + capacity) into preallocated
+    arrays, so the latest `capacity` candles are always one contiguous
+    slice: append is O(1) and every read is a zero-copy view.
+    """
+
+    def __init__(self, capacity=1000, fields=OHLCV):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+
+        self.capacity = capacity
+        self.fields = tuple(fields)
+        self._index = {f: i for i, f in enumerate(self.fields)}
+
+        self._time = np.zeros(2 * capacity, dtype=np.int64)
+        self._data = np.full((len(self.fields), 2 * capacity), np.nan)
+
+        self._pos = -1      # slot of the newest row
+        self._size = 0
+        self.total = 0      # rows ever appended
+
+    def __len__(self):
+        return self._size
+
+    # ================= WRITE =================
+    def append(self, open_time, values):
+        """open_time in ms; values is a dict keyed by field (missing → NaN)"""
+        pos = (self._pos + 1) % self.capacity
+        mirror = pos + self.capacity
+
+        self._time[pos] = self._time[mirror] = open_time
+
+        data = self._data
+        for i, f in enumerate(self.fields):
+            v = values.get(f, np.nan)
+            data[i, pos] = v
+            data[i, mirror] = v
+
+        self._pos = pos
+        self._size = min(self._size + 1, self.capacity)
+        self.total += 1
+
+    # ================= READ =================
+    def _window(self, n):
+        n = self._size if n is None else min(n, self._size)
+        end = self._pos + self.capacity + 1
+        return end - n, end
+
+    def view(self, field, n=None):
+        """Read-only view of the last n values of one field (oldest first)"""
+        start, end = self._window(n)
+        if field == "time":
+            v = self._time[start:end]
+        else:
+            v = self._data[self._index[field], start:end]
+        v = v.view()
+        v.flags.writeable = False
+        return v
+
+    def arrays(self, n=None):
+        """Dict of read-only views, the shape strategies and backtests take"""
+        out = {"time": self.view("time", n)}
+        for f in self.fields:
+            out[f] = self.view(f, n)
+        return out
+
+    @property
+    def last_time(self):
+        return int(self._time[self._pos]) if self._size else None
+
+    def last(self):
+        if not self._size:
+            return None
+        row = {f: float(self._data[i, self._pos]) for i, f in enumerate(self.fields)}
+        row["time"] = int(self._time[self._pos])
+        return row
+
+    def to_frame(self, n=None):
+        """Copying DataFrame export, for reports and debugging only"""
+        df = pd.DataFrame({f: np.array(v) for f, v in self.arrays(n).items()})
+        df["time"] = pd.to_datetime(df["time"], unit="ms")
+        return df
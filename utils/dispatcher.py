@@ -0,0 +1,118 @@
+import queue
+import threading
+import time
+
+from utils.logger import get_logger
+
+log = get_logger("dispatch")
+
+
+class _Lane:
+    """One worker thread and its FIFO; a symbol always lands on the same lane"""
+
+    def __init__(self, maxsize):
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.keys = 0
+        self.processed = 0
+        self.dropped = 0
+        self.max_depth = 0
+        self.wait_total_ns = 0
+        self.wait_max_ns = 0
+
+
+class SymbolDispatcher:
+    """
+    Moves message handling off the websocket thread.
+
+    submit() is a cheap non-blocking enqueue. Each key (symbol) is pinned to
+    the least-loaded lane the first time it is seen, so its messages are
+    handled strictly in arrival order while different symbols are
+    processed concurrently.
+    """
+
+    def __init__(self, handler, workers=4, max_queue=10000):
+        self.handler = handler
+        self.lanes = [_Lane(max_queue) for _ in range(workers)]
+        self.assignment = {}
+        self.threads = []
+        self.running = False
+        self._lock = threading.Lock()
+
+    def _lane(self, key):
+        lane = self.assignment.get(key)
+        if lane is None:
+            with self._lock:
+                lane = self.assignment.get(key)
+                if lane is None:
+                    lane = min(self.lanes, key=lambda l: l.keys)
+                    lane.keys += 1
+                    self.assignment[key] = lane
+        return lane
+
+    # ================= PRODUCER =================
+    def submit(self, key, msg):
+        lane = self._lane(key)
+        try:
+            lane.queue.put_nowait((time.perf_counter_ns(), msg))
+        except queue.Full:
+            # a lost closed candle is recovered by the REST gap backfill
+            lane.dropped += 1
+            return False
+
+        depth = lane.queue.qsize()
+        if depth > lane.max_depth:
+            lane.max_depth = depth
+        return True
+
+    # ================= WORKERS =================
+    def start(self):
+        self.running = True
+        for i, lane in enumerate(self.lanes):
+            t = threading.Thread(target=self._work, args=(lane,), name=f"dispatch-{i}", daemon=True)
+            t.start()
+            self.threads.append(t)
+
+    def stop(self, timeout=5.0):
+        self.running = False
+        for lane in self.lanes:
+            lane.queue.put(None)
+        for t in self.threads:
+            t.join(timeout)
+
+    def _work(self, lane):
+        while True:
+            item = lane.queue.get()
+            if item is None:
+                break
+
+            enqueued_ns, msg = item
+            wait = time.perf_counter_ns() - enqueued_ns
+            lane.wait_total_ns += wait
+            if wait > lane.wait_max_ns:
+                lane.wait_max_ns = wait
+
+            try:
+                self.handler(msg)
+            except Exception as e:
+                log.exception("❌ dispatch handler error: %s", e)
+            lane.processed += 1
+
+    # ================= METRICS =================
+    def depth(self):
+        return sum(lane.queue.qsize() for lane in self.lanes)
+
+    def stats(self):
+        out = []
+        for i, lane in enumerate(self.lanes):
+            n = lane.processed
+            out.append({
+                "lane": i,
+                "symbols": lane.keys,
+                "depth": lane.queue.qsize(),
+                "max_depth": lane.max_depth,
+                "processed": n,
+                "dropped": lane.dropped,
+                "wait_avg_ms": lane.wait_total_ns / n / 1e6 if n else 0.0,
+                "wait_max_ms": lane.wait_max_ns / 1e6,
+            })
+        return out
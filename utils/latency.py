@@ -0,0 +1,166 @@
+import threading
+import time
+
+# log-linear buckets: 32 linear steps per power of two (~3% relative error)
+_SUB_BITS = 5
+_SUB = 1 << _SUB_BITS
+_MAX_SHIFT = 32                       # up to ~2^37 µs (~38 hours)
+_BUCKETS = 2 * _SUB + _MAX_SHIFT * _SUB
+
+STAGES = (
+    "network",      # exchange event time -> socket receive (includes clock skew)
+    "queue",        # socket receive -> dispatcher worker picks it up
+    "decode",
+    "backfill",     # REST gap fill, only when candles were missed
+    "indicators",
+    "signal",
+    "risk",         # position sizing / risk check
+    "submit",       # order sent -> exchange transactTime
+    "ack",          # exchange transactTime -> response received
+    "notify",
+    "total",        # exchange event time -> done
+    "stop",         # stop-crossing tick received -> exit booked
+)
+
+
+def _index(us):
+    if us < 2 * _SUB:
+        return us
+    shift = us.bit_length() - _SUB_BITS - 1
+    if shift > _MAX_SHIFT:
+        return _BUCKETS - 1
+    return 2 * _SUB + (shift - 1) * _SUB + (us >> shift) - _SUB
+
+
+def _upper(idx):
+    # largest value that lands in bucket idx
+    if idx < 2 * _SUB:
+        return idx
+    shift = (idx - 2 * _SUB) // _SUB + 1
+    sub = (idx - 2 * _SUB) % _SUB + _SUB
+    return ((sub + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """
+    HDR-style histogram of microsecond values.
+
+    record() is one bucket increment; there is no per-sample storage, so
+    memory is fixed (~1k counters) however long the bot runs.
+    """
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * _BUCKETS
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, us):
+        us = int(us)
+        if us < 0:
+            us = 0
+        self.counts[_index(us)] += 1
+        self.count += 1
+        self.total += us
+        if us > self.max:
+            self.max = us
+
+    def merge(self, other):
+        counts = self.counts
+        for i, c in enumerate(other.counts):
+            if c:
+                counts[i] += c
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+        return self
+
+    def percentile(self, p):
+        if not self.count:
+            return 0
+        target = max(1, -(-self.count * p // 100))
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= target:
+                return min(_upper(i), self.max)
+        return self.max
+
+    def summary(self):
+        n = self.count
+        return {
+            "count": n,
+            "mean_ms": self.total / n / 1000 if n else 0.0,
+            "p50_ms": self.percentile(50) / 1000,
+            "p99_ms": self.percentile(99) / 1000,
+            "max_ms": self.max / 1000,
+        }
+
+
+class LatencyTracker:
+    """
+    Per-stage, per-symbol latency histograms.
+
+    A symbol is only ever handled by its own dispatcher lane, so each
+    histogram has a single writer and record() takes no lock. Cross-symbol
+    figures are built by merging when asked for.
+    """
+
+    def __init__(self, stages=STAGES):
+        self.stages = tuple(stages)
+        self.hists = {}               # (stage, symbol) -> LatencyHistogram
+        self._lock = threading.Lock()
+
+    def _hist(self, stage, symbol):
+        h = self.hists.get((stage, symbol))
+        if h is None:
+            with self._lock:
+                h = self.hists.setdefault((stage, symbol), LatencyHistogram())
+        return h
+
+    def record(self, stage, symbol, us):
+        self._hist(stage, symbol).record(us)
+
+    def record_ns(self, stage, symbol, ns):
+        self._hist(stage, symbol).record(ns // 1000)
+
+    def histogram(self, stage, symbol=None):
+        """symbol=None merges every symbol for the stage"""
+        if symbol is not None:
+            return self.hists.get((stage, symbol)) or LatencyHistogram()
+
+        out = LatencyHistogram()
+        for (st, _), h in list(self.hists.items()):
+            if st == stage:
+                out.merge(h)
+        return out
+
+    def symbols(self):
+        return sorted({sym for _, sym in list(self.hists)})
+
+    def summary(self, symbol=None):
+        """{stage: {count, mean_ms, p50_ms, p99_ms, max_ms}} for recorded stages"""
+        out = {}
+        for stage in self.stages:
+            h = self.histogram(stage, symbol)
+            if h.count:
+                out[stage] = h.summary()
+        return out
+
+
+class Stopwatch:
+    """Checkpoint timer for one message: lap(stage) records time since the last lap"""
+
+    __slots__ = ("tracker", "symbol", "last")
+
+    def __init__(self, tracker, symbol):
+        self.tracker = tracker
+        self.symbol = symbol
+        self.last = time.perf_counter_ns()
+
+    def lap(self, stage):
+        now = time.perf_counter_ns()
+        self.tracker.record_ns(stage, self.symbol, now - self.last)
+        self.last = now
@@ -0,0 +1,149 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+import time
+
+from config import config
+
+# attributes every LogRecord has; anything else came in through extra=
+_STANDARD = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+_lock = threading.Lock()
+_listener = None
+
+
+# ================= FORMATTERS =================
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line; extra= fields are kept as top-level keys"""
+
+    def format(self, record):
+        out = {
+            "ts": round(record.created, 6),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _STANDARD:
+                out[key] = value
+        if record.exc_info:
+            out["exc"] = self.formatException(record.exc_info)
+        return json.dumps(out, default=str, ensure_ascii=False)
+
+
+TEXT_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+
+# ================= SAMPLING =================
+class SamplingFilter(logging.Filter):
+    """
+    Per-event sampling (keep 1 in N) and rate limiting (max per second).
+    Event type comes from extra={"event": ...}; untagged records pass.
+    Runs on the caller's thread, so dropped records are never queued.
+    """
+
+    def __init__(self, sample=None, rate=None):
+        super().__init__()
+        self.sample = sample or {}
+        self.rate = rate or {}
+        self.counts = {}
+        self.buckets = {}      # event -> [tokens, last refill]
+        self.suppressed = {}
+
+    def filter(self, record):
+        event = getattr(record, "event", None)
+        if event is None:
+            return True
+
+        every = self.sample.get(event)
+        if every and every > 1:
+            n = self.counts.get(event, 0)
+            self.counts[event] = n + 1
+            if n % every:
+                return False
+
+        limit = self.rate.get(event)
+        if limit:
+            now = time.monotonic()
+            bucket = self.buckets.setdefault(event, [limit, now])
+            bucket[0] = min(limit, bucket[0] + (now - bucket[1]) * limit)
+            bucket[1] = now
+            if bucket[0] < 1:
+                self.suppressed[event] = self.suppressed.get(event, 0) + 1
+                return False
+            bucket[0] -= 1
+
+        return True
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    # the stock prepare() formats on the caller's thread; leave it to the listener
+    def prepare(self, record):
+        return record
+
+
+def _parse_map(spec):
+    # "tick=100,dispatch=10" -> {"tick": 100, "dispatch": 10}
+    out = {}
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        key, _, value = part.partition("=")
+        out[key.strip()] = float(value)
+    return out
+
+
+# ================= SETUP =================
+def get_logger(name="gkuber"):
+    """
+    Logger whose records are formatted and written on a background thread.
+    Level, format and sampling come from BaseConfig (LOG_LEVEL, LOG_FORMAT,
+    LOG_SAMPLE, LOG_RATE_LIMIT, LOG_FILE).
+    """
+    global _listener
+
+    root = logging.getLogger("gkuber")
+    with _lock:
+        if _listener is None:
+            base = config.base
+            formatter = (
+                JsonFormatter() if base.LOG_FORMAT == "json" else logging.Formatter(TEXT_FORMAT)
+            )
+
+            handlers = [logging.StreamHandler(sys.stdout)]
+            if base.LOG_FILE:
+                handlers.append(logging.handlers.RotatingFileHandler(
+                    base.LOG_FILE, maxBytes=10 * 1024 * 1024, backupCount=3, encoding="utf-8"
+                ))
+            for h in handlers:
+                h.setFormatter(formatter)
+
+            q = queue.SimpleQueue()
+            qh = _DeferredQueueHandler(q)
+            qh.addFilter(SamplingFilter(
+                {k: int(v) for k, v in _parse_map(base.LOG_SAMPLE).items()},
+                _parse_map(base.LOG_RATE_LIMIT),
+            ))
+
+            for old in list(root.handlers):
+                root.removeHandler(old)
+            root.addHandler(qh)
+            root.setLevel(base.LOG_LEVEL)
+            root.propagate = False
+
+            _listener = logging.handlers.QueueListener(q, *handlers, respect_handler_level=True)
+            _listener.start()
+            atexit.register(shutdown)
+
+    return root if name == "gkuber" else root.getChild(name)
+
+
+def shutdown():
+    """Drain the queue (call before exit so nothing buffered is lost)"""
+    global _listener
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
@@ -1,28 +1,155 @@
+import queue
+import threading
+import time
+
 import requests
 from config import config
+from utils.logger import get_logger
+
+log = get_logger("telegram")
+
+
+def _plural(n, word):
+    return f"{n} {word}" if n == 1 else f"{n} {word}s"
 
 
 class TelegramNotifier:
+    """
+    Fire-and-forget notifier: send() only enqueues.
 
-    def __init__(self):
-        self.token = config.telegram.TELEGRAM_BOT_TOKEN
-        self.chat_id = config.telegram.TELEGRAM_CHAT_ID
+    A background worker owns one keep-alive session, merges messages that
+    arrive within the coalesce window into a single digest, and spaces
+    requests to stay inside Telegram's per-chat rate limit.
+    """
+
+    MAX_LEN = 4096  # Telegram message size limit
+
+    def __init__(self, min_interval=None, coalesce_seconds=None, queue_size=None):
+        tg = config.telegram
+        self.token = tg.TELEGRAM_BOT_TOKEN
+        self.chat_id = tg.TELEGRAM_CHAT_ID
         self.base_url = f"https://api.telegram.org/bot{self.token}/sendMessage"
 
+        self.min_interval = tg.TELEGRAM_MIN_INTERVAL if min_interval is None else min_interval
+        self.coalesce_seconds = (
+            tg.TELEGRAM_COALESCE_SECONDS if coalesce_seconds is None else coalesce_seconds
+        )
+
+        self.queue = queue.Queue(maxsize=tg.TELEGRAM_QUEUE_SIZE if queue_size is None else queue_size)
+        self.session = requests.Session()
+
+        self.dropped = 0
+        self.sent = 0
+        self._last_post = 0.0
+        self._lock = threading.Lock()
+        self._worker = None
+
+    # ================= PRODUCER =================
     def send(self, message: str):
         if not self.token or not self.chat_id:
             return
 
+        self._ensure_worker()
+
+        try:
+            self.queue.put_nowait(message)
+        except queue.Full:
+            # never block trading; the worker reports the count later
+            with self._lock:
+                self.dropped += 1
+
+    def flush(self, timeout=10.0):
+        """Wait until everything queued so far has been posted"""
+        deadline = time.monotonic() + timeout
+        while self.queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+    def _ensure_worker(self):
+        if self._worker is not None:
+            return
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run, name="telegram-notifier", daemon=True
+                )
+                self._worker.start()
+
+    # ================= WORKER =================
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+
+            # coalesce: everything that fires on the same candle close
+            deadline = time.monotonic() + self.coalesce_seconds
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            try:
+                for text in self._digest(batch):
+                    self._post(text)
+            except Exception as e:
+                log.error("Telegram error: %s", e)
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    def _digest(self, batch):
+        with self._lock:
+            dropped, self.dropped = self.dropped, 0
+
+        count = len(batch)  # real messages; the drop notice is not one
+        if dropped:
+            batch = batch + [f"⚠️ {_plural(dropped, 'notification')} dropped (queue full)"]
+
+        if len(batch) == 1:
+            return [batch[0][: self.MAX_LEN]]
+
+        # split on message boundaries so no single alert is cut in half
+        header = f"📦 <b>{_plural(count, 'notification')}</b>\n\n"
+        chunks, current = [], header
+        for msg in batch:
+            msg = msg[: self.MAX_LEN - len(header) - 2]
+            if len(current) + len(msg) + 2 > self.MAX_LEN:
+                chunks.append(current.rstrip())
+                current = header
+            current += msg + "\n\n"
+        chunks.append(current.rstrip())
+        return chunks
+
+    def _post(self, text, retries=3):
         payload = {
             "chat_id": self.chat_id,
-            "text": message,
+            "text": text,
             "parse_mode": "HTML"
         }
 
-        try:
-            requests.post(self.base_url, data=payload, timeout=5)
-        except Exception as e:
-            print(f"Telegram error: {e}")
+        for _ in range(retries):
+            wait = self._last_post + self.min_interval - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+
+            r = self.session.post(self.base_url, data=payload, timeout=5)
+            self._last_post = time.monotonic()
+
+            if r.status_code != 429:
+                self.sent += 1
+                return r
+
+            # flood control: Telegram says how long to back off
+            try:
+                retry_after = r.json()["parameters"]["retry_after"]
+            except Exception:
+                retry_after = 5
+            time.sleep(retry_after)
+
+        log.error("Telegram error: rate limited, message discarded")
+
 
 """
 notifier = TelegramNotifier()
@@ -33,4 +160,4 @@ notifier.send(
     f"SL: 41920\n"
     f"TP: 43210\n"
     f"Qty: 0.012"
-)"""
\ No newline at end of file
+)"""
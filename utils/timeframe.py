@@ -0,0 +1,44 @@
+import numpy as np
+from binance.helpers import interval_to_milliseconds
+
+
+def to_ms(times):
+    """Open times as int64 ms (accepts ms ints, datetime64 arrays / Series)"""
+    arr = np.asarray(times)
+    if np.issubdtype(arr.dtype, np.datetime64):
+        return arr.astype("datetime64[ms]").astype(np.int64)
+    return arr.astype(np.int64)
+
+
+def closed_index(low_time, low_interval, high_time, high_interval):
+    """
+    For every lower-timeframe bar, the index of the last higher-timeframe
+    bar that had closed by the time the lower bar closed (-1 if none).
+
+    A 4h candle opened at 00:00 closes at 04:00, so the 15m bars closing
+    at 00:15 ... 03:45 still see the previous 4h candle, and the one
+    closing at 04:00 is the first to see it. One searchsorted, no lookahead.
+    """
+    low_close = to_ms(low_time) + interval_to_milliseconds(low_interval)
+    high_close = to_ms(high_time) + interval_to_milliseconds(high_interval)
+    return np.searchsorted(high_close, low_close, side="right") - 1
+
+
+def align(low_time, low_interval, high_time, high_interval, columns):
+    """
+    Broadcast higher-timeframe columns (DataFrame or {name: array}) onto
+    the lower timeframe. Returns {name: array aligned to low_time}; bars
+    before the first closed higher bar get NaN (False for bool columns).
+    """
+    idx = closed_index(low_time, low_interval, high_time, high_interval)
+    seen = idx >= 0
+    take = np.where(seen, idx, 0)
+
+    out = {}
+    for name in columns:
+        values = np.asarray(columns[name])
+        if values.dtype == bool:
+            out[name] = seen & values[take]
+        else:
+            out[name] = np.where(seen, values[take].astype(np.float64), np.nan)
+    return out